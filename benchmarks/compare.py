@@ -0,0 +1,53 @@
+"""
+벤치마크 결과 비교
+- 두 run.py 결과 JSON의 케이스별 중앙값을 비교해 임계값 이상 느려진 케이스를 표시
+- 느려진 케이스가 있으면 종료 코드 1
+
+사용법:
+    python benchmarks/compare.py results/small-이전.json results/small-이후.json [--threshold 10]
+"""
+import argparse
+import json
+import sys
+
+
+def load(path: str) -> dict:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 결과 비교")
+    parser.add_argument("baseline", help="기준 결과 JSON")
+    parser.add_argument("current", help="비교할 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=10.0, help="느려짐으로 판단할 중앙값 증가율 (%%)")
+    parser.add_argument("--min-ms", type=float, default=0.5,
+                        help="기준 중앙값이 이보다 작은 케이스는 잡음으로 보고 판단에서 제외")
+    args = parser.parse_args()
+
+    baseline, current = load(args.baseline), load(args.current)
+    if baseline['dataset'] != current['dataset']:
+        print(f"⚠️ 데이터셋이 다릅니다: {baseline['dataset']} / {current['dataset']}")
+
+    before = {r['name']: r for r in baseline['results']}
+    regressions = []
+    print(f"{'케이스':36s} {'기준':>10s} {'현재':>10s} {'변화':>8s}")
+    for result in current['results']:
+        old = before.get(result['name'])
+        if old is None:
+            print(f"{result['name']:36s} {'-':>10s} {result['median_ms']:10.2f} {'new':>8s}")
+            continue
+        change = (result['median_ms'] - old['median_ms']) / old['median_ms'] * 100 if old['median_ms'] else 0.0
+        slower = change > args.threshold and old['median_ms'] >= args.min_ms
+        mark = "  ⚠️" if slower else ""
+        print(f"{result['name']:36s} {old['median_ms']:10.2f} {result['median_ms']:10.2f} {change:+7.1f}%{mark}")
+        if slower:
+            regressions.append(result['name'])
+
+    if regressions:
+        print(f"\n{args.threshold:g}% 이상 느려진 케이스: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+벤치마크용 합성 재고 데이터 생성기 (로컬 SQLite)
+- 같은 시드/크기면 항상 같은 데이터 (ID, 날짜, 수량 모두 결정적)
+- 상품 인기도는 Zipf 분포(소수 상품에 입출고 집중), 날짜는 최근일수록 많게 치우침
+- 상품별 재고가 음수가 되지 않도록 초기 재고를 정하고, 현재 재고/일별 스냅샷까지 일관되게 채움
+- 생성 정보는 DB의 benchmark_meta 테이블에 기록 (run.py가 읽음)
+
+사용법:
+    python benchmarks/generate.py --size small            # 상품 1천 / 입출고 10만
+    python benchmarks/generate.py --size large --seed 7   # 상품 10만 / 입출고 1천만
+    python benchmarks/generate.py --products 5000 --transactions 200000 --db /tmp/bench.db
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.backends.sqlite_backend import SQLiteBackend, _hash_password  # noqa: E402
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# 크기 프리셋 (상품 수, 입출고 건수)
+SIZES = {
+    "small": (1_000, 100_000),
+    "medium": (10_000, 1_000_000),
+    "large": (100_000, 10_000_000),
+}
+DEFAULT_SEED = 42
+# 데이터 마지막 날짜 (실행일과 무관하게 같은 데이터가 나오도록 고정)
+END_DATE = date(2025, 6, 30)
+HISTORY_DAYS = 730
+# 상품 인기도 Zipf 지수 (클수록 상위 상품에 집중)
+ZIPF_EXPONENT = 1.1
+# 최근 날짜 쏠림 정도 (지수분포 평균, 일)
+RECENCY_SCALE_DAYS = 180
+INBOUND_RATIO = 0.35
+OUTBOUND_MEAN_QUANTITY = 55
+INSERT_BATCH = 100_000
+
+CATEGORIES = ["식품", "음료", "생활용품", "전자제품", "의류", "기타"]
+UNITS = ["개", "박스", "kg", "L", "세트"]
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "benchmark"
+
+
+def default_db_path(size: str) -> str:
+    return os.path.join(DATA_DIR, f"{size}.db")
+
+
+def _uuids(rng: np.random.Generator, n: int) -> list:
+    raw = rng.integers(0, 2 ** 63, size=(n, 2), dtype=np.int64).view(np.uint64)
+    return [str(uuid.UUID(int=(int(hi) << 64) | int(lo), version=4)) for hi, lo in raw]
+
+
+def _ean13(numbers: np.ndarray) -> np.ndarray:
+    """12자리 숫자 → 체크 숫자를 붙인 EAN-13 문자열"""
+    body = np.char.zfill(numbers.astype(str), 12)
+    digits = np.array([list(map(int, b)) for b in body]) if len(body) else np.zeros((0, 12), int)
+    weights = np.tile([1, 3], 6)
+    check = (10 - (digits @ weights) % 10) % 10
+    return np.char.add(body, check.astype(str))
+
+
+def generate_products(rng: np.random.Generator, n: int) -> pd.DataFrame:
+    category = rng.choice(CATEGORIES, size=n)
+    return pd.DataFrame({
+        'id': _uuids(rng, n),
+        'name': [f"{c} 상품 {i:06d}" for i, c in enumerate(category)],
+        'sku': _ean13(8_800_000_000_000 // 10 + np.arange(n)),
+        'category': category,
+        'unit': rng.choice(UNITS, size=n, p=[0.6, 0.2, 0.08, 0.07, 0.05]),
+        'unit_price': (np.round(rng.lognormal(mean=8.5, sigma=1.0, size=n) / 100) * 100).clip(100),
+        'min_stock': rng.integers(5, 51, size=n),
+        # 등록일은 기록 시작 전후로 고르게
+        'created_at': [
+            (datetime.combine(END_DATE - timedelta(days=HISTORY_DAYS), datetime.min.time(), timezone.utc)
+             + timedelta(seconds=int(s))).isoformat()
+            for s in np.sort(rng.integers(0, 86_400 * 30, size=n))
+        ],
+    })
+
+
+def generate_transactions(rng: np.random.Generator, products: pd.DataFrame, n: int) -> pd.DataFrame:
+    ranks = np.arange(1, len(products) + 1, dtype=float)
+    popularity = ranks ** -ZIPF_EXPONENT
+    product_idx = rng.choice(len(products), size=n, p=popularity / popularity.sum())
+
+    days_ago = np.minimum(rng.exponential(RECENCY_SCALE_DAYS, size=n), HISTORY_DAYS - 1).astype(int)
+    seconds = rng.integers(9 * 3600, 19 * 3600, size=n)  # 업무 시간
+    start = np.datetime64(END_DATE) - days_ago.astype('timedelta64[D]')
+    stamp = start.astype('datetime64[s]') + seconds.astype('timedelta64[s]')
+
+    inbound = rng.random(n) < INBOUND_RATIO
+    # 입고는 10~200 묶음, 출고는 평균 OUTBOUND_MEAN_QUANTITY의 소량 (입고량과 출고량이 대체로 균형)
+    quantity = np.where(inbound, rng.integers(10, 201, size=n), rng.geometric(1 / OUTBOUND_MEAN_QUANTITY, size=n))
+    base_price = products['unit_price'].to_numpy()[product_idx]
+    unit_price = np.where(inbound, np.round(base_price * 0.7 / 10) * 10, base_price)
+
+    order = np.argsort(stamp, kind='stable')
+    return pd.DataFrame({
+        'id': _uuids(rng, n),
+        'product_idx': product_idx[order],
+        'type': np.where(inbound, '입고', '출고')[order],
+        'quantity': quantity[order],
+        'unit_price': unit_price[order],
+        'total_price': (quantity * unit_price)[order],
+        'transaction_date': np.datetime_as_string(stamp[order], unit='s') + '+00:00',
+    })
+
+
+def opening_and_current_stock(rng: np.random.Generator, products: pd.DataFrame,
+                              transactions: pd.DataFrame) -> tuple:
+    """재고가 한 번도 음수가 되지 않는 초기 재고와 현재 재고
+
+    여유분을 최소재고의 0~2배로 무작위로 두어 일부 상품은 재고 부족 상태가 됨.
+    """
+    net = np.where(transactions['type'] == '입고', transactions['quantity'], -transactions['quantity'])
+    running = pd.Series(net).groupby(transactions['product_idx'].to_numpy()).cumsum()
+    lowest = running.groupby(transactions['product_idx'].to_numpy()).min()
+    total = pd.Series(net).groupby(transactions['product_idx'].to_numpy()).sum()
+    lowest = lowest.reindex(range(len(products)), fill_value=0).to_numpy()
+    total = total.reindex(range(len(products)), fill_value=0).to_numpy()
+    opening = np.maximum(0, -lowest) + (products['min_stock'].to_numpy() * rng.uniform(0, 2, len(products))).astype(int)
+    return opening, opening + total
+
+
+def _insert(conn: sqlite3.Connection, sql: str, rows, label: str):
+    batch = []
+    count = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= INSERT_BATCH:
+            conn.executemany(sql, batch)
+            count += len(batch)
+            batch.clear()
+            print(f"  {label}: {count:,}", end="\r", flush=True)
+    if batch:
+        conn.executemany(sql, batch)
+        count += len(batch)
+    print(f"  {label}: {count:,}")
+
+
+def generate(db_path: str, n_products: int, n_transactions: int, seed: int = DEFAULT_SEED) -> dict:
+    """합성 데이터로 새 DB 생성 (기존 파일은 덮어씀)
+
+    Returns:
+        benchmark_meta에 기록한 생성 정보
+    """
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    user_id = _uuids(rng, 1)[0]
+    products = generate_products(rng, n_products)
+    transactions = generate_transactions(rng, products, n_transactions)
+    products['opening_stock'], products['current_stock'] = opening_and_current_stock(rng, products, transactions)
+
+    backend = SQLiteBackend(db_path)
+    conn = backend.conn
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("BEGIN")
+    conn.execute("INSERT INTO users (id, email, password_hash) VALUES (?, ?, ?)",
+                 (user_id, BENCH_EMAIL, _hash_password(BENCH_PASSWORD)))
+    _insert(conn, """
+        INSERT INTO products (id, user_id, name, sku, category, unit, unit_price, current_stock, min_stock,
+                              created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (
+        (p.id, user_id, p.name, p.sku, p.category, p.unit, float(p.unit_price), int(p.current_stock),
+         int(p.min_stock), p.created_at, p.created_at)
+        for p in products.itertuples(index=False)
+    ), "상품")
+
+    product_ids = products['id'].to_numpy()
+    _insert(conn, """
+        INSERT INTO transactions (id, user_id, product_id, type, quantity, unit_price, total_price, memo,
+                                  transaction_date, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, NULL, ?, ?)
+    """, (
+        (t.id, user_id, product_ids[t.product_idx], t.type, int(t.quantity), float(t.unit_price),
+         float(t.total_price), t.transaction_date, t.transaction_date)
+        for t in transactions.itertuples(index=False)
+    ), "입출고")
+    conn.execute("COMMIT")
+
+    print("  일별 스냅샷 재구성...")
+    snapshots = backend.rebuild_stock_snapshots(user_id)
+
+    meta = {
+        'seed': seed,
+        'products': n_products,
+        'transactions': n_transactions,
+        'snapshots': snapshots,
+        'user_id': user_id,
+        'email': BENCH_EMAIL,
+        'end_date': END_DATE.isoformat(),
+        'history_days': HISTORY_DAYS,
+        'popular_sku': products['sku'].iloc[0],
+    }
+    conn.execute("CREATE TABLE benchmark_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    conn.executemany("INSERT INTO benchmark_meta VALUES (?, ?)", [(k, json.dumps(v)) for k, v in meta.items()])
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    print(f"  완료: {time.perf_counter() - started:.1f}초")
+    return meta
+
+
+def read_meta(db_path: str) -> dict:
+    """generate()가 기록한 생성 정보"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return {k: json.loads(v) for k, v in conn.execute("SELECT key, value FROM benchmark_meta")}
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 재고 데이터 생성")
+    parser.add_argument("--size", choices=SIZES, default="small", help="크기 프리셋 (기본 small)")
+    parser.add_argument("--products", type=int, help="상품 수 (프리셋 대신 지정)")
+    parser.add_argument("--transactions", type=int, help="입출고 건수 (프리셋 대신 지정)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--db", help="생성할 DB 경로 (기본 benchmarks/data/<size>.db)")
+    args = parser.parse_args()
+
+    n_products, n_transactions = SIZES[args.size]
+    n_products = args.products or n_products
+    n_transactions = args.transactions or n_transactions
+    db_path = args.db or default_db_path(args.size)
+    print(f"{db_path}: 상품 {n_products:,} / 입출고 {n_transactions:,} (seed {args.seed})")
+    generate(db_path, n_products, n_transactions, args.seed)
+
+
+if __name__ == "__main__":
+    main()
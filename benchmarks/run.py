@@ -0,0 +1,216 @@
+"""
+데이터 경로 벤치마크
+- generate.py로 만든 합성 DB에서 페이지가 사용하는 조회/집계/등록/표 만들기 시간을 측정
+- 쓰기 측정은 DB 복사본에서 실행하므로 원본 데이터는 바뀌지 않음
+- 결과는 JSON으로 저장해 compare.py로 이전 실행과 비교
+
+사용법:
+    python benchmarks/run.py --size small                  # 없으면 먼저 생성
+    python benchmarks/run.py --db /tmp/bench.db --repeat 10 --only get_products
+    python benchmarks/run.py --size medium --output results/medium.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from functools import partial
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from generate import DEFAULT_SEED, SIZES, default_db_path, generate, read_meta  # noqa: E402
+from utils import database as db  # noqa: E402
+from utils import forecast  # noqa: E402
+from utils.backends import set_backend  # noqa: E402
+from utils.backends.sqlite_backend import SQLiteBackend  # noqa: E402
+from utils.helpers import inventory_table, product_table, transaction_table  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def _count(result) -> int | None:
+    """결과 행 수 (dict 결과는 rows/days 길이)"""
+    if isinstance(result, dict):
+        for key in ('rows', 'days'):
+            if key in result:
+                return len(result[key])
+        return None
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+
+def _size(result) -> int:
+    """결과 크기 (바이트, JSON 직렬화 기준 / DataFrame은 메모리 사용량)"""
+    if hasattr(result, 'memory_usage'):
+        return int(result.memory_usage(deep=True).sum())
+    return len(json.dumps(result, default=str, ensure_ascii=False).encode())
+
+
+def build_cases(user_id: str, meta: dict) -> list:
+    """(이름, 측정 함수, 매번 먼저 실행할 준비 함수) 목록"""
+    end = date.fromisoformat(meta['end_date'])
+    cold = partial(db.invalidate_product_cache, user_id)
+    forecast_cold = partial(forecast.invalidate_forecast, user_id)
+    products = db.get_products(user_id)
+    popular = db.get_product_by_sku(user_id, meta['popular_sku'])
+    recent = db.get_transactions(user_id, limit=1000)
+    second_page = db.get_transactions_page(user_id, page_size=50)['next_cursor']
+
+    def dashboard_batch():
+        start = end - timedelta(days=29)
+        return db.fetch_concurrently(
+            summary=partial(db.get_inventory_summary, user_id),
+            low_stock=partial(db.get_products_page, user_id, sort='current_stock', descending=False,
+                              limit=20, low_stock_only=True),
+            top_products=partial(db.get_products_page, user_id, sort='stock_value', limit=10),
+            trend=partial(db.get_transaction_trend, user_id, 'day', start, end),
+            history=partial(db.get_stock_history, user_id, start, end),
+        )
+
+    def new_transaction():
+        return db.create_transaction(user_id, {
+            'product_id': popular['id'], 'type': '입고', 'quantity': 1,
+            'unit_price': popular['unit_price'], 'total_price': popular['unit_price'],
+            'memo': 'benchmark', 'transaction_date': datetime.now(timezone.utc).isoformat(),
+        })
+
+    bulk_rows = [{
+        'product_id': p['id'], 'type': '입고', 'quantity': 1, 'unit_price': p['unit_price'],
+        'total_price': p['unit_price'], 'memo': 'benchmark', 'transaction_date': end.isoformat(),
+    } for p in products[:100]]
+
+    return [
+        # 조회 (상품)
+        ("get_products.cold", partial(db.get_products, user_id), cold),
+        ("get_products.warm", partial(db.get_products, user_id), None),
+        ("get_product_by_sku.warm", partial(db.get_product_by_sku, user_id, meta['popular_sku']), None),
+        ("get_products_page.recent", partial(db.get_products_page, user_id, limit=50), None),
+        ("get_products_page.stock_value", partial(db.get_products_page, user_id, sort='stock_value', limit=50), None),
+        ("get_products_page.low_stock", partial(db.get_products_page, user_id, sort='current_stock',
+                                                descending=False, limit=50, low_stock_only=True), None),
+        ("search_products.name", partial(db.search_products, user_id, "상품 0001", 20), None),
+        ("search_products.sku_prefix", partial(db.search_products, user_id, meta['popular_sku'][:6], 20), None),
+        ("get_low_stock_products.cold", partial(db.get_low_stock_products, user_id), cold),
+        # 조회 (입출고)
+        ("get_transactions.100", partial(db.get_transactions, user_id, limit=100), None),
+        ("get_transactions.product", partial(db.get_transactions, user_id, popular['id'], 100), None),
+        ("get_transactions_page.next", partial(db.get_transactions_page, user_id, second_page, page_size=50), None),
+        ("get_transaction_totals.90d", partial(db.get_transaction_totals, user_id, start_date=end - timedelta(days=89),
+                                               end_date=end), None),
+        # 대시보드 집계
+        ("get_inventory_summary", partial(db.get_inventory_summary, user_id), None),
+        ("get_transaction_trend.day_30d", partial(db.get_transaction_trend, user_id, 'day',
+                                                  end - timedelta(days=29), end), None),
+        ("get_transaction_trend.week_1y", partial(db.get_transaction_trend, user_id, 'week',
+                                                  end - timedelta(days=364), end), None),
+        ("get_transaction_trend.month_all", partial(db.get_transaction_trend, user_id, 'month', None, end), None),
+        ("get_stock_history.90d", partial(db.get_stock_history, user_id, end - timedelta(days=89), end), None),
+        ("dashboard.concurrent_batch", dashboard_batch, None),
+        # 출고 예측 (cold: 출고량 전체 조회 / warm: 캐시된 통계로 상품별 계산만)
+        ("forecast.cold", partial(forecast.get_forecast, user_id, end), forecast_cold),
+        ("forecast.warm", partial(forecast.get_forecast, user_id, end), None),
+        # 표 만들기
+        ("product_table.all", partial(product_table, products), None),
+        ("inventory_table.all", partial(inventory_table, products), None),
+        ("transaction_table.1000", partial(transaction_table, recent), None),
+        # 쓰기 (DB 복사본)
+        ("create_transaction", new_transaction, None),
+        ("create_transactions_bulk.100", partial(db.create_transactions_bulk, user_id, bulk_rows), None),
+    ]
+
+
+def measure(fn, setup, repeat: int) -> dict:
+    """repeat번 실행한 시간 통계 (준비 함수가 없으면 1회 예열 후 측정)"""
+    if setup is None:
+        fn()
+    timings = []
+    result = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        'repeat': repeat,
+        'min_ms': round(timings[0], 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'max_ms': round(timings[-1], 3),
+        'rows': _count(result),
+        'bytes': _size(result),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="데이터 경로 벤치마크")
+    parser.add_argument("--size", choices=SIZES, default="small", help="크기 프리셋 (DB가 없으면 생성)")
+    parser.add_argument("--db", help="generate.py로 만든 DB 경로 (기본 benchmarks/data/<size>.db)")
+    parser.add_argument("--repeat", type=int, default=5, help="케이스별 반복 횟수")
+    parser.add_argument("--only", nargs="*", help="이름이 이 문자열로 시작하는 케이스만 실행")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본 benchmarks/results/<size>-<시각>.json, '-'이면 표준 출력)")
+    args = parser.parse_args()
+
+    source = args.db or default_db_path(args.size)
+    if not os.path.exists(source):
+        print(f"{source}가 없어 새로 생성합니다.")
+        generate(source, *SIZES[args.size], DEFAULT_SEED)
+    meta = read_meta(source)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        shutil.copyfile(source, path)
+        set_backend(SQLiteBackend(path))
+
+        results = []
+        for name, fn, setup in build_cases(meta['user_id'], meta):
+            if args.only and not any(name.startswith(prefix) for prefix in args.only):
+                continue
+            result = {'name': name, **measure(fn, setup, args.repeat)}
+            results.append(result)
+            print(f"{name:36s} median {result['median_ms']:10.2f} ms  min {result['min_ms']:10.2f} ms  "
+                  f"rows {result['rows']}", file=sys.stderr)
+        set_backend(None)
+
+    report = {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'backend': 'sqlite',
+        'dataset': {k: meta[k] for k in ('seed', 'products', 'transactions', 'snapshots', 'end_date')},
+        'results': results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output == "-":
+        print(text)
+        return
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{args.size if not args.db else 'custom'}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write(text)
+    print(f"결과 저장: {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
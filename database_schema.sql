@@ -33,10 +33,18 @@ CREATE TABLE IF NOT EXISTS transactions (
 -- 3. 인덱스 생성 (성능 최적화)
 CREATE INDEX IF NOT EXISTS idx_products_user_id ON products(user_id);
 CREATE INDEX IF NOT EXISTS idx_products_category ON products(category);
+-- 상품코드는 사용자별로 유일 (일괄 등록 upsert 기준, NULL은 중복 허용)
+-- 기존 데이터에 중복 SKU가 있으면 먼저 정리한 뒤 실행하세요
+CREATE UNIQUE INDEX IF NOT EXISTS idx_products_user_sku ON products(user_id, sku);
 CREATE INDEX IF NOT EXISTS idx_transactions_user_id ON transactions(user_id);
 CREATE INDEX IF NOT EXISTS idx_transactions_product_id ON transactions(product_id);
 CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(transaction_date);
 CREATE INDEX IF NOT EXISTS idx_transactions_type ON transactions(type);
+-- 입출고 내역 커서 페이지네이션 (transaction_date, id) 순서
+CREATE INDEX IF NOT EXISTS idx_transactions_user_date_id ON transactions(user_id, transaction_date DESC, id DESC);
+-- 유형/상품 필터 + 날짜 순서 조회용 복합 인덱스
+CREATE INDEX IF NOT EXISTS idx_transactions_user_type_date ON transactions(user_id, type, transaction_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_transactions_product_date ON transactions(product_id, transaction_date DESC, id DESC);
 
 -- 4. RLS (Row Level Security) 정책 활성화
 ALTER TABLE products ENABLE ROW LEVEL SECURITY;
@@ -89,5 +97,490 @@ CREATE TRIGGER update_products_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- 9. 입출고 등록 함수: 입출고 기록 + 재고 증감 + 일별 재고 스냅샷을 한 번의 호출(한 트랜잭션)로 처리
+-- 재고 행을 UPDATE로 잠그므로 동시 등록 시에도 재고가 유실되지 않음
+-- 출고 수량이 현재 재고보다 많으면 아무것도 기록하지 않고 NULL 반환
+CREATE OR REPLACE FUNCTION create_transaction_with_stock(
+    p_user_id UUID,
+    p_product_id UUID,
+    p_type TEXT,
+    p_quantity INTEGER,
+    p_unit_price NUMERIC,
+    p_total_price NUMERIC,
+    p_memo TEXT,
+    p_transaction_date TIMESTAMPTZ
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY INVOKER
+AS $$
+DECLARE
+    v_new_stock INTEGER;
+    v_transaction transactions;
+BEGIN
+    UPDATE products
+    SET current_stock = current_stock + CASE WHEN p_type = '입고' THEN p_quantity ELSE -p_quantity END
+    WHERE id = p_product_id
+      AND user_id = p_user_id
+      AND (p_type = '입고' OR current_stock >= p_quantity)
+    RETURNING current_stock INTO v_new_stock;
+
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+
+    INSERT INTO transactions (user_id, product_id, type, quantity, unit_price, total_price, memo, transaction_date)
+    VALUES (p_user_id, p_product_id, p_type, p_quantity, p_unit_price, p_total_price, p_memo, p_transaction_date)
+    RETURNING * INTO v_transaction;
+
+    PERFORM apply_stock_snapshot(
+        p_user_id, p_product_id, (p_transaction_date AT TIME ZONE 'UTC')::DATE,
+        CASE WHEN p_type = '입고' THEN p_quantity ELSE 0 END,
+        CASE WHEN p_type = '출고' THEN p_quantity ELSE 0 END,
+        CASE WHEN p_type = '입고' THEN p_total_price ELSE 0 END,
+        CASE WHEN p_type = '출고' THEN p_total_price ELSE 0 END,
+        v_new_stock
+    );
+
+    RETURN to_jsonb(v_transaction) || jsonb_build_object('new_stock', v_new_stock);
+END;
+$$;
+
+-- 10. 입출고 일괄 등록 함수: 여러 건의 입출고 기록 + 상품별 순증감 재고 반영
+-- p_rows: [{product_id, type, quantity, unit_price, total_price, memo, transaction_date}, ...]
+-- 사용자의 상품이 아닌 행이 있거나 재고가 음수가 되는 상품이 있으면 전체를 롤백
+CREATE OR REPLACE FUNCTION create_transactions_bulk(p_user_id UUID, p_rows JSONB)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY INVOKER
+AS $$
+DECLARE
+    v_inserted INTEGER;
+    v_stocks JSONB;
+    v_group RECORD;
+    v_missing UUID;
+BEGIN
+    -- 모든 상품이 이 사용자의 것인지 먼저 확인 (create_transaction처럼 없는 상품은 등록하지 않음)
+    SELECT r.product_id INTO v_missing
+    FROM jsonb_to_recordset(p_rows) AS r(product_id UUID)
+    WHERE NOT EXISTS (SELECT 1 FROM products p WHERE p.id = r.product_id AND p.user_id = p_user_id)
+    LIMIT 1;
+    IF FOUND THEN
+        RAISE EXCEPTION '등록할 수 없는 상품이 있습니다 (삭제되었거나 다른 사용자의 상품): %', v_missing;
+    END IF;
+
+    INSERT INTO transactions (user_id, product_id, type, quantity, unit_price, total_price, memo, transaction_date)
+    SELECT p_user_id, r.product_id, r.type, r.quantity, r.unit_price, r.total_price, r.memo, r.transaction_date
+    FROM jsonb_to_recordset(p_rows) AS r(
+        product_id UUID, type TEXT, quantity INTEGER, unit_price NUMERIC,
+        total_price NUMERIC, memo TEXT, transaction_date TIMESTAMPTZ
+    );
+    GET DIAGNOSTICS v_inserted = ROW_COUNT;
+
+    WITH deltas AS (
+        SELECT r.product_id,
+               SUM(CASE WHEN r.type = '입고' THEN r.quantity ELSE -r.quantity END) AS delta
+        FROM jsonb_to_recordset(p_rows) AS r(product_id UUID, type TEXT, quantity INTEGER)
+        GROUP BY r.product_id
+    ),
+    updated AS (
+        UPDATE products p
+        SET current_stock = p.current_stock + d.delta
+        FROM deltas d
+        WHERE p.id = d.product_id AND p.user_id = p_user_id
+        RETURNING p.id, p.current_stock
+    )
+    SELECT COALESCE(jsonb_object_agg(id, current_stock), '{}'::jsonb) INTO v_stocks FROM updated;
+
+    IF EXISTS (SELECT 1 FROM jsonb_each_text(v_stocks) s WHERE s.value::INTEGER < 0) THEN
+        RAISE EXCEPTION '재고가 음수가 되는 상품이 있습니다';
+    END IF;
+
+    -- 상품·날짜별 일별 재고 스냅샷 반영: 날짜 오름차순으로, 아직 반영하지 않은 이후 날짜분을 뺀 재고를 전달
+    FOR v_group IN
+        WITH groups AS (
+            SELECT r.product_id,
+                   (r.transaction_date AT TIME ZONE 'UTC')::DATE AS day,
+                   COALESCE(SUM(r.quantity) FILTER (WHERE r.type = '입고'), 0) AS in_quantity,
+                   COALESCE(SUM(r.quantity) FILTER (WHERE r.type = '출고'), 0) AS out_quantity,
+                   COALESCE(SUM(r.total_price) FILTER (WHERE r.type = '입고'), 0) AS in_value,
+                   COALESCE(SUM(r.total_price) FILTER (WHERE r.type = '출고'), 0) AS out_value
+            FROM jsonb_to_recordset(p_rows) AS r(
+                product_id UUID, type TEXT, quantity INTEGER, total_price NUMERIC, transaction_date TIMESTAMPTZ
+            )
+            GROUP BY 1, 2
+        )
+        SELECT g.*,
+               (v_stocks ->> g.product_id::TEXT)::INTEGER
+                 - COALESCE(SUM(g.in_quantity - g.out_quantity) OVER (
+                       PARTITION BY g.product_id ORDER BY g.day DESC
+                       ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                   ), 0) AS stock_after
+        FROM groups g
+        WHERE v_stocks ? g.product_id::TEXT
+        ORDER BY g.product_id, g.day
+    LOOP
+        PERFORM apply_stock_snapshot(
+            p_user_id, v_group.product_id, v_group.day,
+            v_group.in_quantity, v_group.out_quantity, v_group.in_value, v_group.out_value,
+            v_group.stock_after
+        );
+    END LOOP;
+
+    RETURN jsonb_build_object('inserted', v_inserted, 'stocks', v_stocks);
+END;
+$$;
+
+-- 11. 재고 요약 통계 함수: 상품 수, 총 재고 가치, 재고 부족 수, 카테고리별 집계
+-- 상품 행을 내려받지 않고 DB에서 집계하므로 응답 크기가 상품 수와 무관
+CREATE OR REPLACE FUNCTION get_inventory_summary(p_user_id UUID)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+    WITH by_category AS (
+        SELECT category,
+               COUNT(*) AS product_count,
+               COALESCE(SUM(current_stock * unit_price), 0) AS stock_value,
+               COUNT(*) FILTER (WHERE current_stock < min_stock) AS low_stock_count
+        FROM products
+        WHERE user_id = p_user_id
+        GROUP BY category
+    )
+    SELECT jsonb_build_object(
+        'total_products', COALESCE(SUM(product_count), 0),
+        'total_stock_value', COALESCE(SUM(stock_value), 0),
+        'low_stock_count', COALESCE(SUM(low_stock_count), 0),
+        'categories', COALESCE(
+            jsonb_agg(jsonb_build_object(
+                'category', category,
+                'product_count', product_count,
+                'stock_value', stock_value
+            ) ORDER BY product_count DESC),
+            '[]'::jsonb
+        )
+    )
+    FROM by_category;
+$$;
+
+-- 12. 입출고 합계 함수: 필터(상품/유형/기간)에 해당하는 전체 입고·출고 수량과 금액
+-- p_date_from 이상, p_date_to 미만
+CREATE OR REPLACE FUNCTION get_transaction_totals(
+    p_user_id UUID,
+    p_product_id UUID DEFAULT NULL,
+    p_type TEXT DEFAULT NULL,
+    p_date_from TIMESTAMPTZ DEFAULT NULL,
+    p_date_to TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+    SELECT jsonb_build_object(
+        'count', COUNT(*),
+        'in_quantity', COALESCE(SUM(quantity) FILTER (WHERE type = '입고'), 0),
+        'out_quantity', COALESCE(SUM(quantity) FILTER (WHERE type = '출고'), 0),
+        'in_value', COALESCE(SUM(total_price) FILTER (WHERE type = '입고'), 0),
+        'out_value', COALESCE(SUM(total_price) FILTER (WHERE type = '출고'), 0)
+    )
+    FROM transactions
+    WHERE user_id = p_user_id
+      AND (p_product_id IS NULL OR product_id = p_product_id)
+      AND (p_type IS NULL OR type = p_type)
+      AND (p_date_from IS NULL OR transaction_date >= p_date_from)
+      AND (p_date_to IS NULL OR transaction_date < p_date_to);
+$$;
+
+-- 13. 입출고 추이 함수: 기간 내 입고·출고 수량/금액을 일/주/월 단위로 집계
+-- p_bucket: 'day' | 'week' | 'month' (주는 월요일 시작), 날짜는 UTC 기준
+CREATE OR REPLACE FUNCTION get_transaction_trend(
+    p_user_id UUID,
+    p_bucket TEXT DEFAULT 'day',
+    p_date_from TIMESTAMPTZ DEFAULT NULL,
+    p_date_to TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+    SELECT COALESCE(jsonb_agg(to_jsonb(t) ORDER BY t.bucket), '[]'::jsonb)
+    FROM (
+        SELECT to_char(date_trunc(p_bucket, transaction_date AT TIME ZONE 'UTC'), 'YYYY-MM-DD') AS bucket,
+               COALESCE(SUM(quantity) FILTER (WHERE type = '입고'), 0) AS in_quantity,
+               COALESCE(SUM(quantity) FILTER (WHERE type = '출고'), 0) AS out_quantity,
+               COALESCE(SUM(total_price) FILTER (WHERE type = '입고'), 0) AS in_value,
+               COALESCE(SUM(total_price) FILTER (WHERE type = '출고'), 0) AS out_value
+        FROM transactions
+        WHERE user_id = p_user_id
+          AND (p_date_from IS NULL OR transaction_date >= p_date_from)
+          AND (p_date_to IS NULL OR transaction_date < p_date_to)
+        GROUP BY 1
+    ) t;
+$$;
+
+-- 14. daily_stock_snapshots 테이블 (상품별 일별 입출고 합계 + 마감 재고)
+-- 입출고 등록 함수(9, 10)가 증분으로 갱신하고, 기존 내역은 rebuild_daily_stock_snapshots()로 채움
+CREATE TABLE IF NOT EXISTS daily_stock_snapshots (
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    product_id UUID NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    snapshot_date DATE NOT NULL,
+    in_quantity INTEGER NOT NULL DEFAULT 0,
+    out_quantity INTEGER NOT NULL DEFAULT 0,
+    in_value NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    out_value NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    closing_stock INTEGER NOT NULL,
+    PRIMARY KEY (product_id, snapshot_date)
+);
+
+CREATE INDEX IF NOT EXISTS idx_snapshots_user_date ON daily_stock_snapshots(user_id, snapshot_date);
+
+ALTER TABLE daily_stock_snapshots ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view their own snapshots"
+    ON daily_stock_snapshots FOR SELECT
+    USING (auth.uid() = user_id);
+
+CREATE POLICY "Users can insert their own snapshots"
+    ON daily_stock_snapshots FOR INSERT
+    WITH CHECK (auth.uid() = user_id);
+
+CREATE POLICY "Users can update their own snapshots"
+    ON daily_stock_snapshots FOR UPDATE
+    USING (auth.uid() = user_id);
+
+CREATE POLICY "Users can delete their own snapshots"
+    ON daily_stock_snapshots FOR DELETE
+    USING (auth.uid() = user_id);
+
+-- 15. 스냅샷 증분 반영 함수: p_date의 입출고 합계를 더하고 마감 재고를 갱신
+-- p_new_stock: 이번 입출고 반영 직후의 현재 재고
+-- p_date 마감 재고 = 현재 재고 - (p_date 이후 날짜들의 순증감 합)
+CREATE OR REPLACE FUNCTION apply_stock_snapshot(
+    p_user_id UUID,
+    p_product_id UUID,
+    p_date DATE,
+    p_in_quantity INTEGER,
+    p_out_quantity INTEGER,
+    p_in_value NUMERIC,
+    p_out_value NUMERIC,
+    p_new_stock INTEGER
+)
+RETURNS VOID
+LANGUAGE sql
+SECURITY INVOKER
+AS $$
+    UPDATE daily_stock_snapshots
+    SET closing_stock = closing_stock + (p_in_quantity - p_out_quantity)
+    WHERE product_id = p_product_id AND snapshot_date > p_date;
+
+    INSERT INTO daily_stock_snapshots AS s
+        (user_id, product_id, snapshot_date, in_quantity, out_quantity, in_value, out_value, closing_stock)
+    VALUES (
+        p_user_id, p_product_id, p_date, p_in_quantity, p_out_quantity, p_in_value, p_out_value,
+        p_new_stock - COALESCE((
+            SELECT SUM(in_quantity - out_quantity) FROM daily_stock_snapshots
+            WHERE product_id = p_product_id AND snapshot_date > p_date
+        ), 0)
+    )
+    ON CONFLICT (product_id, snapshot_date) DO UPDATE SET
+        in_quantity = s.in_quantity + EXCLUDED.in_quantity,
+        out_quantity = s.out_quantity + EXCLUDED.out_quantity,
+        in_value = s.in_value + EXCLUDED.in_value,
+        out_value = s.out_value + EXCLUDED.out_value,
+        closing_stock = EXCLUDED.closing_stock;
+$$;
+
+-- 16. 스냅샷 재구성(백필) 함수: 입출고 내역 전체로 스냅샷을 다시 계산
+-- p_user_id가 NULL이면 모든 사용자 (SQL Editor 또는 service role 키로 실행)
+-- 예: SELECT rebuild_daily_stock_snapshots();
+CREATE OR REPLACE FUNCTION rebuild_daily_stock_snapshots(p_user_id UUID DEFAULT NULL)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY INVOKER
+AS $$
+DECLARE
+    v_count INTEGER;
+BEGIN
+    DELETE FROM daily_stock_snapshots WHERE p_user_id IS NULL OR user_id = p_user_id;
+
+    INSERT INTO daily_stock_snapshots
+        (user_id, product_id, snapshot_date, in_quantity, out_quantity, in_value, out_value, closing_stock)
+    SELECT d.user_id, d.product_id, d.day, d.in_quantity, d.out_quantity, d.in_value, d.out_value,
+           p.current_stock - COALESCE(SUM(d.in_quantity - d.out_quantity) OVER (
+               PARTITION BY d.product_id ORDER BY d.day DESC
+               ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+           ), 0)
+    FROM (
+        SELECT user_id, product_id,
+               (transaction_date AT TIME ZONE 'UTC')::DATE AS day,
+               COALESCE(SUM(quantity) FILTER (WHERE type = '입고'), 0) AS in_quantity,
+               COALESCE(SUM(quantity) FILTER (WHERE type = '출고'), 0) AS out_quantity,
+               COALESCE(SUM(total_price) FILTER (WHERE type = '입고'), 0) AS in_value,
+               COALESCE(SUM(total_price) FILTER (WHERE type = '출고'), 0) AS out_value
+        FROM transactions
+        WHERE p_user_id IS NULL OR user_id = p_user_id
+        GROUP BY 1, 2, 3
+    ) d
+    JOIN products p ON p.id = d.product_id;
+
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$;
+
+-- 17. 재고 추이 함수: 기간 내 날짜별 입고·출고 수량과 마감 재고 (전체 또는 특정 상품)
+-- 스냅샷만 읽으므로 입출고 건수와 무관하게 O(일수)
+CREATE OR REPLACE FUNCTION get_stock_history(
+    p_user_id UUID,
+    p_date_from DATE,
+    p_date_to DATE,
+    p_product_id UUID DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+    WITH current_total AS (
+        SELECT COALESCE(SUM(current_stock), 0) AS stock
+        FROM products
+        WHERE user_id = p_user_id AND (p_product_id IS NULL OR id = p_product_id)
+    ),
+    timeline AS (
+        SELECT day, SUM(in_quantity) AS in_quantity, SUM(out_quantity) AS out_quantity
+        FROM (
+            SELECT d::DATE AS day, 0 AS in_quantity, 0 AS out_quantity
+            FROM generate_series(p_date_from, p_date_to, INTERVAL '1 day') d
+            UNION ALL
+            SELECT snapshot_date, in_quantity, out_quantity
+            FROM daily_stock_snapshots
+            WHERE user_id = p_user_id
+              AND snapshot_date >= p_date_from
+              AND (p_product_id IS NULL OR product_id = p_product_id)
+        ) u
+        GROUP BY day
+    ),
+    series AS (
+        SELECT day, in_quantity, out_quantity,
+               (SELECT stock FROM current_total) - COALESCE(SUM(in_quantity - out_quantity) OVER (
+                   ORDER BY day DESC ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+               ), 0) AS closing_stock
+        FROM timeline
+    )
+    SELECT COALESCE(jsonb_agg(jsonb_build_object(
+        'date', to_char(day, 'YYYY-MM-DD'),
+        'in_quantity', in_quantity,
+        'out_quantity', out_quantity,
+        'closing_stock', closing_stock
+    ) ORDER BY day), '[]'::jsonb)
+    FROM series
+    WHERE day <= p_date_to;
+$$;
+
+-- 18. 상품 검색 인덱스 (상품명/상품코드 부분 일치, 한글 포함)
+-- pg_trgm GIN 인덱스로 ILIKE '%검색어%'를 인덱스 검색으로 처리 (3글자 이상에서 효과)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_products_name_trgm ON products USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_products_sku_trgm ON products USING gin (sku gin_trgm_ops);
+
+-- 19. 상품 검색 함수: 순위(상품코드 일치 → 앞부분 일치 → 유사도) 순으로 페이지 단위 반환
+-- 반환: {"total": 전체 일치 건수, "rows": [상품, ...]}
+CREATE OR REPLACE FUNCTION search_products(
+    p_user_id UUID,
+    p_query TEXT,
+    p_limit INTEGER DEFAULT 50,
+    p_offset INTEGER DEFAULT 0
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+    WITH q AS (
+        SELECT btrim(p_query) AS term,
+               replace(replace(replace(btrim(p_query), '\', '\\'), '%', '\%'), '_', '\_') AS pattern
+    ),
+    matched AS (
+        SELECT p.*,
+               COALESCE(p.sku = q.term, FALSE) AS exact_match,
+               (p.name ILIKE q.pattern || '%' OR COALESCE(p.sku ILIKE q.pattern || '%', FALSE)) AS prefix_match,
+               GREATEST(similarity(p.name, q.term), similarity(COALESCE(p.sku, ''), q.term)) AS score
+        FROM products p, q
+        WHERE p.user_id = p_user_id
+          AND (p.name ILIKE '%' || q.pattern || '%' OR p.sku ILIKE '%' || q.pattern || '%')
+    ),
+    page AS (
+        SELECT * FROM matched
+        ORDER BY exact_match DESC, prefix_match DESC, score DESC, name
+        LIMIT p_limit OFFSET p_offset
+    )
+    SELECT jsonb_build_object(
+        'total', (SELECT COUNT(*) FROM matched),
+        'rows', COALESCE((
+            SELECT jsonb_agg(
+                to_jsonb(page) - 'exact_match' - 'prefix_match' - 'score'
+                ORDER BY exact_match DESC, prefix_match DESC, score DESC, name
+            )
+            FROM page
+        ), '[]'::jsonb)
+    );
+$$;
+
+-- 20. 상품 재고 상태 뷰 (상품 목록/재고 현황 표의 서버 측 정렬·페이지 조회용)
+-- security_invoker: 조회하는 사용자 권한으로 실행되어 products의 RLS가 그대로 적용됨 (PostgreSQL 15+)
+CREATE OR REPLACE VIEW product_stock_status
+WITH (security_invoker = true) AS
+SELECT p.*,
+       p.current_stock < p.min_stock AS is_low_stock,
+       p.current_stock * p.unit_price AS stock_value
+FROM products p;
+
+-- 정렬/필터용 인덱스 (재고가치 Top N, 재고 부족만, 상품명/재고 순 정렬)
+CREATE INDEX IF NOT EXISTS idx_products_user_created ON products(user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_products_user_name ON products(user_id, name, id);
+CREATE INDEX IF NOT EXISTS idx_products_user_stock ON products(user_id, current_stock, id);
+CREATE INDEX IF NOT EXISTS idx_products_user_stock_value ON products(user_id, (current_stock * unit_price) DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_products_user_low_stock ON products(user_id) WHERE current_stock < min_stock;
+
+-- 21. 상품 일괄 등록/수정 함수: (user_id, sku) 기준 upsert
+-- p_rows: [{name, sku, category, unit, unit_price?, current_stock?, min_stock?}, ...] (한 묶음 안에 같은 sku 없음)
+-- current_stock은 새 상품의 초기 재고로만 쓰고, 기존 상품의 재고는 바꾸지 않음 (재고 변경은 입출고로만 기록)
+-- 숫자 컬럼이 비어 있으면(NULL) 새 상품은 0, 기존 상품은 기존 값 유지
+CREATE OR REPLACE FUNCTION upsert_products(p_user_id UUID, p_rows JSONB)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY INVOKER
+AS $$
+DECLARE
+    v_count INTEGER;
+BEGIN
+    INSERT INTO products AS p (user_id, name, sku, category, unit, unit_price, current_stock, min_stock)
+    SELECT p_user_id, r.name, r.sku, r.category, r.unit,
+           COALESCE(r.unit_price, 0), COALESCE(r.current_stock, 0), COALESCE(r.min_stock, 0)
+    FROM jsonb_to_recordset(p_rows) AS r(
+        name TEXT, sku TEXT, category TEXT, unit TEXT, unit_price NUMERIC, current_stock INTEGER, min_stock INTEGER
+    )
+    ON CONFLICT (user_id, sku) DO UPDATE SET
+        name = EXCLUDED.name,
+        category = EXCLUDED.category,
+        unit = EXCLUDED.unit;
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+
+    -- 값이 있는 단가/최소재고만 반영 (ON CONFLICT에서는 입력값이 NULL인지 구분할 수 없어 따로 갱신)
+    UPDATE products p
+    SET unit_price = COALESCE(r.unit_price, p.unit_price),
+        min_stock = COALESCE(r.min_stock, p.min_stock)
+    FROM jsonb_to_recordset(p_rows) AS r(sku TEXT, unit_price NUMERIC, min_stock INTEGER)
+    WHERE p.user_id = p_user_id AND p.sku = r.sku
+      AND (r.unit_price IS NOT NULL OR r.min_stock IS NOT NULL);
+
+    RETURN v_count;
+END;
+$$;
+
 -- 완료!
 -- 이제 앱에서 Supabase에 연결할 수 있습니다.
@@ -1,10 +1,14 @@
 """
 재고마스터 - 메인 앱
 """
+from functools import partial
+
 import streamlit as st
 from utils.auth import sign_in, sign_up, sign_out, is_authenticated
 from utils.helpers import show_success, show_error, show_info
-from utils.styles import apply_global_styles, sidebar_brand, page_header, metric_card, load_lottie_url
+from utils.styles import apply_global_styles, sidebar_brand, page_header, metric_card
+from utils.metrics import start_run, finish_run
+from utils.profiling import profile_page
 
 # 페이지 설정
 st.set_page_config(
@@ -13,9 +17,11 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded"
 )
+profile_page(__file__)
 
-# 전역 스타일 적용
+# 전역 스타일 적용 + 이번 실행 계측 시작
 apply_global_styles()
+start_run("메인")
 
 # 세션 상태 초기화
 if 'user_id' not in st.session_state:
@@ -122,9 +128,14 @@ def show_main_page():
     # 헤더
     page_header("🏠 대시보드", "재고 현황을 한눈에 확인하세요")
 
-    # 통계 카드
-    from utils.database import get_inventory_summary, get_transactions
-    summary = get_inventory_summary(st.session_state['user_id'])
+    # 통계 카드 + 최근 입출고 내역을 동시에 조회
+    from utils.database import get_inventory_summary, get_transactions, fetch_concurrently
+    user_id = st.session_state['user_id']
+    data = fetch_concurrently(
+        summary=partial(get_inventory_summary, user_id),
+        recent=partial(get_transactions, user_id, limit=5),
+    )
+    summary = data['summary']
 
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -164,7 +175,7 @@ def show_main_page():
 
     # 최근 입출고 내역
     st.markdown("#### 📋 최근 입출고 내역")
-    recent = get_transactions(st.session_state['user_id'], limit=5)
+    recent = data['recent']
 
     if recent:
         for t in recent:
@@ -201,6 +212,7 @@ def main():
         show_main_page()
     else:
         show_login_page()
+    finish_run()
 
 
 if __name__ == "__main__":
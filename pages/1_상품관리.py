@@ -3,13 +3,21 @@
 """
 import streamlit as st
 from utils.auth import require_auth
-from utils.database import get_products, create_product, update_product, delete_product, get_product_by_id
-from utils.helpers import show_success, show_error, format_currency, validate_non_negative_number, create_dataframe, export_to_csv
+from utils.database import get_inventory_summary, create_product, update_product, delete_product, get_product_by_id, \
+    upsert_products, BULK_CHUNK_SIZE
+from utils.helpers import show_success, show_error, format_currency, validate_non_negative_number, create_dataframe, \
+    export_to_csv, product_table
 from utils.barcode import scan_barcode_ui, get_product_by_barcode
+from utils.importers import iter_upload_chunks, prepare_product_import
+from utils.components import product_picker, product_table_view
 from utils.styles import apply_global_styles, page_header, sidebar_brand
+from utils.metrics import start_run, finish_run
+from utils.profiling import profile_page
 
 st.set_page_config(page_title="상품관리 - 재고마스터", page_icon="📦", layout="wide")
+profile_page(__file__)
 apply_global_styles()
+start_run("상품관리")
 require_auth()
 
 with st.sidebar:
@@ -19,26 +27,29 @@ page_header("📦 상품관리", "상품을 등록하고 재고를 관리하세
 
 if 'scanned_sku' not in st.session_state:
     st.session_state['scanned_sku'] = ''
+if 'product_upload_key' not in st.session_state:
+    st.session_state['product_upload_key'] = 0
 
-tab1, tab2, tab3 = st.tabs(["📋  상품 목록", "➕  상품 등록", "✏️  상품 수정"])
+tab1, tab2, tab3, tab4 = st.tabs(["📋  상품 목록", "➕  상품 등록", "✏️  상품 수정", "📂  일괄 등록"])
 user_id = st.session_state['user_id']
 
 CATEGORIES = ["식품", "음료", "생활용품", "전자제품", "의류", "기타"]
 UNITS = ["개", "박스", "kg", "L", "세트"]
+MAX_ERROR_ROWS = 1000  # 화면에 표시할 최대 오류 행 수
 
 # ===== 탭 1: 상품 목록 =====
 with tab1:
-    products = get_products(user_id)
+    summary = get_inventory_summary(user_id)
 
-    if products:
+    if summary['total_products']:
         col1, col2, col3 = st.columns(3)
-        total_value = sum(p['current_stock'] * p['unit_price'] for p in products)
-        low_stock = sum(1 for p in products if p['current_stock'] < p['min_stock'])
+        total_value = summary['total_stock_value']
+        low_stock = summary['low_stock_count']
 
         with col1:
             st.markdown(f"""<div style="background:#e3f2fd;border-radius:10px;padding:1rem 1.2rem;border-left:4px solid #1976D2;">
                 <div style="color:#1565C0;font-size:0.8rem;font-weight:600;">총 상품 수</div>
-                <div style="font-size:1.6rem;font-weight:700;color:#212529;">{len(products)}개</div></div>""",
+                <div style="font-size:1.6rem;font-weight:700;color:#212529;">{summary['total_products']:,}개</div></div>""",
                 unsafe_allow_html=True)
         with col2:
             st.markdown(f"""<div style="background:#e8f5e9;border-radius:10px;padding:1rem 1.2rem;border-left:4px solid #388E3C;">
@@ -56,20 +67,7 @@ with tab1:
 
         st.markdown("<div style='height:0.8rem'></div>", unsafe_allow_html=True)
         search = st.text_input("🔍 상품명 또는 코드 검색", placeholder="검색어 입력...", label_visibility="collapsed")
-        if search:
-            products = [p for p in products if
-                        search.lower() in p['name'].lower() or
-                        search.lower() in (p.get('sku') or '').lower()]
-
-        df = create_dataframe(products)
-        if not df.empty:
-            display_df = df[['name', 'sku', 'category', 'unit', 'unit_price', 'current_stock', 'min_stock']].copy()
-            display_df.columns = ['상품명', '상품코드', '카테고리', '단위', '단가', '현재재고', '최소재고']
-            display_df['재고상태'] = display_df.apply(
-                lambda r: '⚠️ 부족' if r['현재재고'] < r['최소재고'] else '✅ 정상', axis=1)
-            display_df['단가'] = display_df['단가'].apply(format_currency)
-            st.dataframe(display_df, use_container_width=True, hide_index=True)
-            export_to_csv(display_df, "상품목록.csv")
+        product_table_view(user_id, "product_list", product_table, "상품목록.csv", search=search)
     else:
         st.markdown("""<div style="text-align:center;padding:3rem;background:#f8f9fa;border-radius:14px;border:2px dashed #dee2e6;">
             <div style="font-size:3rem;margin-bottom:0.5rem;">📦</div>
@@ -127,14 +125,11 @@ with tab2:
 # ===== 탭 3: 상품 수정 =====
 with tab3:
     st.markdown("#### 상품 정보 수정")
-    products = get_products(user_id)
-
-    if products:
-        product_options = {f"{p['name']}  ({p.get('sku') or 'SKU 없음'})": p['id'] for p in products}
-        selected = st.selectbox("수정할 상품 선택", list(product_options.keys()))
+    if summary['total_products']:
+        selected = product_picker(user_id, "수정할 상품 선택", key="edit_product")
 
         if selected:
-            product = get_product_by_id(product_options[selected])
+            product = get_product_by_id(user_id, selected)
             if product:
                 stock_color = "#dc3545" if product['current_stock'] < product['min_stock'] else "#28a745"
                 st.markdown(f"""
@@ -169,7 +164,7 @@ with tab3:
                         if not name:
                             show_error("상품명을 입력해주세요.")
                         else:
-                            result = update_product(product_options[selected], {
+                            result = update_product(user_id, selected, {
                                 'name': name, 'sku': sku or None, 'category': category,
                                 'unit': unit, 'unit_price': unit_price, 'min_stock': min_stock
                             })
@@ -180,10 +175,58 @@ with tab3:
                                 show_error("상품 수정에 실패했습니다.")
 
                     if delete_btn:
-                        if delete_product(product_options[selected]):
+                        if delete_product(user_id, selected):
                             show_success("상품이 삭제되었습니다.")
                             st.rerun()
                         else:
                             show_error("상품 삭제에 실패했습니다.")
     else:
         st.info("등록된 상품이 없습니다.")
+
+# ===== 탭 4: 일괄 등록 =====
+with tab4:
+    st.markdown("#### CSV/Excel 상품 일괄 등록")
+    st.caption("상품코드가 이미 있으면 수정, 없으면 새로 등록합니다. "
+               "필수: sku(상품코드) · name(상품명) · category(카테고리) · unit(단위) / "
+               "선택: unit_price(단가) · current_stock(초기재고) · min_stock(최소재고)")
+    st.caption("현재재고는 새 상품의 초기 재고로만 쓰이며, 이미 있는 상품의 재고는 바뀌지 않습니다 "
+               "(재고 조정은 입출고로 등록). 선택 항목을 비워 두면 새 상품은 0, 기존 상품은 기존 값을 유지합니다.")
+    template = "sku,name,category,unit,unit_price,current_stock,min_stock\n8801234567890,콜라 500ml,음료,개,1500,0,10\n"
+    st.download_button("📄 양식 다운로드", template.encode('utf-8-sig'), "상품_양식.csv", mime='text/csv')
+
+    uploaded = st.file_uploader("파일 선택", type=['csv', 'xlsx'],
+                                key=f"product_upload_{st.session_state['product_upload_key']}")
+    batch_size = st.number_input("묶음 크기 (행)", min_value=100, max_value=5000, value=BULK_CHUNK_SIZE, step=100)
+
+    if uploaded and st.button("✅  일괄 등록 시작", use_container_width=True, type="primary"):
+        progress = st.empty()
+        upserted, error_count, error_rows = 0, 0, []
+        next_row = 2  # 1행은 헤더
+        try:
+            for chunk in iter_upload_chunks(uploaded, int(batch_size)):
+                rows, row_numbers, chunk_errors = prepare_product_import(chunk, CATEGORIES, UNITS, next_row)
+                next_row += len(chunk)
+                result = upsert_products(user_id, rows, int(batch_size))
+                upserted += result['upserted']
+
+                failed = chunk_errors.to_dict('records') + [
+                    {'행': row_numbers[i], '상품코드': rows[i]['sku'], '오류': message}
+                    for i, message in result['failed']
+                ]
+                error_count += len(failed)
+                error_rows.extend(failed[:MAX_ERROR_ROWS - len(error_rows)])
+                progress.info(f"⏳ {next_row - 2:,}행 처리 중... (성공 {upserted:,}건 · 오류 {error_count:,}건)")
+        except ValueError as e:
+            show_error(str(e))
+            st.stop()
+
+        progress.empty()
+        show_success(f"{next_row - 2:,}행 중 {upserted:,}건 등록/수정 완료!")
+        if error_rows:
+            show_error(f"오류 {error_count:,}건 (최대 {MAX_ERROR_ROWS:,}건 표시)")
+            error_df = create_dataframe(error_rows)
+            st.dataframe(error_df, use_container_width=True, hide_index=True)
+            export_to_csv(error_df, "상품_일괄등록_오류.csv")
+        st.session_state['product_upload_key'] += 1
+
+finish_run()
@@ -4,13 +4,23 @@
 import streamlit as st
 from datetime import datetime
 from utils.auth import require_auth
-from utils.database import get_products, get_transactions, create_transaction, get_product_by_id
-from utils.helpers import show_success, show_error, format_currency, validate_positive_number, create_dataframe, export_to_csv
-from utils.barcode import scan_barcode_ui, get_product_by_barcode
+from utils.database import get_inventory_summary, get_transactions_page, get_transaction_totals, create_transaction, get_product_by_id, \
+    get_products_by_skus, create_transactions_bulk
+from utils.helpers import show_success, show_error, format_currency, validate_positive_number, create_dataframe, \
+    export_to_csv, transaction_table, TABLE_COLUMN_CONFIG
+from utils.barcode import scan_barcode_ui, get_product_by_barcode, init_scan_session, clear_scan_session, \
+    scan_session_input
+from utils.importers import read_upload, normalize_columns, prepare_transaction_import, \
+    TRANSACTION_HEADER_ALIASES, TRANSACTION_REQUIRED_COLUMNS
+from utils.components import product_picker
 from utils.styles import apply_global_styles, page_header, sidebar_brand
+from utils.metrics import start_run, finish_run
+from utils.profiling import profile_page
 
 st.set_page_config(page_title="입출고관리 - 재고마스터", page_icon="📥", layout="wide")
+profile_page(__file__)
 apply_global_styles()
+start_run("입출고관리")
 require_auth()
 
 with st.sidebar:
@@ -18,17 +28,15 @@ with st.sidebar:
 
 page_header("📥 입출고관리", "입고·출고를 등록하고 내역을 확인하세요")
 
-if 'barcode_product_index' not in st.session_state:
-    st.session_state['barcode_product_index'] = 0
+if 'transaction_upload_key' not in st.session_state:
+    st.session_state['transaction_upload_key'] = 0
 
-tab1, tab2 = st.tabs(["➕  입출고 등록", "📋  입출고 내역"])
+tab1, tab2, tab3, tab4 = st.tabs(["➕  입출고 등록", "📋  입출고 내역", "📂  일괄 등록", "🛒  스캔 세션"])
 user_id = st.session_state['user_id']
 
 # ===== 탭 1: 입출고 등록 =====
 with tab1:
-    products = get_products(user_id)
-
-    if not products:
+    if not get_inventory_summary(user_id)['total_products']:
         st.markdown("""<div style="text-align:center;padding:3rem;background:#fff3e0;border-radius:14px;border:2px dashed #ffcc02;">
             <div style="font-size:3rem;margin-bottom:0.5rem;">⚠️</div>
             <div style="font-weight:600;color:#E65100;">등록된 상품이 없습니다</div>
@@ -43,13 +51,12 @@ with tab1:
             found = get_product_by_barcode(user_id, scanned)
             if found:
                 st.success(f"✅ **{found['name']}** 선택됨 · 현재 재고: **{found['current_stock']}{found['unit']}**")
-                for i, p in enumerate(products):
-                    if p['id'] == found['id']:
-                        st.session_state['barcode_product_index'] = i
-                        break
+                st.session_state['transaction_product_select'] = found['id']
             else:
                 st.error(f"❌ 바코드 **{scanned}** 에 해당하는 상품이 없습니다. 먼저 상품을 등록해주세요.")
 
+    product_id = product_picker(user_id, "상품 *", key="transaction_product")
+
     with st.form("transaction_form"):
         # 입/출고 선택 (눈에 띄게)
         trans_type = st.radio("거래 유형", ["📥  입고", "📤  출고"], horizontal=True)
@@ -59,12 +66,6 @@ with tab1:
 
         col1, col2 = st.columns(2)
         with col1:
-            product_keys = [f"{p['name']}  (재고: {p['current_stock']}{p['unit']})" for p in products]
-            product_ids = [p['id'] for p in products]
-            default_idx = min(st.session_state.get('barcode_product_index', 0), len(product_keys) - 1)
-            selected_label = st.selectbox("상품 *", product_keys, index=default_idx)
-            selected_idx = product_keys.index(selected_label)
-            product_id = product_ids[selected_idx]
             quantity = st.number_input("수량 *", min_value=1, value=1)
 
         with col2:
@@ -76,8 +77,10 @@ with tab1:
         submitted = st.form_submit_button("✅  등록", use_container_width=True, type="primary")
 
         if submitted:
-            product = get_product_by_id(product_id)
-            if trans_type_value == "출고" and product['current_stock'] < quantity:
+            product = get_product_by_id(user_id, product_id) if product_id else None
+            if product is None:
+                show_error("상품을 선택해주세요.")
+            elif trans_type_value == "출고" and product['current_stock'] < quantity:
                 show_error(f"재고 부족! 현재 재고: {product['current_stock']}{product['unit']}")
                 st.stop()
             elif not validate_positive_number(quantity, "수량"):
@@ -95,56 +98,62 @@ with tab1:
                     'transaction_date': transaction_date.isoformat()
                 })
                 if result:
-                    updated = get_product_by_id(product_id)
+                    new_stock = result[0]['new_stock']
                     show_success(f"{trans_type_value} {quantity}{product['unit']} 등록 완료!")
                     color = "#28a745" if trans_type_value == "입고" else "#dc3545"
                     st.markdown(f"""
                     <div style="background:#f8f9fa;border-radius:10px;padding:0.8rem 1.2rem;border-left:4px solid {color};">
                         📦 <strong>{product['name']}</strong> 업데이트된 재고:
-                        <strong style="color:{color};">{updated['current_stock']}{updated['unit']}</strong>
+                        <strong style="color:{color};">{new_stock}{product['unit']}</strong>
                     </div>""", unsafe_allow_html=True)
-                    st.session_state['barcode_product_index'] = 0
                     st.rerun()
                 else:
                     show_error("입출고 등록에 실패했습니다.")
 
 # ===== 탭 2: 입출고 내역 =====
 with tab2:
-    products = get_products(user_id)
-
-    col1, col2, col3 = st.columns([2, 1, 1])
+    col1, col2, col3, col4 = st.columns([3, 1, 1.5, 1])
     with col1:
-        filter_opts = ["전체"] + [f"{p['name']} ({p.get('sku', '')})" for p in products]
-        selected_filter = st.selectbox("상품 필터", filter_opts, label_visibility="collapsed")
+        filter_product_id = product_picker(user_id, "상품 필터", key="history_product", allow_all=True,
+                                           label_visibility="collapsed")
     with col2:
         type_filter = st.selectbox("유형", ["전체", "입고", "출고"], label_visibility="collapsed")
     with col3:
-        limit = st.number_input("표시 개수", min_value=10, max_value=500, value=100, step=10, label_visibility="collapsed")
+        date_range = st.date_input("기간", value=[], format="YYYY-MM-DD", label_visibility="collapsed")
+    with col4:
+        page_size = st.selectbox("페이지당 개수", [20, 50, 100, 200], index=2, label_visibility="collapsed")
 
-    # 내역 조회
-    if selected_filter == "전체":
-        transactions = get_transactions(user_id, limit=limit)
-    else:
-        product_name = selected_filter.split(" (")[0]
-        pid = next((p['id'] for p in products if p['name'] == product_name), None)
-        transactions = get_transactions(user_id, product_id=pid, limit=limit)
+    filters = {
+        'product_id': filter_product_id,
+        'trans_type': None if type_filter == "전체" else type_filter,
+        'start_date': date_range[0] if len(date_range) > 0 else None,
+        'end_date': date_range[1] if len(date_range) > 1 else None,
+    }
 
-    if type_filter != "전체":
-        transactions = [t for t in transactions if t['type'] == type_filter]
+    # 필터가 바뀌면 첫 페이지부터
+    history_filter = (*filters.values(), page_size)
+    if st.session_state.get('history_filter') != history_filter:
+        st.session_state['history_filter'] = history_filter
+        st.session_state['history_cursor'] = None
+        st.session_state['history_direction'] = 'next'
+        st.session_state['history_page_no'] = 1
+
+    # 내역 조회 (커서 페이지, 필터는 DB에서 적용)
+    page = get_transactions_page(user_id, cursor=st.session_state['history_cursor'],
+                                 direction=st.session_state['history_direction'],
+                                 page_size=page_size, **filters)
+    transactions = page['rows']
 
     if transactions:
-        # 요약 통계 배너
-        total_in_qty = sum(t['quantity'] for t in transactions if t['type'] == '입고')
-        total_out_qty = sum(t['quantity'] for t in transactions if t['type'] == '출고')
-        total_in_val = sum(t['total_price'] for t in transactions if t['type'] == '입고')
-        total_out_val = sum(t['total_price'] for t in transactions if t['type'] == '출고')
+        # 요약 통계 배너 (현재 페이지가 아닌 필터 전체 기준)
+        totals = get_transaction_totals(user_id, **filters)
 
         c1, c2, c3, c4 = st.columns(4)
         for col, label, val, color in [
-            (c1, "📥 총 입고 수량", f"{total_in_qty}개", "#28a745"),
-            (c2, "📤 총 출고 수량", f"{total_out_qty}개", "#dc3545"),
-            (c3, "💚 입고 금액", format_currency(total_in_val), "#28a745"),
-            (c4, "💸 출고 금액", format_currency(total_out_val), "#dc3545"),
+            (c1, "📥 총 입고 수량", f"{totals['in_quantity']}개", "#28a745"),
+            (c2, "📤 총 출고 수량", f"{totals['out_quantity']}개", "#dc3545"),
+            (c3, "💚 입고 금액", format_currency(totals['in_value']), "#28a745"),
+            (c4, "💸 출고 금액", format_currency(totals['out_value']), "#dc3545"),
         ]:
             with col:
                 st.markdown(f"""<div style="background:#f8f9fa;border-radius:10px;padding:0.8rem 1rem;border-left:3px solid {color};margin-bottom:0.5rem;">
@@ -155,27 +164,168 @@ with tab2:
         st.markdown("<div style='height:0.5rem'></div>", unsafe_allow_html=True)
 
         # 테이블
-        trans_list = [{
-            '날짜': t['transaction_date'][:10],
-            '상품명': t.get('products', {}).get('name', '알 수 없음'),
-            '상품코드': t.get('products', {}).get('sku') or '-',
-            '유형': t['type'],
-            '수량': t['quantity'],
-            '단가': format_currency(t['unit_price']),
-            '합계': format_currency(t['total_price']),
-            '메모': t.get('memo') or '-'
-        } for t in transactions]
-
-        df = create_dataframe(trans_list)
-
-        def highlight_type(row):
-            color = '#e8f5e9' if row['유형'] == '입고' else '#ffebee'
-            return [f'background-color: {color}'] * len(row)
-
-        st.dataframe(df.style.apply(highlight_type, axis=1), use_container_width=True, hide_index=True)
+        df = transaction_table(transactions)
+        st.dataframe(df, column_config=TABLE_COLUMN_CONFIG, use_container_width=True, hide_index=True)
+
+        # 페이지 이동
+        nav_prev, nav_info, nav_next = st.columns([1, 2, 1])
+        with nav_prev:
+            if st.button("◀  이전", use_container_width=True, disabled=page['prev_cursor'] is None):
+                st.session_state['history_cursor'] = page['prev_cursor']
+                st.session_state['history_direction'] = 'prev'
+                st.session_state['history_page_no'] -= 1
+                st.rerun()
+        with nav_info:
+            st.markdown(f"<div style='text-align:center;color:#6c757d;padding-top:0.5rem;'>"
+                        f"{st.session_state['history_page_no']} 페이지 · 총 {totals['count']:,}건</div>",
+                        unsafe_allow_html=True)
+        with nav_next:
+            if st.button("다음  ▶", use_container_width=True, disabled=page['next_cursor'] is None):
+                st.session_state['history_cursor'] = page['next_cursor']
+                st.session_state['history_direction'] = 'next'
+                st.session_state['history_page_no'] += 1
+                st.rerun()
+
         export_to_csv(df, "입출고내역.csv")
     else:
         st.markdown("""<div style="text-align:center;padding:3rem;background:#f8f9fa;border-radius:14px;border:2px dashed #dee2e6;">
             <div style="font-size:3rem;margin-bottom:0.5rem;">📋</div>
             <div style="font-weight:600;color:#495057;">입출고 내역이 없습니다</div></div>""",
             unsafe_allow_html=True)
+
+# ===== 탭 3: 일괄 등록 =====
+with tab3:
+    st.markdown("#### CSV/Excel 일괄 등록")
+    st.caption("컬럼: sku(상품코드) · type(입고/출고) · quantity(수량) · unit_price(단가, 비우면 상품 단가) · "
+               "memo(메모) · date(날짜, 비우면 오늘)")
+    template = "sku,type,quantity,unit_price,memo,date\n8801234567890,입고,10,1000,거래처A,2025-01-31\n"
+    st.download_button("📄 양식 다운로드", template.encode('utf-8-sig'), "입출고_양식.csv", mime='text/csv')
+
+    uploaded = st.file_uploader("파일 선택", type=['csv', 'xlsx'],
+                                key=f"transaction_upload_{st.session_state['transaction_upload_key']}")
+    if uploaded:
+        try:
+            upload_df = normalize_columns(read_upload(uploaded), TRANSACTION_HEADER_ALIASES,
+                                          TRANSACTION_REQUIRED_COLUMNS)
+        except ValueError as e:
+            show_error(str(e))
+            st.stop()
+
+        products_by_sku = get_products_by_skus(user_id, upload_df['sku'].str.strip().tolist())
+        rows, errors = prepare_transaction_import(upload_df, products_by_sku)
+
+        in_count = sum(1 for r in rows if r['type'] == '입고')
+        c1, c2, c3 = st.columns(3)
+        c1.metric("전체 행", f"{len(upload_df)}건")
+        c2.metric("등록 가능", f"{len(rows)}건", f"입고 {in_count} · 출고 {len(rows) - in_count}", delta_color="off")
+        c3.metric("오류", f"{errors['행'].nunique()}건")
+
+        if not errors.empty:
+            st.markdown("##### ❌ 오류 행 (등록에서 제외됩니다)")
+            st.dataframe(errors, use_container_width=True, hide_index=True)
+
+        if rows and st.button(f"✅  {len(rows)}건 일괄 등록", use_container_width=True, type="primary"):
+            with st.spinner("등록 중..."):
+                result = create_transactions_bulk(user_id, rows)
+            if result['error']:
+                show_error(f"{result['inserted']}건 등록 후 오류가 발생했습니다: {result['error']}")
+            else:
+                show_success(f"{result['inserted']}건 일괄 등록 완료!")
+                st.session_state['transaction_upload_key'] += 1
+
+# ===== 탭 4: 스캔 세션 =====
+with tab4:
+    init_scan_session()
+    st.markdown("#### 연속 스캔 후 한 번에 등록")
+    st.caption("같은 상품을 다시 스캔하면 수량이 1씩 늘어납니다. 스캔을 마치면 한 번에 등록하세요.")
+
+    scan_type = st.radio("거래 유형", ["📥  입고", "📤  출고"], horizontal=True, key="scan_type")
+    scan_type_value = "입고" if "입고" in scan_type else "출고"
+
+    notice = st.session_state.pop('scan_notice', None)
+    if notice:
+        show_success(notice)
+
+    scan_session_input(user_id)
+
+    last = st.session_state['scan_last']
+    if last:
+        last_sku, last_product = last
+        if last_product:
+            st.success(f"✅ **{last_product['name']}** +1 "
+                       f"(장바구니 {st.session_state['scan_basket'].get(last_product['id'], 0)}{last_product['unit']})")
+        else:
+            st.error(f"❌ 바코드 **{last_sku}** 에 해당하는 상품이 없습니다.")
+
+    unknown = st.session_state['scan_unknown']
+    if unknown:
+        st.warning("미등록 바코드 (등록에서 제외됩니다): "
+                   + ", ".join(f"{sku} ×{count}" for sku, count in unknown.items()))
+
+    basket = st.session_state['scan_basket']
+    if basket:
+        basket_products = [get_product_by_id(user_id, pid) for pid in basket]
+        basket_df = create_dataframe([{
+            'product_id': p['id'],
+            '상품명': p['name'],
+            '상품코드': p.get('sku') or '-',
+            '현재재고': p['current_stock'],
+            '수량': basket[p['id']],
+            '단위': p['unit'],
+        } for p in basket_products if p])
+        edited = st.data_editor(
+            basket_df,
+            key=f"scan_editor_{st.session_state['scan_version']}",
+            column_config={
+                'product_id': None,
+                '수량': st.column_config.NumberColumn("수량", min_value=0, step=1, help="0이면 장바구니에서 제외"),
+            },
+            disabled=['상품명', '상품코드', '현재재고', '단위'],
+            use_container_width=True,
+            hide_index=True,
+        )
+        # 수량 수정은 장바구니에 반영하고 편집기를 새로 그림 (행 삭제 후 편집 위치가 어긋나지 않도록)
+        edited_basket = {row.product_id: int(row.수량) for row in edited.itertuples(index=False) if row.수량 > 0}
+        if edited_basket != basket:
+            st.session_state['scan_basket'] = edited_basket
+            st.session_state['scan_version'] += 1
+            st.rerun()
+
+        by_id = {p['id']: p for p in basket_products if p}
+        short = [by_id[pid]['name'] for pid, qty in basket.items()
+                 if scan_type_value == "출고" and pid in by_id and by_id[pid]['current_stock'] < qty]
+        if short:
+            show_error(f"재고 부족: {', '.join(short)}")
+
+        total_qty = sum(basket.values())
+        col_commit, col_clear = st.columns([3, 1])
+        with col_commit:
+            commit = st.button(f"✅  {len(basket)}개 상품 · {total_qty}개 {scan_type_value} 등록",
+                               use_container_width=True, type="primary", disabled=bool(short) or not basket)
+        with col_clear:
+            if st.button("🗑️  비우기", use_container_width=True):
+                clear_scan_session()
+                st.rerun()
+
+        if commit:
+            today = datetime.now().date().isoformat()
+            rows = [{
+                'product_id': pid,
+                'type': scan_type_value,
+                'quantity': qty,
+                'unit_price': by_id[pid]['unit_price'],
+                'total_price': qty * by_id[pid]['unit_price'],
+                'memo': "스캔 세션",
+                'transaction_date': today,
+            } for pid, qty in basket.items() if pid in by_id]
+            result = create_transactions_bulk(user_id, rows)
+            if result['error']:
+                show_error(f"등록에 실패했습니다: {result['error']}")
+            else:
+                clear_scan_session()
+                st.session_state['scan_notice'] = f"{scan_type_value} {result['inserted']}건 등록 완료!"
+                st.rerun()
+    else:
+        st.info("ℹ️ 스캔한 상품이 여기에 쌓입니다.")
+
+finish_run()
@@ -2,16 +2,22 @@
 대시보드 페이지
 """
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+from datetime import date, timedelta
+from functools import partial
 from utils.auth import require_auth
-from utils.database import get_products, get_transactions, get_low_stock_products, get_inventory_summary
-from utils.helpers import format_currency
+from utils.database import get_products_page, get_transaction_trend, get_stock_history, get_inventory_summary, \
+    fetch_concurrently
+from utils.helpers import inventory_table, forecast_table
+from utils.forecast import get_forecast, runs_out_within
+from utils.components import product_table_view
 from utils.styles import apply_global_styles, page_header, sidebar_brand
+from utils.metrics import start_run, finish_run
+from utils.profiling import profile_page
 
 st.set_page_config(page_title="대시보드 - 재고마스터", page_icon="📊", layout="wide")
+profile_page(__file__)
 apply_global_styles()
+start_run("대시보드")
 require_auth()
 
 with st.sidebar:
@@ -20,7 +26,41 @@ with st.sidebar:
 page_header("📊 재고 대시보드", "전체 재고 현황과 통계를 확인하세요")
 
 user_id = st.session_state['user_id']
-summary = get_inventory_summary(user_id)
+
+TREND_PERIODS = {"최근 30일": 30, "최근 90일": 90, "최근 1년": 365, "직접 선택": None}
+TREND_BUCKETS = {"일별": "day", "주별": "week", "월별": "month"}
+# 재고 부족 알림에 표시할 최대 상품 수 (재고가 적은 순)
+LOW_STOCK_ALERT_LIMIT = 20
+# 재고 소진 예상 목록의 기본 기간 (일)
+RUNOUT_DAYS_DEFAULT = 14
+
+
+def trend_range() -> tuple:
+    """입출고/재고 추이 조회 기간 (위젯보다 먼저 조회하므로 session_state의 현재 선택값 사용)"""
+    today = date.today()
+    days = TREND_PERIODS[st.session_state.get('trend_period', next(iter(TREND_PERIODS)))]
+    if days is not None:
+        return today - timedelta(days=days - 1), today
+    picked = st.session_state.get('trend_range', (today - timedelta(days=30), today))
+    start_date = picked[0] if len(picked) > 0 else None
+    end_date = picked[1] if len(picked) > 1 else today
+    return start_date, end_date
+
+
+# 화면의 조회를 한 번에 동시 실행 (응답 시간 ≈ 가장 느린 조회 하나)
+start_date, end_date = trend_range()
+data = fetch_concurrently(
+    summary=partial(get_inventory_summary, user_id),
+    low_stock=partial(get_products_page, user_id, sort='current_stock', descending=False,
+                      limit=LOW_STOCK_ALERT_LIMIT, low_stock_only=True),
+    top_products=partial(get_products_page, user_id, sort='stock_value', descending=True, limit=10),
+    trend=partial(get_transaction_trend, user_id,
+                  TREND_BUCKETS[st.session_state.get('trend_bucket', next(iter(TREND_BUCKETS)))],
+                  start_date, end_date),
+    history=partial(get_stock_history, user_id, start_date or end_date - timedelta(days=29), end_date),
+    forecast=partial(get_forecast, user_id),
+)
+summary = data['summary']
 
 # ===== KPI 카드 =====
 col1, col2, col3 = st.columns(3)
@@ -42,11 +82,11 @@ for col, (label, val, color, bg) in zip([col1, col2, col3], kpis):
 
 st.markdown("<div style='height:1rem'></div>", unsafe_allow_html=True)
 
-# ===== 재고 부족 알림 =====
-low_stock_products = get_low_stock_products(user_id)
-if low_stock_products:
-    with st.expander(f"⚠️  재고 부족 상품 {len(low_stock_products)}개 — 클릭하여 확인", expanded=True):
-        for p in low_stock_products:
+# ===== 재고 부족 알림 (재고가 적은 순으로 최대 LOW_STOCK_ALERT_LIMIT개) =====
+low_stock = data['low_stock']
+if low_stock['rows']:
+    with st.expander(f"⚠️  재고 부족 상품 {low_stock['total']}개 — 클릭하여 확인", expanded=True):
+        for p in low_stock['rows']:
             pct = int(p['current_stock'] / max(p['min_stock'], 1) * 100)
             color = "#dc3545" if pct < 50 else "#fd7e14"
             st.markdown(f"""
@@ -58,27 +98,50 @@ if low_stock_products:
                 <span style="background:{color};color:#fff;font-size:0.75rem;
                              padding:2px 8px;border-radius:20px;font-weight:600;">{pct}%</span>
             </div>""", unsafe_allow_html=True)
+        if low_stock['total'] > len(low_stock['rows']):
+            st.caption(f"외 {low_stock['total'] - len(low_stock['rows'])}개는 아래 전체 재고 현황에서 "
+                       "'재고 부족만'을 선택해 확인하세요.")
 
 st.divider()
 
 # ===== 차트 영역 =====
-products = get_products(user_id)
-transactions = get_transactions(user_id, limit=200)
+if summary['total_products']:
+    # 차트 라이브러리는 그릴 데이터가 있을 때만 import
+    import pandas as pd
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    # 재고 소진 예상 (최근 출고 속도 기준, 재고 부족 기준과 별개로 곧 떨어질 상품)
+    st.markdown("##### ⏳ 재고 소진 예상")
+    col_days, col_export = st.columns([3, 1])
+    with col_days:
+        runout_days = st.slider("소진 예상 기간 (일)", 1, 90, RUNOUT_DAYS_DEFAULT, key="runout_days")
+    forecast = data['forecast']
+    runout = runs_out_within(forecast, runout_days)
+    if runout.empty:
+        st.caption(f"{runout_days}일 안에 재고가 소진될 것으로 예상되는 상품이 없습니다.")
+    else:
+        st.dataframe(forecast_table(runout), hide_index=True, use_container_width=True)
+    reorder = forecast[forecast['reorder_quantity'] > 0].sort_values('days_of_cover')
+    with col_export:
+        st.download_button(f"📥 재주문 제안 {len(reorder)}개",
+                           forecast_table(reorder).to_csv(index=False, encoding='utf-8-sig'),
+                           file_name="재주문제안.csv", mime='text/csv', disabled=reorder.empty, key="reorder_export")
+    st.caption("하루 출고량은 최근 출고에 더 큰 비중을 둔 지수평활 평균이며, 제안 주문량은 리드타임과 "
+               "다음 주문까지의 수요, 안전재고를 더한 값에서 현재재고를 뺀 양입니다.")
+
+    st.divider()
 
-if products:
     col1, col2 = st.columns(2)
 
     # 카테고리별 파이 차트
     with col1:
         st.markdown("##### 📦 카테고리별 상품 분포")
-        cat_counts = {}
-        for p in products:
-            c = p.get('category', '기타')
-            cat_counts[c] = cat_counts.get(c, 0) + 1
+        categories = summary['categories']
 
         fig = px.pie(
-            values=list(cat_counts.values()),
-            names=list(cat_counts.keys()),
+            values=[c['product_count'] for c in categories],
+            names=[c['category'] for c in categories],
             hole=0.45,
             color_discrete_sequence=px.colors.qualitative.Set3
         )
@@ -96,10 +159,8 @@ if products:
     # 상품별 재고 가치 바 차트
     with col2:
         st.markdown("##### 💰 상품별 재고 가치 Top 10")
-        product_values = sorted(
-            [{'상품명': p['name'], '재고가치': p['current_stock'] * p['unit_price']} for p in products],
-            key=lambda x: x['재고가치'], reverse=True
-        )[:10]
+        top_products = data['top_products']['rows']
+        product_values = [{'상품명': p['name'], '재고가치': p['stock_value']} for p in top_products]
 
         if product_values:
             df_v = pd.DataFrame(product_values)
@@ -122,20 +183,25 @@ if products:
 
     st.divider()
 
-    # 입출고 추이 라인 차트
-    if transactions:
-        st.markdown("##### 📈 입출고 추이")
-        trans_by_date: dict = {}
-        for t in transactions:
-            date = t['transaction_date'][:10]
-            if date not in trans_by_date:
-                trans_by_date[date] = {'입고': 0, '출고': 0}
-            trans_by_date[date][t['type']] += t['quantity']
-
-        df_trend = pd.DataFrame([
-            {'날짜': d, '입고': v['입고'], '출고': v['출고']}
-            for d, v in sorted(trans_by_date.items())
-        ])
+    # 입출고 추이 라인 차트 (DB에서 기간별 집계)
+    st.markdown("##### 📈 입출고 추이")
+    col_period, col_bucket = st.columns([2, 1])
+    with col_period:
+        period = st.radio("기간", list(TREND_PERIODS), horizontal=True, label_visibility="collapsed",
+                          key="trend_period")
+    with col_bucket:
+        st.radio("단위", list(TREND_BUCKETS), horizontal=True, label_visibility="collapsed", key="trend_bucket")
+
+    if TREND_PERIODS[period] is None:
+        today = date.today()
+        st.date_input("조회 기간", value=(today - timedelta(days=30), today), format="YYYY-MM-DD",
+                      key="trend_range")
+
+    trend = data['trend']
+    if trend:
+        df_trend = pd.DataFrame(trend).rename(columns={
+            'bucket': '날짜', 'in_quantity': '입고', 'out_quantity': '출고'
+        })
 
         if not df_trend.empty:
             fig3 = go.Figure()
@@ -165,22 +231,41 @@ if products:
                 yaxis=dict(showgrid=True, gridcolor='#f0f0f0'),
             )
             st.plotly_chart(fig3, use_container_width=True)
+    else:
+        st.caption("선택한 기간에 입출고 내역이 없습니다.")
+
+    # 재고 추이 (일별 스냅샷 기반, 같은 기간)
+    st.markdown("##### 📦 재고 추이")
+    history = data['history']
+    if history['days']:
+        col_open, col_close, col_change = st.columns(3)
+        col_open.metric("기초 재고", f"{history['opening_stock']:,}")
+        col_close.metric("기말 재고", f"{history['closing_stock']:,}")
+        col_change.metric("증감", f"{history['closing_stock'] - history['opening_stock']:+,}")
+
+        df_stock = pd.DataFrame(history['days'])
+        fig4 = go.Figure(go.Scatter(
+            x=df_stock['date'], y=df_stock['closing_stock'],
+            mode='lines', name='마감 재고', line=dict(color='#1976D2', width=2.5, shape='hv'),
+            fill='tozeroy', fillcolor='rgba(25,118,210,0.08)'
+        ))
+        fig4.update_layout(
+            hovermode='x unified',
+            xaxis_title="날짜", yaxis_title="재고 수량",
+            margin=dict(t=10, b=10, l=10, r=10),
+            height=300,
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            xaxis=dict(showgrid=True, gridcolor='#f0f0f0'),
+            yaxis=dict(showgrid=True, gridcolor='#f0f0f0'),
+        )
+        st.plotly_chart(fig4, use_container_width=True)
 
     st.divider()
 
     # 전체 재고 현황 테이블
     st.markdown("##### 📋 전체 재고 현황")
-    inventory_data = [{
-        '상품명': p['name'],
-        '카테고리': p['category'],
-        '현재재고': f"{p['current_stock']} {p['unit']}",
-        '최소재고': f"{p['min_stock']} {p['unit']}",
-        '단가': format_currency(p['unit_price']),
-        '재고가치': format_currency(p['current_stock'] * p['unit_price']),
-        '상태': '⚠️ 부족' if p['current_stock'] < p['min_stock'] else '✅ 정상'
-    } for p in products]
-
-    st.dataframe(pd.DataFrame(inventory_data), use_container_width=True, hide_index=True)
+    product_table_view(user_id, "dashboard_inventory", inventory_table, "재고현황.csv")
 
 else:
     st.markdown("""
@@ -190,3 +275,5 @@ else:
         <div style="color:#adb5bd;font-size:0.9rem;">상품관리에서 상품을 등록하면 차트가 표시됩니다</div>
     </div>
     """, unsafe_allow_html=True)
+
+finish_run()
@@ -0,0 +1,31 @@
+"""
+일별 재고 스냅샷 백필
+- 스냅샷 도입 이전의 입출고 내역으로 daily_stock_snapshots를 다시 계산
+- Supabase는 RLS가 적용되므로 전체 사용자 백필은 SQL Editor에서
+  SELECT rebuild_daily_stock_snapshots(); 실행 (또는 service role 키 사용)
+
+사용법:
+    python scripts/backfill_stock_snapshots.py [--user-id USER_ID]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.database import rebuild_stock_snapshots  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="일별 재고 스냅샷 재구성")
+    parser.add_argument("--user-id", help="특정 사용자만 재구성 (생략 시 모든 사용자)")
+    args = parser.parse_args()
+
+    count = rebuild_stock_snapshots(args.user_id)
+    if count < 0:
+        sys.exit(1)
+    print(f"스냅샷 {count}건을 생성했습니다.")
+
+
+if __name__ == "__main__":
+    main()
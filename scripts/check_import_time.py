@@ -0,0 +1,97 @@
+"""
+앱 진입점 import 시간 점검 (컨테이너 콜드 스타트 예산)
+- main.py와 각 페이지의 최상위 import 문만 새 파이썬 프로세스에서 -X importtime으로 실행해 측정
+- streamlit 자체 import 시간은 기준선으로 따로 표시하고, 앱이 streamlit 외에 추가로 불러오는 모듈 시간만 예산과 비교
+- 예산을 넘는 진입점이 있으면 종료 코드 1 (CI/배포 전 점검용)
+
+사용법:
+    python scripts/check_import_time.py [--budget-ms 300] [--runs 3] [--top 8]
+"""
+import argparse
+import ast
+import glob
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 진입점별 예산 (streamlit 외 추가 import ms, 없으면 --budget-ms)
+BUDGETS_MS = {
+    "main.py": 150,
+}
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", 300))
+
+
+def entry_points() -> list:
+    return ["main.py"] + sorted(os.path.relpath(p, ROOT) for p in glob.glob(os.path.join(ROOT, "pages", "*.py")))
+
+
+def top_level_imports(path: str) -> str:
+    """파일의 최상위 import 문만 추출 (페이지 본문은 실행하지 않음)"""
+    with open(os.path.join(ROOT, path), encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def measure(code: str, startup: frozenset = frozenset()) -> dict:
+    """새 프로세스에서 코드를 실행하고 최상위 모듈별 누적 import 시간(ms) 반환 (startup 모듈 제외)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys; sys.path.insert(0, {ROOT!r})\n{code}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  ") and name.strip() not in startup:  # 들여쓰기 없는 항목 = 최상위 import
+            try:
+                modules[name.strip()] = int(cumulative) / 1000
+            except ValueError:  # 헤더 줄
+                pass
+    return modules
+
+
+def best_of(code: str, runs: int, startup: frozenset) -> dict:
+    """여러 번 측정해 합계가 가장 작은 결과 사용 (디스크 캐시/잡음 제거)"""
+    return min((measure(code, startup) for _ in range(runs)), key=lambda m: sum(m.values()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="앱 진입점 import 시간 점검")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="BUDGETS_MS에 없는 진입점의 예산 (기본 IMPORT_BUDGET_MS 또는 300)")
+    parser.add_argument("--runs", type=int, default=3, help="진입점별 측정 횟수 (최솟값 사용)")
+    parser.add_argument("--top", type=int, default=8, help="무거운 모듈 표시 개수")
+    args = parser.parse_args()
+
+    # 인터프리터 시작 시 항상 불러오는 모듈(site, encodings 등)은 측정에서 제외
+    startup = frozenset(measure("pass"))
+    baseline = sum(best_of("import streamlit", args.runs, startup).values())
+    print(f"기준선 (import streamlit): {baseline:.0f} ms\n")
+
+    over = []
+    for path in entry_points():
+        modules = best_of(top_level_imports(path), args.runs, startup)
+        app_modules = {name: ms for name, ms in modules.items() if name.split('.')[0] != 'streamlit'}
+        extra = sum(app_modules.values())
+        budget = BUDGETS_MS.get(path, args.budget_ms)
+        status = "OK" if extra <= budget else "초과"
+        print(f"[{status}] {path}: +{extra:.0f} ms (예산 {budget:.0f} ms)")
+        heavy = sorted(((ms, name) for name, ms in app_modules.items()), reverse=True)
+        for ms, name in heavy[:args.top]:
+            print(f"    {ms:8.1f} ms  {name}")
+        if extra > budget:
+            over.append(path)
+
+    if over:
+        print(f"\n예산 초과: {', '.join(over)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+사용자 간 데이터 격리 점검 (SQLite 백엔드)
+- 임시 DB에 두 사용자를 만들고, 한 사용자가 다른 사용자의 상품을 조회/수정/삭제하거나
+  그 상품으로 입출고를 일괄 등록할 수 없는지 확인
+- 실패한 항목이 있으면 종료 코드 1 (CI/배포 전 점검용)
+
+사용법:
+    python scripts/check_tenant_isolation.py
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.backends.sqlite_backend import SQLiteBackend  # noqa: E402
+
+
+def run_checks(backend: SQLiteBackend) -> list:
+    """(항목, 통과 여부) 목록"""
+    owner = backend.sign_up("owner@example.com", "password").user.id
+    other = backend.sign_up("other@example.com", "password").user.id
+    product = backend.create_product(owner, {
+        'name': "격리 점검 상품", 'sku': "ISO-1", 'category': "기타", 'unit': "개", 'current_stock': 5,
+    })[0]
+
+    results = [("다른 사용자의 상품 조회", backend.get_product_by_id(other, product['id']) is None)]
+
+    updated = backend.update_product(other, product['id'], {'name': "변경됨"})
+    after = backend.get_product_by_id(owner, product['id'])
+    results.append(("다른 사용자의 상품 수정", updated == [] and after['name'] == product['name']))
+    results.append(("다른 사용자의 상품 수정 (변경 항목 없음)", backend.update_product(other, product['id'], {}) == []))
+
+    backend.delete_product(other, product['id'])
+    results.append(("다른 사용자의 상품 삭제", backend.get_product_by_id(owner, product['id']) is not None))
+
+    foreign = {'product_id': product['id'], 'type': '입고', 'quantity': 3, 'unit_price': 0, 'total_price': 0,
+               'transaction_date': "2024-01-01T00:00:00+00:00"}
+    own = backend.create_product(other, {'name': "다른 사용자 상품", 'sku': "ISO-2", 'category': "기타", 'unit': "개"})[0]
+    try:
+        backend.create_transactions_bulk(other, [{**foreign, 'product_id': own['id']}, foreign])
+        rejected = False
+    except ValueError:
+        rejected = True
+    unchanged = (backend.get_product_by_id(owner, product['id'])['current_stock'] == product['current_stock']
+                 and backend.get_product_by_id(other, own['id'])['current_stock'] == 0
+                 and not backend.get_transactions(other))
+    results.append(("다른 사용자의 상품으로 입출고 일괄 등록", rejected and unchanged))
+
+    results.append(("본인 상품 수정", backend.update_product(owner, product['id'], {'name': "변경됨"})[0]['name'] == "변경됨"))
+    backend.delete_product(owner, product['id'])
+    results.append(("본인 상품 삭제", backend.get_product_by_id(owner, product['id']) is None))
+    return results
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SQLiteBackend(os.path.join(tmp, "isolation.db"))
+        results = run_checks(backend)
+        backend.conn.close()
+
+    for name, ok in results:
+        print(f"[{'OK' if ok else '실패'}] {name}")
+    if not all(ok for _, ok in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
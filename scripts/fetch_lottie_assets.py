@@ -0,0 +1,42 @@
+"""
+Lottie 애니메이션 번들 파일 내려받기
+- LOTTIE_URLS의 애니메이션을 assets/lottie/<이름>.json으로 저장
+- 번들 파일이 있으면 앱은 네트워크 없이 바로 애니메이션을 표시함
+  (외부 접속이 제한된 환경에 배포하기 전에 실행해 커밋)
+
+사용법:
+    python scripts/fetch_lottie_assets.py [이름 ...]
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.lottie import ASSETS_DIR, LOTTIE_URLS, fetch_lottie  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lottie 애니메이션 번들 파일 내려받기")
+    parser.add_argument("names", nargs="*", help=f"내려받을 애니메이션 (생략 시 전체: {', '.join(LOTTIE_URLS)})")
+    args = parser.parse_args()
+
+    os.makedirs(ASSETS_DIR, exist_ok=True)
+    failed = 0
+    for name in args.names or LOTTIE_URLS:
+        try:
+            data = fetch_lottie(LOTTIE_URLS[name])
+        except Exception as e:
+            print(f"{name}: 실패 ({e})")
+            failed += 1
+            continue
+        with open(os.path.join(ASSETS_DIR, f"{name}.json"), 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        print(f"{name}: 저장 완료")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,20 @@
 """
-Supabase 인증 관련 함수
+인증 관련 함수 (Supabase Auth 또는 로컬 백엔드)
 """
-import os
 import streamlit as st
-from .database import get_supabase_client
-
-supabase = get_supabase_client()
+from .backends import get_backend
+from .config import get_setting
 
 
 def _get_site_url() -> str:
     """현재 앱의 URL 반환 (배포 환경 자동 감지)"""
-    try:
-        return st.secrets["SITE_URL"]
-    except (FileNotFoundError, KeyError):
-        return os.getenv("SITE_URL", "http://localhost:8501")
+    return get_setting("SITE_URL", "http://localhost:8501")
 
 
 def sign_up(email: str, password: str):
     """회원가입"""
     try:
-        response = supabase.auth.sign_up({
-            "email": email,
-            "password": password,
-            "options": {
-                "email_redirect_to": _get_site_url()
-            }
-        })
+        response = get_backend().sign_up(email, password, redirect_to=_get_site_url())
         return response
     except Exception as e:
         st.error(f"회원가입 오류: {e}")
@@ -35,10 +24,7 @@ def sign_up(email: str, password: str):
 def sign_in(email: str, password: str):
     """로그인"""
     try:
-        response = supabase.auth.sign_in_with_password({
-            "email": email,
-            "password": password
-        })
+        response = get_backend().sign_in(email, password)
         return response
     except Exception as e:
         st.error(f"로그인 오류: {e}")
@@ -48,7 +34,7 @@ def sign_in(email: str, password: str):
 def sign_out():
     """로그아웃"""
     try:
-        supabase.auth.sign_out()
+        get_backend().sign_out()
         if 'user' in st.session_state:
             del st.session_state['user']
         if 'user_id' in st.session_state:
@@ -64,7 +50,7 @@ def sign_out():
 def get_current_user():
     """현재 로그인한 사용자 정보"""
     try:
-        user = supabase.auth.get_user()
+        user = get_backend().get_user()
         return user
     except Exception as e:
         return None
@@ -0,0 +1,47 @@
+"""
+저장소 백엔드 선택
+- DB_BACKEND=supabase (기본값) : Supabase(PostgreSQL), 세션별 클라이언트 + 공유 연결 풀
+- DB_BACKEND=sqlite            : 로컬 SQLite 파일 (SQLITE_PATH, 기본값 inventory.db)
+"""
+import threading
+
+from ..config import get_setting
+from .base import StorageBackend
+
+_backend: StorageBackend | None = None
+_lock = threading.Lock()
+
+
+def create_backend(name: str = None) -> StorageBackend:
+    """설정에 맞는 백엔드 생성"""
+    name = (name or get_setting("DB_BACKEND", "supabase")).lower()
+
+    if name == "supabase":
+        from .supabase_backend import SupabaseBackend
+        return SupabaseBackend(
+            get_setting("SUPABASE_URL"), get_setting("SUPABASE_KEY"),
+            timeout=float(get_setting("SUPABASE_TIMEOUT", 10)),
+            connect_timeout=float(get_setting("SUPABASE_CONNECT_TIMEOUT", 5)),
+            max_connections=int(get_setting("SUPABASE_MAX_CONNECTIONS", 20)),
+        )
+    if name == "sqlite":
+        from .sqlite_backend import SQLiteBackend
+        return SQLiteBackend(get_setting("SQLITE_PATH", "inventory.db"))
+
+    raise ValueError(f"지원하지 않는 DB_BACKEND 입니다: {name} (supabase 또는 sqlite)")
+
+
+def get_backend() -> StorageBackend:
+    """프로세스 공용 백엔드 (최초 사용 시 생성)"""
+    global _backend
+    if _backend is None:
+        with _lock:
+            if _backend is None:
+                _backend = create_backend()
+    return _backend
+
+
+def set_backend(backend: StorageBackend | None):
+    """백엔드 교체 (벤치마크/스크립트용, None이면 다음 사용 시 설정으로 재생성)"""
+    global _backend
+    _backend = backend
@@ -0,0 +1,191 @@
+"""
+저장소 백엔드 인터페이스
+- utils/database.py의 공개 함수는 모두 이 인터페이스를 통해 데이터에 접근
+"""
+from abc import ABC, abstractmethod
+
+# 상품 페이지 조회에서 정렬할 수 있는 컬럼 (stock_value = current_stock * unit_price)
+PRODUCT_SORT_COLUMNS = ('created_at', 'name', 'current_stock', 'unit_price', 'stock_value')
+
+
+class StorageBackend(ABC):
+    """상품/입출고 데이터 저장소 공통 인터페이스
+
+    모든 메서드는 Supabase 응답과 같은 모양(dict 리스트)을 반환하고,
+    오류는 예외로 올려 보낸다. 오류 처리는 utils/database.py에서 담당.
+    """
+
+    name = "base"
+
+    # ===== 인증 =====
+
+    @abstractmethod
+    def sign_up(self, email: str, password: str, redirect_to: str = None):
+        """회원가입 (응답 객체는 .user.id / .user.email 제공)"""
+
+    @abstractmethod
+    def sign_in(self, email: str, password: str):
+        """로그인 (응답 객체는 .user.id / .user.email 제공)"""
+
+    @abstractmethod
+    def sign_out(self):
+        """로그아웃"""
+
+    @abstractmethod
+    def get_user(self):
+        """현재 로그인한 사용자"""
+
+    # ===== 상품 =====
+
+    @abstractmethod
+    def get_products(self, user_id: str) -> list:
+        """사용자의 모든 상품 (created_at 내림차순)"""
+
+    @abstractmethod
+    def get_products_page(self, user_id: str, sort: str = 'created_at', descending: bool = True,
+                          limit: int = 50, offset: int = 0, low_stock_only: bool = False) -> dict:
+        """상품 한 페이지 (DB에서 정렬/필터/페이지 처리)
+
+        Args:
+            sort: PRODUCT_SORT_COLUMNS 중 하나 (동률은 id 순)
+            low_stock_only: True면 현재재고 < 최소재고 상품만
+
+        Returns:
+            {'total': 조건에 맞는 전체 상품 수, 'rows': [상품 + 'stock_value', ...]}
+        """
+
+    @abstractmethod
+    def get_product_by_id(self, user_id: str, product_id: str) -> dict | None:
+        """특정 상품 (해당 사용자의 상품이 아니면 None)"""
+
+    @abstractmethod
+    def get_product_by_sku(self, user_id: str, sku: str) -> dict | None:
+        """SKU(바코드)로 상품 조회"""
+
+    @abstractmethod
+    def get_products_by_skus(self, user_id: str, skus: list) -> list:
+        """여러 SKU를 한 번에 조회"""
+
+    @abstractmethod
+    def search_products(self, user_id: str, query: str, limit: int = 50, offset: int = 0) -> dict:
+        """상품명/상품코드 부분 일치 검색 (검색 인덱스 사용)
+
+        순위: 상품코드 완전 일치 → 상품명/상품코드 앞부분 일치 → 유사도 → 상품명
+
+        Returns:
+            {'total': 전체 일치 건수, 'rows': [상품, ...] (limit/offset 적용)}
+        """
+
+    @abstractmethod
+    def create_product(self, user_id: str, product_data: dict) -> list:
+        """상품 등록 (등록된 행 리스트 반환)"""
+
+    @abstractmethod
+    def upsert_products(self, user_id: str, rows: list) -> int:
+        """(user_id, sku) 기준 일괄 등록/수정 (모든 행은 같은 컬럼 구성, 처리 건수 반환)
+
+        current_stock은 새 상품의 초기 재고로만 쓰고 기존 상품의 재고는 바꾸지 않음.
+        숫자 컬럼(unit_price, current_stock, min_stock)이 None이면 새 상품은 0, 기존 상품은 기존 값 유지.
+        """
+
+    @abstractmethod
+    def update_product(self, user_id: str, product_id: str, product_data: dict) -> list:
+        """상품 수정 (수정된 행 리스트 반환, 해당 사용자의 상품이 아니면 빈 리스트)"""
+
+    @abstractmethod
+    def delete_product(self, user_id: str, product_id: str) -> None:
+        """상품 삭제 (입출고 내역은 CASCADE 삭제, 해당 사용자의 상품만)"""
+
+    # ===== 입출고 =====
+
+    @abstractmethod
+    def get_transactions(self, user_id: str, product_id: str = None, limit: int = 100,
+                         cursor: tuple = None, direction: str = 'next', trans_type: str = None,
+                         date_from: str = None, date_to: str = None) -> list:
+        """입출고 내역 (products(name, sku) 포함)
+
+        Args:
+            trans_type: '입고' 또는 '출고' (None이면 전체)
+            date_from / date_to: transaction_date 범위 (date_from 이상, date_to 미만, ISO 문자열)
+            cursor: (transaction_date, id) 기준 위치, None이면 처음부터
+            direction: 'next'면 cursor 이전(과거) 행을 (transaction_date, id) 내림차순으로,
+                       'prev'면 cursor 이후(최근) 행을 오름차순으로 반환
+        """
+
+    @abstractmethod
+    def get_transaction_totals(self, user_id: str, product_id: str = None, trans_type: str = None,
+                               date_from: str = None, date_to: str = None) -> dict:
+        """필터에 해당하는 전체 입출고 합계
+
+        Returns:
+            {'count', 'in_quantity', 'out_quantity', 'in_value', 'out_value'}
+        """
+
+    @abstractmethod
+    def get_transaction_trend(self, user_id: str, bucket: str = 'day',
+                              date_from: str = None, date_to: str = None) -> list:
+        """기간별 입출고 추이 (DB 집계)
+
+        Args:
+            bucket: 'day' | 'week'(월요일 시작) | 'month'
+
+        Returns:
+            [{'bucket': 'YYYY-MM-DD', 'in_quantity', 'out_quantity', 'in_value', 'out_value'}, ...] (오름차순)
+        """
+
+    @abstractmethod
+    def create_transaction(self, user_id: str, transaction_data: dict) -> list:
+        """입출고 등록 및 재고 반영을 원자적으로 처리
+
+        Returns:
+            [등록된 행 + 'new_stock'(반영 후 재고)], 출고 재고가 부족하면 빈 리스트
+        """
+
+    @abstractmethod
+    def create_transactions_bulk(self, user_id: str, rows: list) -> dict:
+        """여러 입출고를 한 번에 등록하고 상품별 순증감을 재고에 반영 (원자적)
+
+        사용자의 상품이 아닌(삭제된) 행이 있거나 재고가 음수가 되면 아무것도 등록하지 않고 예외 발생.
+
+        Returns:
+            {'inserted': 등록 건수, 'stocks': {product_id: 반영 후 재고}}
+        """
+
+    # ===== 통계 =====
+
+    @abstractmethod
+    def get_inventory_summary(self, user_id: str) -> dict:
+        """재고 요약 통계 (DB 집계)
+
+        Returns:
+            {'total_products', 'total_stock_value', 'low_stock_count',
+             'categories': [{'category', 'product_count', 'stock_value'}, ...]}
+        """
+
+    @abstractmethod
+    def get_stock_history(self, user_id: str, date_from: str, date_to: str,
+                          product_id: str = None) -> list:
+        """일별 재고 추이 (daily_stock_snapshots 기반, 입출고가 없는 날도 포함)
+
+        Args:
+            date_from / date_to: 조회 기간 (양끝 포함, 'YYYY-MM-DD')
+            product_id: None이면 전체 상품 합계
+
+        Returns:
+            [{'date': 'YYYY-MM-DD', 'in_quantity', 'out_quantity', 'closing_stock'}, ...] (오름차순)
+        """
+
+    @abstractmethod
+    def get_daily_outflow(self, user_id: str, date_from: str) -> list:
+        """상품별 일별 출고량 (daily_stock_snapshots 기반, 출고가 있는 날만)
+
+        Args:
+            date_from: 이 날짜부터 ('YYYY-MM-DD', 포함)
+
+        Returns:
+            [{'product_id', 'date': 'YYYY-MM-DD', 'out_quantity'}, ...]
+        """
+
+    @abstractmethod
+    def rebuild_stock_snapshots(self, user_id: str = None) -> int:
+        """입출고 내역 전체로 일별 스냅샷 재구성 (user_id가 None이면 모든 사용자, 생성 행 수 반환)"""
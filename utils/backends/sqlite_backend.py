@@ -0,0 +1,598 @@
+"""
+로컬 SQLite 저장소 백엔드
+- 네트워크 없이 단일 머신에서 앱 실행, 부하 테스트, 프로파일링용
+"""
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from .base import StorageBackend
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), 'sqlite_schema.sql')
+
+# 세션별 로그인 사용자를 보관하는 session_state 키
+SESSION_USER_KEY = '_sqlite_user'
+
+PRODUCT_COLUMNS = ('name', 'sku', 'category', 'unit', 'unit_price', 'current_stock', 'min_stock')
+# 일괄 등록에서 비워 둘 수 있는 숫자 컬럼
+PRODUCT_NUMERIC_COLUMNS = ('unit_price', 'current_stock', 'min_stock')
+# 추이 집계 단위별 버킷 식 (transaction_date는 UTC ISO 문자열, 주는 월요일 시작)
+TREND_BUCKETS = {
+    'day': "substr(t.transaction_date, 1, 10)",
+    'week': "date(substr(t.transaction_date, 1, 10), 'weekday 0', '-6 days')",
+    'month': "substr(t.transaction_date, 1, 7) || '-01'",
+}
+TRANSACTION_COLUMNS = ('product_id', 'type', 'quantity', 'unit_price', 'total_price', 'memo', 'transaction_date')
+
+# FTS5 trigram 토크나이저가 검색할 수 있는 최소 글자 수 (더 짧으면 LIKE로 검색)
+FTS_MIN_QUERY_LENGTH = 3
+
+_PBKDF2_ITERATIONS = 200_000
+
+
+def _new_id() -> str:
+    return str(uuid.uuid4())
+
+
+def _to_timestamp(value) -> str:
+    """date/datetime/ISO 문자열을 TIMESTAMPTZ와 같은 UTC ISO 문자열로 정규화"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+def _hash_password(password: str, salt: bytes = None) -> str:
+    salt = salt or os.urandom(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, _PBKDF2_ITERATIONS)
+    return f"{salt.hex()}${digest.hex()}"
+
+
+def _check_password(password: str, stored: str) -> bool:
+    salt_hex, _ = stored.split('$', 1)
+    return hmac.compare_digest(_hash_password(password, bytes.fromhex(salt_hex)), stored)
+
+
+class SQLiteBackend(StorageBackend):
+    """SQLite 파일 기반 백엔드 (스레드별 연결, WAL 모드)"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        # 세션 밖의 스크립트(벤치마크 등)에서 로그인한 사용자
+        self._default_user = None
+        has_fts = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'"
+        ).fetchone()
+        with open(SCHEMA_PATH, encoding='utf-8') as f:
+            self.conn.executescript(f.read())
+        if not has_fts:
+            # 검색 인덱스 도입 이전에 만든 DB는 기존 상품으로 인덱스를 채움
+            self.conn.execute("INSERT INTO products_fts (products_fts) VALUES ('rebuild')")
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """현재 스레드의 연결 (Streamlit 세션은 스레드별로 실행됨)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def _rows(self, sql: str, params=()) -> list:
+        return [dict(row) for row in self.conn.execute(sql, params).fetchall()]
+
+    # ===== 인증 =====
+
+    def sign_up(self, email: str, password: str, redirect_to: str = None):
+        user_id = _new_id()
+        self.conn.execute(
+            "INSERT INTO users (id, email, password_hash) VALUES (?, ?, ?)",
+            (user_id, email, _hash_password(password))
+        )
+        return SimpleNamespace(user=SimpleNamespace(id=user_id, email=email))
+
+    def sign_in(self, email: str, password: str):
+        row = self.conn.execute(
+            "SELECT id, email, password_hash FROM users WHERE email = ?", (email,)
+        ).fetchone()
+        if row is None or not _check_password(password, row['password_hash']):
+            raise ValueError("Invalid login credentials")
+        user = SimpleNamespace(id=row['id'], email=row['email'])
+        self._set_current_user(user)
+        return SimpleNamespace(user=user)
+
+    def sign_out(self):
+        self._set_current_user(None)
+
+    def get_user(self):
+        if get_script_run_ctx(suppress_warning=True) is None:
+            user = self._default_user
+        else:
+            user = st.session_state.get(SESSION_USER_KEY)
+        if user is None:
+            return None
+        return SimpleNamespace(user=user)
+
+    def _set_current_user(self, user):
+        """로그인 사용자를 현재 Streamlit 세션에 보관 (세션 밖의 스크립트에서는 프로세스 공용 값)"""
+        if get_script_run_ctx(suppress_warning=True) is None:
+            self._default_user = user
+        elif user is None:
+            st.session_state.pop(SESSION_USER_KEY, None)
+        else:
+            st.session_state[SESSION_USER_KEY] = user
+
+    # ===== 상품 =====
+
+    def get_products(self, user_id: str) -> list:
+        return self._rows(
+            "SELECT * FROM products WHERE user_id = ? ORDER BY created_at DESC, rowid DESC",
+            (user_id,)
+        )
+
+    def get_products_page(self, user_id: str, sort: str = 'created_at', descending: bool = True,
+                          limit: int = 50, offset: int = 0, low_stock_only: bool = False) -> dict:
+        where = "user_id = ?" + (" AND current_stock < min_stock" if low_stock_only else "")
+        sort_expr = "current_stock * unit_price" if sort == 'stock_value' else sort
+        direction = "DESC" if descending else "ASC"
+        total = self.conn.execute(f"SELECT COUNT(*) FROM products WHERE {where}", (user_id,)).fetchone()[0]
+        rows = self._rows(
+            f"""
+            SELECT *, current_stock * unit_price AS stock_value
+            FROM products
+            WHERE {where}
+            ORDER BY {sort_expr} {direction}, id {direction}
+            LIMIT ? OFFSET ?
+            """,
+            (user_id, limit, offset)
+        )
+        return {'total': total, 'rows': rows}
+
+    def get_product_by_id(self, user_id: str, product_id: str) -> dict | None:
+        rows = self._rows("SELECT * FROM products WHERE id = ? AND user_id = ?", (product_id, user_id))
+        return rows[0] if rows else None
+
+    def get_product_by_sku(self, user_id: str, sku: str) -> dict | None:
+        rows = self._rows(
+            "SELECT * FROM products WHERE user_id = ? AND sku = ? LIMIT 1", (user_id, sku)
+        )
+        return rows[0] if rows else None
+
+    def get_products_by_skus(self, user_id: str, skus: list) -> list:
+        return self._rows(
+            "SELECT * FROM products WHERE user_id = ? AND sku IN (SELECT value FROM json_each(?))",
+            (user_id, json.dumps(list(skus)))
+        )
+
+    def search_products(self, user_id: str, query: str, limit: int = 50, offset: int = 0) -> dict:
+        query = query.strip()
+        pattern = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        order = (
+            "ORDER BY COALESCE(p.sku = :term, 0) DESC, "
+            "(p.name LIKE :prefix ESCAPE '\\' OR COALESCE(p.sku LIKE :prefix ESCAPE '\\', 0)) DESC"
+        )
+        params = {'user_id': user_id, 'term': query, 'prefix': pattern + '%',
+                  'contains': '%' + pattern + '%', 'limit': limit, 'offset': offset}
+        if len(query) >= FTS_MIN_QUERY_LENGTH:
+            params['match'] = '"' + query.replace('"', '""') + '"'
+            sql = f"""
+                SELECT p.*, COUNT(*) OVER () AS total_count
+                FROM products_fts f
+                CROSS JOIN products p ON p.rowid = f.rowid  -- 검색 인덱스를 먼저 읽도록 조인 순서 고정
+                WHERE products_fts MATCH :match AND p.user_id = :user_id
+                {order}, f.rank, p.name
+                LIMIT :limit OFFSET :offset
+            """
+        else:
+            sql = f"""
+                SELECT p.*, COUNT(*) OVER () AS total_count
+                FROM products p
+                WHERE p.user_id = :user_id
+                  AND (p.name LIKE :contains ESCAPE '\\' OR p.sku LIKE :contains ESCAPE '\\')
+                {order}, p.name
+                LIMIT :limit OFFSET :offset
+            """
+        rows = self._rows(sql, params)
+        if rows:
+            total = rows[0]['total_count']
+        else:
+            total = 0 if offset == 0 else self.search_products(user_id, query, 1, 0)['total']
+        for row in rows:
+            del row['total_count']
+        return {'total': total, 'rows': rows}
+
+    def create_product(self, user_id: str, product_data: dict) -> list:
+        data = {k: product_data[k] for k in PRODUCT_COLUMNS if k in product_data}
+        data['id'] = _new_id()
+        data['user_id'] = user_id
+        columns = ', '.join(data)
+        placeholders = ', '.join('?' * len(data))
+        return self._rows(
+            f"INSERT INTO products ({columns}) VALUES ({placeholders}) RETURNING *",
+            tuple(data.values())
+        )
+
+    def upsert_products(self, user_id: str, rows: list) -> int:
+        if not rows:
+            return 0
+        columns = [k for k in PRODUCT_COLUMNS if k in rows[0]]
+        optional = [k for k in columns if k in PRODUCT_NUMERIC_COLUMNS]
+        required = [k for k in columns if k not in optional]
+        # 숫자 컬럼이 None이면 새 상품은 0, 기존 상품은 그대로 (재고는 새 상품의 초기 재고로만 사용)
+        values = [*('?' * len(required)), *('COALESCE(?, 0)' for _ in optional)]
+        updates = [f"{k} = excluded.{k}" for k in required if k != 'sku']
+        updates += [f"{k} = COALESCE(?, {k})" for k in optional if k != 'current_stock']
+        update_params = [k for k in optional if k != 'current_stock']
+        sql = f"""
+            INSERT INTO products (id, user_id, {', '.join(required + optional)})
+            VALUES (?, ?, {', '.join(values)})
+            ON CONFLICT (user_id, sku) DO UPDATE SET
+                {', '.join(updates)}, updated_at = strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')
+        """
+        params = [
+            (_new_id(), user_id, *(row[k] for k in required + optional), *(row[k] for k in update_params))
+            for row in rows
+        ]
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(sql, params)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(rows)
+
+    def update_product(self, user_id: str, product_id: str, product_data: dict) -> list:
+        data = {k: product_data[k] for k in PRODUCT_COLUMNS if k in product_data}
+        if not data:
+            return self._rows("SELECT * FROM products WHERE id = ? AND user_id = ?", (product_id, user_id))
+        assignments = ', '.join(f"{k} = ?" for k in data)
+        return self._rows(
+            f"UPDATE products SET {assignments}, updated_at = strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now') "
+            f"WHERE id = ? AND user_id = ? RETURNING *",
+            (*data.values(), product_id, user_id)
+        )
+
+    def delete_product(self, user_id: str, product_id: str) -> None:
+        self.conn.execute("DELETE FROM products WHERE id = ? AND user_id = ?", (product_id, user_id))
+
+    # ===== 입출고 =====
+
+    @staticmethod
+    def _transaction_filters(user_id: str, product_id: str = None, trans_type: str = None,
+                             date_from: str = None, date_to: str = None):
+        """입출고 WHERE 조건과 파라미터"""
+        where = ["t.user_id = ?"]
+        params = [user_id]
+        if product_id:
+            where.append("t.product_id = ?")
+            params.append(product_id)
+        if trans_type:
+            where.append("t.type = ?")
+            params.append(trans_type)
+        if date_from:
+            where.append("t.transaction_date >= ?")
+            params.append(_to_timestamp(date_from))
+        if date_to:
+            where.append("t.transaction_date < ?")
+            params.append(_to_timestamp(date_to))
+        return where, params
+
+    def get_transactions(self, user_id: str, product_id: str = None, limit: int = 100,
+                         cursor: tuple = None, direction: str = 'next', trans_type: str = None,
+                         date_from: str = None, date_to: str = None) -> list:
+        where, params = self._transaction_filters(user_id, product_id, trans_type, date_from, date_to)
+        order = 'DESC' if direction == 'next' else 'ASC'
+        if cursor:
+            where.append(f"(t.transaction_date, t.id) {'<' if order == 'DESC' else '>'} (?, ?)")
+            params.extend(cursor)
+        sql = f"""
+            SELECT t.*, p.name AS product_name, p.sku AS product_sku
+            FROM transactions t
+            LEFT JOIN products p ON p.id = t.product_id
+            WHERE {' AND '.join(where)}
+            ORDER BY t.transaction_date {order}, t.id {order}
+            LIMIT ?
+        """
+        params.append(limit)
+
+        rows = self._rows(sql, params)
+        for row in rows:
+            row['products'] = {'name': row.pop('product_name'), 'sku': row.pop('product_sku')}
+        return rows
+
+    def get_transaction_totals(self, user_id: str, product_id: str = None, trans_type: str = None,
+                               date_from: str = None, date_to: str = None) -> dict:
+        where, params = self._transaction_filters(user_id, product_id, trans_type, date_from, date_to)
+        return self._rows(
+            f"""
+            SELECT COUNT(*) AS count,
+                   COALESCE(SUM(CASE WHEN t.type = '입고' THEN t.quantity END), 0) AS in_quantity,
+                   COALESCE(SUM(CASE WHEN t.type = '출고' THEN t.quantity END), 0) AS out_quantity,
+                   COALESCE(SUM(CASE WHEN t.type = '입고' THEN t.total_price END), 0) AS in_value,
+                   COALESCE(SUM(CASE WHEN t.type = '출고' THEN t.total_price END), 0) AS out_value
+            FROM transactions t
+            WHERE {' AND '.join(where)}
+            """,
+            params
+        )[0]
+
+    def get_transaction_trend(self, user_id: str, bucket: str = 'day',
+                              date_from: str = None, date_to: str = None) -> list:
+        where, params = self._transaction_filters(user_id, date_from=date_from, date_to=date_to)
+        return self._rows(
+            f"""
+            SELECT {TREND_BUCKETS[bucket]} AS bucket,
+                   COALESCE(SUM(CASE WHEN t.type = '입고' THEN t.quantity END), 0) AS in_quantity,
+                   COALESCE(SUM(CASE WHEN t.type = '출고' THEN t.quantity END), 0) AS out_quantity,
+                   COALESCE(SUM(CASE WHEN t.type = '입고' THEN t.total_price END), 0) AS in_value,
+                   COALESCE(SUM(CASE WHEN t.type = '출고' THEN t.total_price END), 0) AS out_value
+            FROM transactions t
+            WHERE {' AND '.join(where)}
+            GROUP BY 1
+            ORDER BY 1
+            """,
+            params
+        )
+
+    def _apply_snapshot(self, user_id: str, product_id: str, day: str, in_quantity: int,
+                        out_quantity: int, in_value: float, out_value: float, new_stock: int):
+        """일별 스냅샷에 입출고 합계를 더하고 마감 재고 갱신 (호출하는 쪽 트랜잭션 안에서 실행)
+
+        new_stock: 이번 입출고 반영 직후의 현재 재고
+        """
+        conn = self.conn
+        conn.execute(
+            "UPDATE daily_stock_snapshots SET closing_stock = closing_stock + ? "
+            "WHERE product_id = ? AND snapshot_date > ?",
+            (in_quantity - out_quantity, product_id, day)
+        )
+        conn.execute(
+            """
+            INSERT INTO daily_stock_snapshots
+                (user_id, product_id, snapshot_date, in_quantity, out_quantity, in_value, out_value, closing_stock)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ? - (
+                SELECT COALESCE(SUM(in_quantity - out_quantity), 0) FROM daily_stock_snapshots
+                WHERE product_id = ? AND snapshot_date > ?
+            ))
+            ON CONFLICT (product_id, snapshot_date) DO UPDATE SET
+                in_quantity = in_quantity + excluded.in_quantity,
+                out_quantity = out_quantity + excluded.out_quantity,
+                in_value = in_value + excluded.in_value,
+                out_value = out_value + excluded.out_value,
+                closing_stock = excluded.closing_stock
+            """,
+            (user_id, product_id, day, in_quantity, out_quantity, in_value, out_value, new_stock,
+             product_id, day)
+        )
+
+    def create_transaction(self, user_id: str, transaction_data: dict) -> list:
+        data = {k: transaction_data.get(k) for k in TRANSACTION_COLUMNS}
+        data['id'] = _new_id()
+        data['user_id'] = user_id
+        data['transaction_date'] = _to_timestamp(data['transaction_date'])
+        delta = data['quantity'] if data['type'] == '입고' else -data['quantity']
+
+        columns = ', '.join(data)
+        placeholders = ', '.join('?' * len(data))
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            updated = conn.execute(
+                """
+                UPDATE products SET current_stock = current_stock + ?
+                WHERE id = ? AND user_id = ? AND (? > 0 OR current_stock >= ?)
+                RETURNING current_stock
+                """,
+                (delta, data['product_id'], user_id, delta, data['quantity'])
+            ).fetchone()
+            if updated is None:
+                conn.execute("ROLLBACK")
+                return []
+            rows = self._rows(
+                f"INSERT INTO transactions ({columns}) VALUES ({placeholders}) RETURNING *",
+                tuple(data.values())
+            )
+            is_in = data['type'] == '입고'
+            self._apply_snapshot(
+                user_id, data['product_id'], data['transaction_date'][:10],
+                data['quantity'] if is_in else 0, 0 if is_in else data['quantity'],
+                data['total_price'] if is_in else 0, 0 if is_in else data['total_price'],
+                updated['current_stock']
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        rows[0]['new_stock'] = updated['current_stock']
+        return rows
+
+    def create_transactions_bulk(self, user_id: str, rows: list) -> dict:
+        records = []
+        deltas = {}
+        days = {}  # (product_id, 날짜) -> [입고 수량, 출고 수량, 입고 금액, 출고 금액]
+        for row in rows:
+            transaction_date = _to_timestamp(row['transaction_date'])
+            records.append((
+                _new_id(), user_id, row['product_id'], row['type'], row['quantity'],
+                row['unit_price'], row['total_price'], row.get('memo'), transaction_date
+            ))
+            delta = row['quantity'] if row['type'] == '입고' else -row['quantity']
+            deltas[row['product_id']] = deltas.get(row['product_id'], 0) + delta
+            day = days.setdefault((row['product_id'], transaction_date[:10]), [0, 0, 0, 0])
+            offset = 0 if row['type'] == '입고' else 1
+            day[offset] += row['quantity']
+            day[offset + 2] += row['total_price']
+
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 모든 상품이 이 사용자의 것인지 먼저 확인 (create_transaction처럼 없는 상품은 등록하지 않음)
+            stocks = {}
+            for product_id, delta in deltas.items():
+                updated = conn.execute(
+                    "UPDATE products SET current_stock = current_stock + ? "
+                    "WHERE id = ? AND user_id = ? RETURNING current_stock",
+                    (delta, product_id, user_id)
+                ).fetchone()
+                if updated is None:
+                    raise ValueError(f"등록할 수 없는 상품이 있습니다 (삭제되었거나 다른 사용자의 상품): {product_id}")
+                stocks[product_id] = updated['current_stock']
+            if any(stock < 0 for stock in stocks.values()):
+                raise ValueError("재고가 음수가 되는 상품이 있습니다")
+
+            conn.executemany(
+                """
+                INSERT INTO transactions
+                    (id, user_id, product_id, type, quantity, unit_price, total_price, memo, transaction_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                records
+            )
+
+            # 날짜 오름차순으로 반영하며, 아직 반영하지 않은 이후 날짜분을 뺀 재고를 전달
+            pending = dict(deltas)
+            for (product_id, day), (in_qty, out_qty, in_value, out_value) in sorted(days.items()):
+                pending[product_id] -= in_qty - out_qty
+                self._apply_snapshot(
+                    user_id, product_id, day, in_qty, out_qty, in_value, out_value,
+                    stocks[product_id] - pending[product_id]
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return {'inserted': len(records), 'stocks': stocks}
+
+    # ===== 통계 =====
+
+    def get_inventory_summary(self, user_id: str) -> dict:
+        categories = self._rows(
+            """
+            SELECT category,
+                   COUNT(*) AS product_count,
+                   COALESCE(SUM(current_stock * unit_price), 0) AS stock_value,
+                   SUM(current_stock < min_stock) AS low_stock_count
+            FROM products
+            WHERE user_id = ?
+            GROUP BY category
+            ORDER BY product_count DESC
+            """,
+            (user_id,)
+        )
+        return {
+            'total_products': sum(c['product_count'] for c in categories),
+            'total_stock_value': sum(c['stock_value'] for c in categories),
+            'low_stock_count': sum(c.pop('low_stock_count') for c in categories),
+            'categories': categories,
+        }
+
+    def get_stock_history(self, user_id: str, date_from: str, date_to: str,
+                          product_id: str = None) -> list:
+        product_params = (product_id,) if product_id else ()
+        product_filter = "AND product_id = ?" if product_id else ""
+        id_filter = "AND id = ?" if product_id else ""
+        return self._rows(
+            f"""
+            WITH RECURSIVE days(day) AS (
+                SELECT date(?)
+                UNION ALL
+                SELECT date(day, '+1 day') FROM days WHERE day < date(?)
+            ),
+            current_total AS (
+                SELECT COALESCE(SUM(current_stock), 0) AS stock
+                FROM products
+                WHERE user_id = ? {id_filter}
+            ),
+            timeline AS (
+                SELECT day, SUM(in_quantity) AS in_quantity, SUM(out_quantity) AS out_quantity
+                FROM (
+                    SELECT day, 0 AS in_quantity, 0 AS out_quantity FROM days
+                    UNION ALL
+                    SELECT snapshot_date, in_quantity, out_quantity
+                    FROM daily_stock_snapshots
+                    WHERE user_id = ? AND snapshot_date >= date(?) {product_filter}
+                )
+                GROUP BY day
+            ),
+            series AS (
+                SELECT day, in_quantity, out_quantity,
+                       (SELECT stock FROM current_total) - COALESCE(SUM(in_quantity - out_quantity) OVER (
+                           ORDER BY day DESC ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                       ), 0) AS closing_stock
+                FROM timeline
+            )
+            SELECT day AS date, in_quantity, out_quantity, closing_stock
+            FROM series
+            WHERE day <= date(?)
+            ORDER BY day
+            """,
+            (date_from, date_to, user_id, *product_params, user_id, date_from, *product_params, date_to)
+        )
+
+    def get_daily_outflow(self, user_id: str, date_from: str) -> list:
+        return self._rows(
+            """
+            SELECT product_id, snapshot_date AS date, out_quantity
+            FROM daily_stock_snapshots
+            WHERE user_id = ? AND snapshot_date >= date(?) AND out_quantity > 0
+            """,
+            (user_id, date_from)
+        )
+
+    def rebuild_stock_snapshots(self, user_id: str = None) -> int:
+        user_filter = "WHERE user_id = ?" if user_id else ""
+        params = (user_id,) if user_id else ()
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(f"DELETE FROM daily_stock_snapshots {user_filter}", params)
+            cursor = conn.execute(
+                f"""
+                INSERT INTO daily_stock_snapshots
+                    (user_id, product_id, snapshot_date, in_quantity, out_quantity, in_value, out_value, closing_stock)
+                SELECT d.user_id, d.product_id, d.day, d.in_quantity, d.out_quantity, d.in_value, d.out_value,
+                       p.current_stock - COALESCE(SUM(d.in_quantity - d.out_quantity) OVER (
+                           PARTITION BY d.product_id ORDER BY d.day DESC
+                           ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                       ), 0)
+                FROM (
+                    SELECT user_id, product_id, substr(transaction_date, 1, 10) AS day,
+                           COALESCE(SUM(CASE WHEN type = '입고' THEN quantity END), 0) AS in_quantity,
+                           COALESCE(SUM(CASE WHEN type = '출고' THEN quantity END), 0) AS out_quantity,
+                           COALESCE(SUM(CASE WHEN type = '입고' THEN total_price END), 0) AS in_value,
+                           COALESCE(SUM(CASE WHEN type = '출고' THEN total_price END), 0) AS out_value
+                    FROM transactions
+                    {user_filter}
+                    GROUP BY 1, 2, 3
+                ) d
+                JOIN products p ON p.id = d.product_id
+                """,
+                params
+            )
+            count = cursor.rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return count
@@ -0,0 +1,107 @@
+-- 재고마스터 로컬(SQLite) 데이터베이스 스키마
+-- database_schema.sql 과 같은 테이블/인덱스 구성 (RLS 대신 모든 쿼리에 user_id 조건 사용)
+
+-- 0. users 테이블 (Supabase auth.users 대체)
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))
+);
+
+-- 1. products 테이블 (상품)
+CREATE TABLE IF NOT EXISTS products (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    sku TEXT,
+    category TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    unit_price REAL NOT NULL DEFAULT 0,
+    current_stock INTEGER NOT NULL DEFAULT 0,
+    min_stock INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')),
+    updated_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))
+);
+
+-- 2. transactions 테이블 (입출고)
+CREATE TABLE IF NOT EXISTS transactions (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    product_id TEXT NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    type TEXT NOT NULL CHECK (type IN ('입고', '출고')),
+    quantity INTEGER NOT NULL CHECK (quantity > 0),
+    unit_price REAL NOT NULL,
+    total_price REAL NOT NULL,
+    memo TEXT,
+    transaction_date TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))
+);
+
+-- 3. 인덱스 생성 (성능 최적화)
+CREATE INDEX IF NOT EXISTS idx_products_user_id ON products(user_id);
+CREATE INDEX IF NOT EXISTS idx_products_category ON products(category);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_products_user_sku ON products(user_id, sku);
+CREATE INDEX IF NOT EXISTS idx_products_user_created ON products(user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_products_user_name ON products(user_id, name, id);
+CREATE INDEX IF NOT EXISTS idx_products_user_stock ON products(user_id, current_stock, id);
+CREATE INDEX IF NOT EXISTS idx_products_user_stock_value ON products(user_id, (current_stock * unit_price) DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_products_user_low_stock ON products(user_id) WHERE current_stock < min_stock;
+CREATE INDEX IF NOT EXISTS idx_transactions_user_id ON transactions(user_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_product_id ON transactions(product_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(transaction_date);
+CREATE INDEX IF NOT EXISTS idx_transactions_type ON transactions(type);
+CREATE INDEX IF NOT EXISTS idx_transactions_user_date_id ON transactions(user_id, transaction_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_transactions_user_type_date ON transactions(user_id, type, transaction_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_transactions_product_date ON transactions(product_id, transaction_date DESC, id DESC);
+
+-- 4. products 테이블 updated_at 자동 업데이트
+CREATE TRIGGER IF NOT EXISTS update_products_updated_at
+    AFTER UPDATE ON products
+    FOR EACH ROW
+    WHEN NEW.updated_at = OLD.updated_at
+BEGIN
+    UPDATE products
+    SET updated_at = strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')
+    WHERE id = NEW.id;
+END;
+
+-- 5. daily_stock_snapshots 테이블 (상품별 일별 입출고 합계 + 마감 재고)
+CREATE TABLE IF NOT EXISTS daily_stock_snapshots (
+    user_id TEXT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    product_id TEXT NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    snapshot_date TEXT NOT NULL,
+    in_quantity INTEGER NOT NULL DEFAULT 0,
+    out_quantity INTEGER NOT NULL DEFAULT 0,
+    in_value REAL NOT NULL DEFAULT 0,
+    out_value REAL NOT NULL DEFAULT 0,
+    closing_stock INTEGER NOT NULL,
+    PRIMARY KEY (product_id, snapshot_date)
+);
+
+CREATE INDEX IF NOT EXISTS idx_snapshots_user_date ON daily_stock_snapshots(user_id, snapshot_date);
+
+-- 6. 상품 검색 인덱스 (FTS5 trigram: 상품명/상품코드 3글자 이상 부분 일치, 한글 포함)
+CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+    name, sku,
+    content='products', content_rowid='rowid', tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS products_fts_insert
+    AFTER INSERT ON products
+BEGIN
+    INSERT INTO products_fts (rowid, name, sku) VALUES (NEW.rowid, NEW.name, NEW.sku);
+END;
+
+CREATE TRIGGER IF NOT EXISTS products_fts_delete
+    AFTER DELETE ON products
+BEGIN
+    INSERT INTO products_fts (products_fts, rowid, name, sku) VALUES ('delete', OLD.rowid, OLD.name, OLD.sku);
+END;
+
+CREATE TRIGGER IF NOT EXISTS products_fts_update
+    AFTER UPDATE OF name, sku ON products
+BEGIN
+    INSERT INTO products_fts (products_fts, rowid, name, sku) VALUES ('delete', OLD.rowid, OLD.name, OLD.sku);
+    INSERT INTO products_fts (rowid, name, sku) VALUES (NEW.rowid, NEW.name, NEW.sku);
+END;
@@ -0,0 +1,303 @@
+"""
+Supabase(PostgreSQL) 저장소 백엔드
+- 로그인 상태(JWT)는 Streamlit 세션마다 별도의 클라이언트에 보관
+- 모든 클라이언트는 하나의 httpx 연결 풀(keep-alive)을 공유해 요청마다 TLS 핸드셰이크를 하지 않음
+"""
+import threading
+
+import httpx
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from supabase import create_client, Client, ClientOptions
+
+from .base import StorageBackend
+
+# in.(...) 필터는 URL에 실리므로 한 요청당 SKU 개수 제한
+SKU_LOOKUP_BATCH = 200
+
+# 스냅샷 조회 한 요청당 행 수 (PostgREST 기본 최대 행 수)
+SNAPSHOT_PAGE_SIZE = 1000
+
+# 세션별 클라이언트를 보관하는 session_state 키
+SESSION_CLIENT_KEY = '_supabase_client'
+
+
+class SupabaseBackend(StorageBackend):
+    """Supabase REST API 기반 백엔드 (사용자 범위는 RLS 정책으로 보장)
+
+    Args:
+        timeout: 요청 응답 대기 시간 (초)
+        connect_timeout: 연결 수립 대기 시간 (초)
+        max_connections: 모든 세션이 공유하는 최대 동시 연결 수
+    """
+
+    name = "supabase"
+
+    def __init__(self, url: str, key: str, timeout: float = 10.0, connect_timeout: float = 5.0,
+                 max_connections: int = 20):
+        if not url or not key:
+            raise ValueError("SUPABASE_URL과 SUPABASE_KEY를 설정해주세요. (.env 또는 Streamlit Secrets)")
+        self.url = url
+        self.key = key
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._http: httpx.Client | None = None
+        self._default_client: Client | None = None
+        self._lock = threading.RLock()
+
+    # ===== 클라이언트 =====
+
+    @property
+    def http(self) -> httpx.Client:
+        """모든 클라이언트가 공유하는 HTTP 연결 풀 (최초 사용 시 생성)"""
+        if self._http is None:
+            with self._lock:
+                if self._http is None:
+                    self._http = httpx.Client(timeout=self.timeout, limits=self.limits, follow_redirects=True)
+        return self._http
+
+    def create_client(self) -> Client:
+        """공유 연결 풀을 사용하는 새 클라이언트 (로그인 상태는 클라이언트마다 독립)"""
+        options = ClientOptions(httpx_client=self.http, postgrest_client_timeout=None)
+        return create_client(self.url, self.key, options)
+
+    @property
+    def client(self) -> Client:
+        """현재 Streamlit 세션의 클라이언트 (세션 밖의 스크립트에서는 프로세스 공용 클라이언트)"""
+        if get_script_run_ctx(suppress_warning=True) is None:
+            if self._default_client is None:
+                with self._lock:
+                    if self._default_client is None:
+                        self._default_client = self.create_client()
+            return self._default_client
+
+        client = st.session_state.get(SESSION_CLIENT_KEY)
+        if client is None:
+            client = self.create_client()
+            st.session_state[SESSION_CLIENT_KEY] = client
+        return client
+
+    # ===== 인증 =====
+
+    def sign_up(self, email: str, password: str, redirect_to: str = None):
+        return self.client.auth.sign_up({
+            "email": email,
+            "password": password,
+            "options": {
+                "email_redirect_to": redirect_to
+            }
+        })
+
+    def sign_in(self, email: str, password: str):
+        return self.client.auth.sign_in_with_password({
+            "email": email,
+            "password": password
+        })
+
+    def sign_out(self):
+        self.client.auth.sign_out()
+        if get_script_run_ctx(suppress_warning=True) is not None:
+            st.session_state.pop(SESSION_CLIENT_KEY, None)
+
+    def get_user(self):
+        return self.client.auth.get_user()
+
+    # ===== 상품 =====
+
+    def get_products(self, user_id: str) -> list:
+        response = self.client.table('products')\
+            .select('*')\
+            .eq('user_id', user_id)\
+            .order('created_at', desc=True)\
+            .execute()
+        return response.data
+
+    def get_products_page(self, user_id: str, sort: str = 'created_at', descending: bool = True,
+                          limit: int = 50, offset: int = 0, low_stock_only: bool = False) -> dict:
+        query = self.client.table('product_stock_status')\
+            .select('*', count='exact')\
+            .eq('user_id', user_id)\
+            .order(sort, desc=descending)\
+            .order('id', desc=descending)\
+            .range(offset, offset + limit - 1)
+        if low_stock_only:
+            query = query.eq('is_low_stock', True)
+        response = query.execute()
+        for row in response.data:
+            row.pop('is_low_stock', None)
+        return {'total': response.count or 0, 'rows': response.data}
+
+    def get_product_by_id(self, user_id: str, product_id: str) -> dict | None:
+        response = self.client.table('products')\
+            .select('*')\
+            .eq('id', product_id)\
+            .eq('user_id', user_id)\
+            .single()\
+            .execute()
+        return response.data
+
+    def get_product_by_sku(self, user_id: str, sku: str) -> dict | None:
+        response = self.client.table('products')\
+            .select('*')\
+            .eq('user_id', user_id)\
+            .eq('sku', sku)\
+            .execute()
+        if response.data:
+            return response.data[0]
+        return None
+
+    def get_products_by_skus(self, user_id: str, skus: list) -> list:
+        products = []
+        for i in range(0, len(skus), SKU_LOOKUP_BATCH):
+            response = self.client.table('products')\
+                .select('*')\
+                .eq('user_id', user_id)\
+                .in_('sku', skus[i:i + SKU_LOOKUP_BATCH])\
+                .execute()
+            products.extend(response.data)
+        return products
+
+    def search_products(self, user_id: str, query: str, limit: int = 50, offset: int = 0) -> dict:
+        response = self.client.rpc('search_products', {
+            'p_user_id': user_id,
+            'p_query': query,
+            'p_limit': limit,
+            'p_offset': offset,
+        }).execute()
+        return response.data
+
+    def create_product(self, user_id: str, product_data: dict) -> list:
+        product_data['user_id'] = user_id
+        response = self.client.table('products').insert(product_data).execute()
+        return response.data
+
+    def upsert_products(self, user_id: str, rows: list) -> int:
+        response = self.client.rpc('upsert_products', {
+            'p_user_id': user_id,
+            'p_rows': rows,
+        }).execute()
+        return response.data
+
+    def update_product(self, user_id: str, product_id: str, product_data: dict) -> list:
+        response = self.client.table('products')\
+            .update(product_data)\
+            .eq('id', product_id)\
+            .eq('user_id', user_id)\
+            .execute()
+        return response.data
+
+    def delete_product(self, user_id: str, product_id: str) -> None:
+        self.client.table('products')\
+            .delete()\
+            .eq('id', product_id)\
+            .eq('user_id', user_id)\
+            .execute()
+
+    # ===== 입출고 =====
+
+    def get_transactions(self, user_id: str, product_id: str = None, limit: int = 100,
+                         cursor: tuple = None, direction: str = 'next', trans_type: str = None,
+                         date_from: str = None, date_to: str = None) -> list:
+        desc = direction == 'next'
+        query = self.client.table('transactions')\
+            .select('*, products(name, sku)')\
+            .eq('user_id', user_id)\
+            .order('transaction_date', desc=desc)\
+            .order('id', desc=desc)\
+            .limit(limit)
+
+        if product_id:
+            query = query.eq('product_id', product_id)
+        if trans_type:
+            query = query.eq('type', trans_type)
+        if date_from:
+            query = query.gte('transaction_date', date_from)
+        if date_to:
+            query = query.lt('transaction_date', date_to)
+        if cursor:
+            op = 'lt' if desc else 'gt'
+            cursor_date, cursor_id = cursor
+            query = query.or_(
+                f'transaction_date.{op}."{cursor_date}",'
+                f'and(transaction_date.eq."{cursor_date}",id.{op}.{cursor_id})'
+            )
+
+        response = query.execute()
+        return response.data
+
+    def get_transaction_totals(self, user_id: str, product_id: str = None, trans_type: str = None,
+                               date_from: str = None, date_to: str = None) -> dict:
+        response = self.client.rpc('get_transaction_totals', {
+            'p_user_id': user_id,
+            'p_product_id': product_id,
+            'p_type': trans_type,
+            'p_date_from': date_from,
+            'p_date_to': date_to,
+        }).execute()
+        return response.data
+
+    def get_transaction_trend(self, user_id: str, bucket: str = 'day',
+                              date_from: str = None, date_to: str = None) -> list:
+        response = self.client.rpc('get_transaction_trend', {
+            'p_user_id': user_id,
+            'p_bucket': bucket,
+            'p_date_from': date_from,
+            'p_date_to': date_to,
+        }).execute()
+        return response.data
+
+    def create_transaction(self, user_id: str, transaction_data: dict) -> list:
+        response = self.client.rpc('create_transaction_with_stock', {
+            'p_user_id': user_id,
+            'p_product_id': transaction_data['product_id'],
+            'p_type': transaction_data['type'],
+            'p_quantity': transaction_data['quantity'],
+            'p_unit_price': transaction_data['unit_price'],
+            'p_total_price': transaction_data['total_price'],
+            'p_memo': transaction_data.get('memo'),
+            'p_transaction_date': transaction_data['transaction_date'],
+        }).execute()
+        return [response.data] if response.data else []
+
+    def create_transactions_bulk(self, user_id: str, rows: list) -> dict:
+        response = self.client.rpc('create_transactions_bulk', {
+            'p_user_id': user_id,
+            'p_rows': rows,
+        }).execute()
+        return response.data
+
+    # ===== 통계 =====
+
+    def get_inventory_summary(self, user_id: str) -> dict:
+        response = self.client.rpc('get_inventory_summary', {'p_user_id': user_id}).execute()
+        return response.data
+
+    def get_stock_history(self, user_id: str, date_from: str, date_to: str,
+                          product_id: str = None) -> list:
+        response = self.client.rpc('get_stock_history', {
+            'p_user_id': user_id,
+            'p_date_from': date_from,
+            'p_date_to': date_to,
+            'p_product_id': product_id,
+        }).execute()
+        return response.data
+
+    def get_daily_outflow(self, user_id: str, date_from: str) -> list:
+        rows = []
+        while True:
+            response = self.client.table('daily_stock_snapshots')\
+                .select('product_id, date:snapshot_date, out_quantity')\
+                .eq('user_id', user_id)\
+                .gte('snapshot_date', date_from)\
+                .gt('out_quantity', 0)\
+                .order('snapshot_date')\
+                .order('product_id')\
+                .range(len(rows), len(rows) + SNAPSHOT_PAGE_SIZE - 1)\
+                .execute()
+            rows.extend(response.data)
+            if len(response.data) < SNAPSHOT_PAGE_SIZE:
+                return rows
+
+    def rebuild_stock_snapshots(self, user_id: str = None) -> int:
+        response = self.client.rpc('rebuild_daily_stock_snapshots', {'p_user_id': user_id}).execute()
+        return response.data
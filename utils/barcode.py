@@ -1,22 +1,112 @@
 """
 바코드 스캔 유틸리티
 - 카메라로 촬영한 이미지에서 바코드/QR코드 디코딩
+- 축소 흑백 이미지로 빠르게 1차 시도 → 실패 시 크롭/회전/대비 보정 이미지를 병렬로 재시도
+- 같은 이미지는 해시 캐시로 다시 디코딩하지 않음 (Streamlit 재실행마다 반복되는 디코딩 방지)
+- 스캔 세션: 연속 스캔으로 장바구니를 만들고 한 번에 등록
+- PIL/zxing-cpp는 처음 디코딩할 때 import (카메라를 쓰지 않으면 불러오지 않음)
 """
+import functools
+import hashlib
+import io
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING
+
 import streamlit as st
-from PIL import Image
-import zxingcpp
+
+from .cache import TTLCache
+from .database import get_product_by_sku
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# 실제 사용하는 포맷만 탐색 (상품 바코드 + 물류 라벨 + QR)
+BARCODE_FORMATS = "EAN13,EAN8,UPCA,UPCE,Code128,Code39,QRCode"
+
+# 1차 시도용 축소 크기 (긴 변 기준 px)
+FAST_MAX_SIDE = 1024
+# 보정 이미지의 최대 크기 (긴 변 기준 px)
+FALLBACK_MAX_SIDE = 2048
+# 보정 이미지 기울임 각도
+FALLBACK_ANGLES = (20, -20)
+
+# 이미지 내용 해시 → 디코딩 결과
+_decode_cache = TTLCache(ttl=600, maxsize=64)
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="barcode")
+
+
+@functools.cache
+def _formats():
+    import zxingcpp
+    return zxingcpp.barcode_formats_from_str(BARCODE_FORMATS)
+
+
+def _read(image: 'Image.Image', try_harder: bool = False) -> list:
+    import zxingcpp
+    return zxingcpp.read_barcodes(
+        image,
+        formats=_formats(),
+        try_rotate=try_harder,
+        try_downscale=try_harder,
+        try_invert=try_harder,
+    )
 
 
-def decode_barcode(image: Image.Image) -> list:
-    """이미지에서 바코드/QR코드 디코딩"""
+def _fallback_variants(gray: 'Image.Image') -> list:
+    """1차 시도 실패 시 병렬로 시도할 보정 이미지 목록"""
+    from PIL import Image, ImageOps
+    width, height = gray.size
+    crop = gray.crop((width // 5, height // 5, width - width // 5, height - height // 5))
+    variants = [
+        ImageOps.autocontrast(gray, cutoff=2),
+        crop.resize((crop.width * 3 // 2, crop.height * 3 // 2), Image.Resampling.LANCZOS),
+    ]
+    variants += [gray.rotate(angle, expand=True, fillcolor=255) for angle in FALLBACK_ANGLES]
+    return variants
+
+
+def decode_barcode(image: 'Image.Image') -> list:
+    """이미지에서 바코드/QR코드 디코딩 (빠른 1차 시도 → 병렬 보정 재시도)"""
+    from PIL import ImageOps
     try:
-        results = zxingcpp.read_barcodes(image)
-        return results
+        gray = ImageOps.exif_transpose(image).convert("L")
+
+        fast = gray.copy()
+        fast.thumbnail((FAST_MAX_SIDE, FAST_MAX_SIDE))
+        results = _read(fast)
+        if results:
+            return results
+
+        gray.thumbnail((FALLBACK_MAX_SIDE, FALLBACK_MAX_SIDE))
+        futures = [_executor.submit(_read, gray, True)]
+        futures += [_executor.submit(_read, variant) for variant in _fallback_variants(gray)]
+        for future in as_completed(futures):
+            results = future.result()
+            if results:
+                for other in futures:
+                    other.cancel()
+                return results
+        return []
     except Exception as e:
         st.error(f"바코드 인식 오류: {e}")
         return []
 
 
+def _content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def decode_barcode_bytes(data: bytes) -> list:
+    """이미지 파일 내용으로 디코딩 (같은 내용이면 캐시된 결과 반환)"""
+    key = _content_hash(data)
+    results = _decode_cache.get(key)
+    if results is None:
+        from PIL import Image
+        results = decode_barcode(Image.open(io.BytesIO(data)))
+        _decode_cache.set(key, results)
+    return results
+
+
 def scan_barcode_ui(key_prefix: str = "barcode") -> str | None:
     """바코드 스캔 UI 컴포넌트 (카메라 촬영 방식)
 
@@ -29,8 +119,7 @@ def scan_barcode_ui(key_prefix: str = "barcode") -> str | None:
     )
 
     if camera_image is not None:
-        image = Image.open(camera_image)
-        results = decode_barcode(image)
+        results = decode_barcode_bytes(camera_image.getvalue())
 
         if results:
             barcode_value = results[0].text
@@ -45,17 +134,84 @@ def scan_barcode_ui(key_prefix: str = "barcode") -> str | None:
 
 
 def get_product_by_barcode(user_id: str, barcode: str):
-    """바코드(SKU)로 상품 조회"""
-    from .database import supabase
-    try:
-        response = supabase.table('products')\
-            .select('*')\
-            .eq('user_id', user_id)\
-            .eq('sku', barcode)\
-            .execute()
-        if response.data:
-            return response.data[0]
-        return None
-    except Exception as e:
-        st.error(f"상품 조회 오류: {e}")
+    """바코드(SKU)로 상품 조회 (사용자별 SKU 맵 사용)"""
+    return get_product_by_sku(user_id, barcode.strip())
+
+
+# ===== 스캔 세션 =====
+
+def init_scan_session():
+    """스캔 세션 상태 초기화 (이미 있으면 유지)"""
+    st.session_state.setdefault('scan_basket', {})       # product_id → 수량 (스캔 순서 유지)
+    st.session_state.setdefault('scan_unknown', {})      # 미등록 바코드 → 스캔 횟수
+    st.session_state.setdefault('scan_last', None)       # (바코드, 상품 또는 None)
+    st.session_state.setdefault('scan_version', 0)       # 장바구니가 바뀔 때마다 증가
+    st.session_state.setdefault('scan_camera_key', 0)    # 촬영 후 카메라 초기화용
+    st.session_state.setdefault('scan_last_image', None)  # 마지막으로 처리한 촬영 이미지 해시
+
+
+def clear_scan_session():
+    """장바구니 비우기"""
+    st.session_state['scan_basket'] = {}
+    st.session_state['scan_unknown'] = {}
+    st.session_state['scan_last'] = None
+    st.session_state['scan_version'] += 1
+
+
+def add_scan(user_id: str, barcode: str):
+    """바코드 한 건을 장바구니에 추가 (같은 상품은 수량 +1, 미등록 바코드는 별도 표시)
+
+    Returns:
+        상품 dict 또는 None (미등록)
+    """
+    barcode = barcode.strip()
+    if not barcode:
         return None
+    product = get_product_by_barcode(user_id, barcode)
+    if product is None:
+        unknown = st.session_state['scan_unknown']
+        unknown[barcode] = unknown.get(barcode, 0) + 1
+    else:
+        basket = st.session_state['scan_basket']
+        basket[product['id']] = basket.get(product['id'], 0) + 1
+    st.session_state['scan_last'] = (barcode, product)
+    st.session_state['scan_version'] += 1
+    return product
+
+
+def _on_wedge_scan(user_id: str, key: str):
+    add_scan(user_id, st.session_state[key])
+    st.session_state[key] = ""
+
+
+def scan_session_input(user_id: str, key_prefix: str = "scan_session"):
+    """스캔 세션 입력 UI (바코드 리더기 입력 + 카메라 촬영)
+
+    바코드 리더기(키보드 입력 방식)는 코드 입력 후 Enter를 보내므로 입력칸에 포커스를 두고
+    연속으로 스캔하면 됨. 카메라는 촬영 이미지를 처리한 뒤 바로 초기화되어 다음 촬영을 받음.
+    """
+    wedge_key = f"{key_prefix}_wedge"
+    st.text_input(
+        "🔫 바코드 리더기 입력",
+        key=wedge_key,
+        placeholder="입력칸을 클릭한 뒤 연속으로 스캔하세요 (직접 입력 후 Enter도 가능)",
+        on_change=_on_wedge_scan,
+        args=(user_id, wedge_key),
+    )
+
+    with st.expander("📷  카메라로 스캔", expanded=False):
+        camera_image = st.camera_input(
+            "📷 바코드를 카메라에 비춰주세요",
+            key=f"{key_prefix}_camera_{st.session_state['scan_camera_key']}"
+        )
+        if camera_image is not None:
+            data = camera_image.getvalue()
+            digest = _content_hash(data)
+            results = decode_barcode_bytes(data)
+            if results and digest != st.session_state['scan_last_image']:
+                st.session_state['scan_last_image'] = digest
+                add_scan(user_id, results[0].text)
+                st.session_state['scan_camera_key'] += 1
+                st.rerun()
+            if not results:
+                st.warning("⚠️ 바코드를 인식하지 못했습니다. 다시 촬영해주세요.")
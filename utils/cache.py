@@ -0,0 +1,73 @@
+"""
+프로세스 내 캐시 유틸리티
+"""
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """TTL + 최대 항목 수(LRU 제거) 제한이 있는 스레드 안전 캐시
+
+    Args:
+        ttl: 항목 유효 시간(초)
+        maxsize: 최대 항목 수 (초과 시 가장 오래 사용하지 않은 항목 제거)
+    """
+
+    def __init__(self, ttl: float, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """유효한 값 반환 (만료/없음이면 default)"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """값 저장 (TTL 갱신)"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def replace(self, key, old, new) -> bool:
+        """현재 값이 old일 때만 new로 교체 (만료 시각은 유지, 없거나 다른 값이면 False)"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or entry[1] is not old:
+                return False
+            self._data[key] = (entry[0], new)
+            return True
+
+    def pop(self, key, default=None):
+        """항목 제거 후 값 반환"""
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+            return default if entry is _MISSING else entry[1]
+
+    def clear(self):
+        """전체 비우기"""
+        with self._lock:
+            self._data.clear()
+
+    def items(self) -> list:
+        """유효한 (key, value) 목록 (스냅샷)"""
+        now = time.monotonic()
+        with self._lock:
+            return [(k, v) for k, (expires_at, v) in self._data.items() if expires_at >= now]
+
+    def __len__(self):
+        return len(self._data)
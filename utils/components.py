@@ -0,0 +1,197 @@
+"""
+재사용 UI 컴포넌트
+"""
+import streamlit as st
+
+from .database import get_product_by_id, get_products_page, iter_products, search_products
+from .helpers import export_to_csv, TABLE_COLUMN_CONFIG
+
+# 선택 상자에 한 번에 보여줄 최대 상품 수
+PICKER_LIMIT = 20
+
+# 상품 표 정렬 옵션 (라벨 → (정렬 컬럼, 내림차순 여부))
+PRODUCT_SORTS = {
+    "최근 등록순": ('created_at', True),
+    "상품명순": ('name', False),
+    "재고 적은순": ('current_stock', False),
+    "재고 많은순": ('current_stock', True),
+    "단가 높은순": ('unit_price', True),
+    "재고가치 높은순": ('stock_value', True),
+}
+PRODUCT_VIEWS = ("전체", "재고 부족만", "재고가치 Top N")
+PAGE_SIZES = (20, 50, 100, 200)
+# 전체 CSV 내보내기 시 한 번에 읽는 행 수
+EXPORT_PAGE_SIZE = 1000
+
+
+def _product_label(product: dict) -> str:
+    return (f"{product['name']}  ({product.get('sku') or 'SKU 없음'}) · "
+            f"재고 {product['current_stock']}{product['unit']}")
+
+
+def product_picker(user_id: str, label: str, key: str, allow_all: bool = False,
+                   all_label: str = "전체 상품", label_visibility: str = "visible") -> str | None:
+    """검색어를 입력하면 일치하는 상품만 불러오는 상품 선택 컴포넌트
+
+    전체 상품 대신 최대 PICKER_LIMIT개만 선택 상자에 올리므로 상품이 많아도 화면이 가벼움.
+    검색어가 없으면 최근 등록 상품을 보여주고, 현재 선택된 상품은 검색어가 바뀌어도 유지됨.
+    선택값을 미리 지정하려면 렌더링 전에 st.session_state[f"{key}_select"]에 상품 ID를 넣음.
+    st.form 안에서는 입력할 때마다 목록이 갱신되지 않으므로 폼 밖에서 사용.
+
+    Returns:
+        선택된 상품 ID (allow_all이고 전체를 선택했으면 None)
+    """
+    select_key = f"{key}_select"
+    col_query, col_select = st.columns([1, 2])
+    with col_query:
+        query = st.text_input(f"{label} 검색", key=f"{key}_query", placeholder="상품명 또는 상품코드",
+                              label_visibility=label_visibility)
+    if query.strip():
+        matches = search_products(user_id, query, PICKER_LIMIT)['rows']
+    else:
+        matches = get_products_page(user_id, limit=PICKER_LIMIT)['rows']
+
+    products = {p['id']: p for p in matches}
+    selected_id = st.session_state.get(select_key)
+    if selected_id and selected_id not in products:
+        selected = get_product_by_id(user_id, selected_id)
+        if selected:
+            products = {selected_id: selected, **products}
+
+    options = ([None] if allow_all else []) + list(products)
+    if selected_id not in options:
+        st.session_state.pop(select_key, None)
+
+    with col_select:
+        if not options:
+            st.selectbox(label, ["일치하는 상품이 없습니다"], disabled=True, label_visibility=label_visibility,
+                         key=f"{key}_empty")
+            return None
+        return st.selectbox(
+            label, options, key=select_key,
+            format_func=lambda pid: all_label if pid is None else _product_label(products[pid]),
+            label_visibility=label_visibility,
+        )
+
+
+def _page_offset(key: str, params: tuple, page_size: int) -> int:
+    """현재 페이지의 offset (조회 조건이 바뀌면 첫 페이지로)"""
+    page_key = f"{key}_page"
+    if st.session_state.get(f"{key}_params") != params:
+        st.session_state[f"{key}_params"] = params
+        st.session_state[page_key] = 1
+    return (st.session_state.get(page_key, 1) - 1) * page_size
+
+
+def _clamp_page(key: str, total: int, page_size: int) -> int:
+    """전체 건수가 줄어 현재 페이지가 범위를 벗어나면 마지막 페이지로 옮기고 offset 반환"""
+    page_key = f"{key}_page"
+    pages = max(1, -(-total // page_size))
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    return (st.session_state.get(page_key, 1) - 1) * page_size
+
+
+def _paged_rows(key: str, params: tuple, page_size: int, fetch) -> tuple:
+    """현재 페이지의 (전체 건수, 행) 조회
+
+    fetch(offset) → (전체 건수, 행). 삭제 등으로 전체 건수가 줄어 저장된 페이지가 범위를 벗어나면
+    페이지를 먼저 맞춘 뒤 다시 조회 (빈 표를 한 번 그리지 않도록)
+    """
+    offset = _page_offset(key, params, page_size)
+    total, rows = fetch(offset)
+    clamped = _clamp_page(key, total, page_size)
+    if clamped != offset:
+        total, rows = fetch(clamped)
+    return total, rows
+
+
+def _page_selector(key: str, total: int, page_size: int):
+    """페이지 번호 입력 + 건수 표시 (페이지는 _paged_rows에서 범위를 맞춘 상태)"""
+    page_key = f"{key}_page"
+    pages = max(1, -(-total // page_size))
+    col_info, col_page = st.columns([4, 1])
+    with col_page:
+        page_no = st.number_input("페이지", min_value=1, max_value=pages, step=1,
+                                  key=page_key, label_visibility="collapsed")
+    with col_info:
+        st.caption(f"총 {total:,}건 · {page_no}/{pages} 페이지")
+
+
+def _full_csv_export(key: str, params: tuple, load_rows, table_builder, csv_name: str):
+    """현재 조건의 전체 결과를 CSV로 내보내기 (버튼을 눌렀을 때만 전체를 읽음)"""
+    state_key = f"{key}_csv"
+    prepared = st.session_state.get(state_key)
+    if prepared is None or prepared[0] != params:
+        if st.button("📄 전체 결과 CSV 준비", key=f"{key}_csv_prepare"):
+            with st.spinner("전체 결과를 불러오는 중..."):
+                st.session_state[state_key] = (params, table_builder(list(load_rows())))
+            st.rerun()
+        return
+    export_to_csv(prepared[1], csv_name)
+
+
+def product_table_view(user_id: str, key: str, table_builder, csv_name: str, search: str = ""):
+    """상품 표 (정렬/보기/페이지 조회를 DB에서 처리하고 현재 페이지만 화면에 전송)
+
+    Args:
+        table_builder: 상품 리스트 → 표시용 DataFrame (helpers.product_table / inventory_table)
+        search: 검색어가 있으면 관련도 순 검색 결과를 페이지로 표시
+    """
+    col_view, col_sort, col_size = st.columns([2, 1.5, 1])
+    with col_size:
+        page_size = st.selectbox("페이지당 개수", PAGE_SIZES, index=1, key=f"{key}_size",
+                                 label_visibility="collapsed")
+
+    search = search.strip()
+    if search:
+        params = ('search', search, page_size)
+
+        def fetch(offset):
+            result = search_products(user_id, search, page_size, offset)
+            return result['total'], result['rows']
+
+        def load_rows():
+            for start in range(0, total, EXPORT_PAGE_SIZE):
+                yield from search_products(user_id, search, EXPORT_PAGE_SIZE, start)['rows']
+    else:
+        with col_view:
+            view = st.radio("보기", PRODUCT_VIEWS, horizontal=True, key=f"{key}_view",
+                            label_visibility="collapsed")
+        top_n = None
+        if view == "재고가치 Top N":
+            with col_sort:
+                top_n = st.number_input("N", min_value=1, max_value=1000, value=10, step=5,
+                                        key=f"{key}_top_n", label_visibility="collapsed")
+            sort, descending = PRODUCT_SORTS["재고가치 높은순"]
+        else:
+            with col_sort:
+                sort_label = st.selectbox("정렬", list(PRODUCT_SORTS), key=f"{key}_sort",
+                                          label_visibility="collapsed")
+            sort, descending = PRODUCT_SORTS[sort_label]
+        options = {'sort': sort, 'descending': descending, 'low_stock_only': view == "재고 부족만"}
+
+        params = (view, sort, descending, top_n, page_size)
+
+        def fetch(offset):
+            if top_n is None:
+                result = get_products_page(user_id, limit=page_size, offset=offset, **options)
+                return result['total'], result['rows']
+            remaining = max(0, top_n - offset)
+            result = get_products_page(user_id, limit=max(1, min(page_size, remaining)), offset=offset, **options)
+            return min(top_n, result['total']), result['rows'][:remaining]
+
+        def load_rows():
+            for i, row in enumerate(iter_products(user_id, EXPORT_PAGE_SIZE, **options)):
+                if top_n is not None and i >= top_n:
+                    return
+                yield row
+
+    total, rows = _paged_rows(key, params, page_size, fetch)
+    _page_selector(key, total, page_size)
+    if rows:
+        st.dataframe(table_builder(rows), column_config=TABLE_COLUMN_CONFIG,
+                     use_container_width=True, hide_index=True)
+        _full_csv_export(key, params, load_rows, table_builder, csv_name)
+    else:
+        st.caption("조건에 맞는 상품이 없습니다.")
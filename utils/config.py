@@ -0,0 +1,18 @@
+"""
+환경설정 조회 함수
+- Streamlit Cloud secrets 우선, 없으면 .env / 환경변수 사용
+"""
+import os
+import streamlit as st
+from dotenv import load_dotenv
+
+# 환경변수 로드 (로컬용 .env, Streamlit Cloud에서는 st.secrets 사용)
+load_dotenv()
+
+
+def get_setting(key: str, default=None):
+    """설정값 조회 (st.secrets → 환경변수 → 기본값 순)"""
+    try:
+        return st.secrets[key]
+    except (FileNotFoundError, KeyError):
+        return os.getenv(key, default)
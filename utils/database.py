@@ -1,153 +1,459 @@
 """
-Supabase 데이터베이스 연결 및 쿼리 함수
+데이터베이스 쿼리 함수
+- 실제 저장소는 utils/backends 의 백엔드(Supabase 또는 로컬 SQLite)가 담당
+- fetch_concurrently로 서로 독립적인 조회를 동시에 실행
+- 모든 조회/등록 함수는 metrics.track으로 계측 (실행 시간, 행 수, 결과 크기)
 """
-import os
-import streamlit as st
-from supabase import create_client, Client
-from dotenv import load_dotenv
+import threading
+from datetime import date, timedelta
 
-# 환경변수 로드 (로컬용 .env, Streamlit Cloud에서는 st.secrets 사용)
-load_dotenv()
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
-# Supabase 클라이언트 초기화 - Streamlit Cloud secrets 우선, 없으면 .env 사용
-try:
-    SUPABASE_URL = st.secrets["SUPABASE_URL"]
-    SUPABASE_KEY = st.secrets["SUPABASE_KEY"]
-except (FileNotFoundError, KeyError):
-    SUPABASE_URL = os.getenv("SUPABASE_URL")
-    SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+from .backends import get_backend
+from .backends.base import PRODUCT_SORT_COLUMNS
+from .cache import TTLCache
+from .config import get_setting
+from .metrics import log_error, logger, track
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise ValueError("SUPABASE_URL과 SUPABASE_KEY를 설정해주세요. (.env 또는 Streamlit Secrets)")
+# 사용자별 상품 목록 캐시 (user_id → (상품 리스트, id → 상품 dict, sku → 상품 dict))
+# 쓰기 함수가 캐시를 직접 갱신하므로, TTL은 다른 프로세스의 변경을 반영하는 주기 역할
+_products_cache = TTLCache(
+    ttl=float(get_setting("PRODUCT_CACHE_TTL", 60)),
+    maxsize=int(get_setting("PRODUCT_CACHE_MAX_USERS", 256))
+)
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# 일괄 등록 시 한 번의 호출로 보내는 최대 행 수
+BULK_CHUNK_SIZE = int(get_setting("BULK_CHUNK_SIZE", 500))
 
+# 사용자별로 출고 등록이 반영된 가장 이른 날짜 (forecast.py가 가져가 그 날짜부터만 다시 조회)
+# 예측 캐시와 같은 TTL이라, 표시가 만료되기 전에 예측 캐시가 먼저 만료되어 전체를 다시 읽음
+_outflow_changes = TTLCache(
+    ttl=float(get_setting("FORECAST_CACHE_TTL", 3600)),
+    maxsize=int(get_setting("PRODUCT_CACHE_MAX_USERS", 256))
+)
+_outflow_lock = threading.Lock()
 
-def get_supabase_client() -> Client:
-    """Supabase 클라이언트 반환"""
-    return supabase
+
+def get_supabase_client():
+    """Supabase 클라이언트 반환 (Supabase 백엔드 사용 시)"""
+    return getattr(get_backend(), 'client', None)
+
+
+# ===== 상품 캐시 =====
+
+def _cache_store(user_id: str, products: list):
+    _products_cache.set(user_id, (
+        products,
+        {p['id']: p for p in products},
+        {p['sku']: p for p in products if p.get('sku')},
+    ))
+
+
+def _cache_find(user_id: str, product_id: str) -> dict | None:
+    """해당 사용자의 캐시에서 상품 찾기 (다른 사용자의 캐시는 보지 않음)"""
+    cached = _products_cache.get(user_id)
+    if cached is None:
+        return None
+    return cached[1].get(product_id)
+
+
+def _cache_replace(user_id: str, product_id: str, new_product: dict | None):
+    """해당 사용자의 캐시된 상품을 교체 (new_product가 None이면 제거)"""
+    cached = _products_cache.get(user_id)
+    if cached is None or product_id not in cached[1]:
+        return
+    products = cached[0]
+    if new_product is None:
+        products = [p for p in products if p['id'] != product_id]
+    else:
+        products = [new_product if p['id'] == product_id else p for p in products]
+    _cache_store(user_id, products)
+
+
+def _cache_set_stocks(user_id: str, stocks: dict):
+    """캐시된 상품들의 current_stock 갱신"""
+    cached = _products_cache.get(user_id)
+    if cached is None or not stocks:
+        return
+    products = [
+        {**p, 'current_stock': stocks[p['id']]} if p['id'] in stocks else p
+        for p in cached[0]
+    ]
+    _cache_store(user_id, products)
+
+
+def _mark_outflow_changed(user_id: str, rows: list):
+    """출고 등록 날짜 기록 (날짜는 UTC 기준으로 저장되므로 하루 앞부터)"""
+    days = [str(r.get('transaction_date') or date.today())[:10] for r in rows if r.get('type') == '출고']
+    if not days:
+        return
+    earliest = (date.fromisoformat(min(days)) - timedelta(days=1)).isoformat()
+    with _outflow_lock:
+        previous = _outflow_changes.get(user_id)
+        _outflow_changes.set(user_id, earliest if previous is None else min(previous, earliest))
+
+
+def pop_outflow_changes(user_id: str) -> str | None:
+    """마지막 호출 이후 출고가 바뀐 가장 이른 날짜 ('YYYY-MM-DD', 없으면 None)"""
+    with _outflow_lock:
+        return _outflow_changes.pop(user_id)
+
+
+def invalidate_product_cache(user_id: str = None):
+    """상품 캐시 무효화 (user_id가 없으면 전체)"""
+    if user_id is None:
+        _products_cache.clear()
+    else:
+        _products_cache.pop(user_id)
 
 
 # ===== 상품 관리 함수 =====
 
+@track
 def get_products(user_id: str):
-    """사용자의 모든 상품 조회"""
+    """사용자의 모든 상품 조회 (캐시 우선)"""
+    cached = _products_cache.get(user_id)
+    if cached is not None:
+        return list(cached[0])
     try:
-        response = supabase.table('products')\
-            .select('*')\
-            .eq('user_id', user_id)\
-            .order('created_at', desc=True)\
-            .execute()
-        return response.data
+        products = get_backend().get_products(user_id)
+        _cache_store(user_id, products)
+        return list(products)
     except Exception as e:
-        print(f"상품 조회 오류: {e}")
+        log_error("상품 조회 오류", e)
         return []
 
 
-def get_product_by_id(product_id: str):
-    """특정 상품 조회"""
+@track
+def get_products_page(user_id: str, sort: str = 'created_at', descending: bool = True,
+                      limit: int = 50, offset: int = 0, low_stock_only: bool = False) -> dict:
+    """상품 한 페이지 조회 (정렬/재고 부족 필터/페이지를 DB에서 처리)
+
+    Args:
+        sort: 'created_at' | 'name' | 'current_stock' | 'unit_price' | 'stock_value'(재고가치)
+
+    Returns:
+        {'total': 전체 상품 수, 'rows': [상품 + 'stock_value', ...]}
+    """
+    if sort not in PRODUCT_SORT_COLUMNS:
+        raise ValueError(f"지원하지 않는 정렬 기준입니다: {sort}")
+    try:
+        return get_backend().get_products_page(user_id, sort, descending, limit, offset, low_stock_only)
+    except Exception as e:
+        log_error("상품 조회 오류", e)
+        return {'total': 0, 'rows': []}
+
+
+def iter_products(user_id: str, page_size: int = 1000, **options):
+    """조건에 맞는 모든 상품을 page_size개씩 읽어 하나씩 반환 (CSV 내보내기 등)"""
+    offset = 0
+    while True:
+        rows = get_products_page(user_id, limit=page_size, offset=offset, **options)['rows']
+        yield from rows
+        if len(rows) < page_size:
+            return
+        offset += page_size
+
+
+@track
+def get_product_by_id(user_id: str, product_id: str):
+    """특정 상품 조회 (해당 사용자의 캐시 우선)"""
+    cached = _cache_find(user_id, product_id)
+    if cached is not None:
+        return cached
+    try:
+        return get_backend().get_product_by_id(user_id, product_id)
+    except Exception as e:
+        log_error("상품 조회 오류", e)
+        return None
+
+
+@track
+def get_product_by_sku(user_id: str, sku: str):
+    """SKU(바코드)로 상품 조회 (사용자별 SKU 맵에서 조회, 캐시가 비어 있을 때만 DB 조회)"""
+    if not sku:
+        return None
+    cached = _products_cache.get(user_id)
+    if cached is None:
+        get_products(user_id)
+        cached = _products_cache.get(user_id)
+    if cached is not None:
+        return cached[2].get(sku)
     try:
-        response = supabase.table('products')\
-            .select('*')\
-            .eq('id', product_id)\
-            .single()\
-            .execute()
-        return response.data
+        return get_backend().get_product_by_sku(user_id, sku)
     except Exception as e:
-        print(f"상품 조회 오류: {e}")
+        log_error("상품 조회 오류", e)
         return None
 
 
+@track
+def get_products_by_skus(user_id: str, skus: list) -> dict:
+    """여러 SKU를 한 번에 조회 (캐시 우선)
+
+    Returns:
+        {sku: 상품 dict} (등록되지 않은 SKU는 제외)
+    """
+    skus = list(dict.fromkeys(s for s in skus if s))
+    cached = _products_cache.get(user_id)
+    try:
+        if cached is not None:
+            by_sku = cached[2]
+            products = [by_sku[s] for s in skus if s in by_sku]
+        else:
+            products = get_backend().get_products_by_skus(user_id, skus)
+        return {p['sku']: p for p in products}
+    except Exception as e:
+        log_error("상품 조회 오류", e)
+        return {}
+
+
+@track
+def search_products(user_id: str, query: str, limit: int = 50, offset: int = 0) -> dict:
+    """상품명/상품코드 검색 (DB 검색 인덱스 사용, 관련도 순, 페이지 단위)
+
+    Returns:
+        {'total': 전체 일치 건수, 'rows': [상품, ...]}
+    """
+    query = (query or '').strip()
+    if not query:
+        return {'total': 0, 'rows': []}
+    try:
+        return get_backend().search_products(user_id, query, limit, offset)
+    except Exception as e:
+        log_error("상품 검색 오류", e)
+        return {'total': 0, 'rows': []}
+
+
+@track
 def create_product(user_id: str, product_data: dict):
     """새 상품 등록"""
     try:
-        product_data['user_id'] = user_id
-        response = supabase.table('products').insert(product_data).execute()
-        return response.data
+        result = get_backend().create_product(user_id, product_data)
+        cached = _products_cache.get(user_id)
+        if cached is not None and result:
+            _cache_store(user_id, list(result) + cached[0])
+        return result
     except Exception as e:
-        print(f"상품 등록 오류: {e}")
+        log_error("상품 등록 오류", e)
         return None
 
 
-def update_product(product_id: str, product_data: dict):
+@track
+def upsert_products(user_id: str, rows: list, batch_size: int = None) -> dict:
+    """상품 일괄 등록/수정 (상품코드 기준 upsert, batch_size 행씩)
+
+    묶음 처리가 실패하면 해당 묶음만 한 행씩 다시 시도해 오류 행을 골라냄.
+
+    Returns:
+        {'upserted': 처리 건수, 'failed': [(rows 인덱스, 오류 메시지), ...]}
+    """
+    batch_size = batch_size or BULK_CHUNK_SIZE
+    backend = get_backend()
+    upserted = 0
+    failed = []
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        try:
+            upserted += backend.upsert_products(user_id, batch)
+            continue
+        except Exception as e:
+            logger.warning(f"상품 일괄 등록 오류 (행 단위로 재시도): {e}")
+        for offset, row in enumerate(batch):
+            try:
+                upserted += backend.upsert_products(user_id, [row])
+            except Exception as e:
+                failed.append((start + offset, str(e)))
+    if upserted:
+        invalidate_product_cache(user_id)
+    return {'upserted': upserted, 'failed': failed}
+
+
+@track
+def update_product(user_id: str, product_id: str, product_data: dict):
     """상품 정보 수정"""
     try:
-        response = supabase.table('products')\
-            .update(product_data)\
-            .eq('id', product_id)\
-            .execute()
-        return response.data
+        result = get_backend().update_product(user_id, product_id, product_data)
+        if result:
+            _cache_replace(user_id, product_id, result[0])
+        return result
     except Exception as e:
-        print(f"상품 수정 오류: {e}")
+        log_error("상품 수정 오류", e)
         return None
 
 
-def delete_product(product_id: str):
+@track
+def delete_product(user_id: str, product_id: str):
     """상품 삭제"""
     try:
-        response = supabase.table('products')\
-            .delete()\
-            .eq('id', product_id)\
-            .execute()
+        get_backend().delete_product(user_id, product_id)
+        _cache_replace(user_id, product_id, None)
         return True
     except Exception as e:
-        print(f"상품 삭제 오류: {e}")
+        log_error("상품 삭제 오류", e)
         return False
 
 
 # ===== 입출고 관리 함수 =====
 
-def get_transactions(user_id: str, product_id: str = None, limit: int = 100):
-    """입출고 내역 조회"""
-    try:
-        query = supabase.table('transactions')\
-            .select('*, products(name, sku)')\
-            .eq('user_id', user_id)\
-            .order('transaction_date', desc=True)\
-            .limit(limit)
-        
-        if product_id:
-            query = query.eq('product_id', product_id)
-        
-        response = query.execute()
-        return response.data
-    except Exception as e:
-        print(f"입출고 내역 조회 오류: {e}")
+def _transaction_filters(product_id: str = None, trans_type: str = None,
+                         start_date: date = None, end_date: date = None) -> dict:
+    """화면 필터를 백엔드 조건으로 변환 (기간은 start_date ~ end_date 당일까지 포함)"""
+    return {
+        'product_id': product_id,
+        'trans_type': trans_type,
+        'date_from': start_date.isoformat() if start_date else None,
+        'date_to': (end_date + timedelta(days=1)).isoformat() if end_date else None,
+    }
+
+
+@track
+def get_transactions(user_id: str, product_id: str = None, limit: int = 100,
+                     trans_type: str = None, start_date: date = None, end_date: date = None):
+    """입출고 내역 조회 (상품/유형/기간 필터는 DB에서 적용)"""
+    try:
+        return get_backend().get_transactions(
+            user_id, limit=limit, **_transaction_filters(product_id, trans_type, start_date, end_date)
+        )
+    except Exception as e:
+        log_error("입출고 내역 조회 오류", e)
+        return []
+
+
+def _cursor_of(transaction: dict) -> tuple:
+    return (transaction['transaction_date'], transaction['id'])
+
+
+@track
+def get_transactions_page(user_id: str, cursor: tuple = None, direction: str = 'next',
+                          page_size: int = 50, product_id: str = None, trans_type: str = None,
+                          start_date: date = None, end_date: date = None) -> dict:
+    """입출고 내역 커서 페이지 조회 ((transaction_date, id) 키셋 페이지네이션)
+
+    Args:
+        cursor: 이전 응답의 next_cursor 또는 prev_cursor (None이면 최신 페이지)
+        direction: next_cursor를 넘기면 'next', prev_cursor를 넘기면 'prev'
+
+    Returns:
+        {'rows': 최신순 행 리스트, 'next_cursor': 더 과거 페이지 커서, 'prev_cursor': 더 최근 페이지 커서}
+        (해당 방향 페이지가 없으면 커서는 None)
+    """
+    try:
+        fetched = get_backend().get_transactions(
+            user_id, limit=page_size + 1, cursor=cursor, direction=direction,
+            **_transaction_filters(product_id, trans_type, start_date, end_date)
+        )
+    except Exception as e:
+        log_error("입출고 내역 조회 오류", e)
+        return {'rows': [], 'next_cursor': None, 'prev_cursor': None}
+
+    has_more = len(fetched) > page_size
+    rows = fetched[:page_size]
+    if direction == 'next':
+        has_next, has_prev = has_more, cursor is not None
+    else:
+        rows.reverse()
+        has_next, has_prev = True, has_more
+
+    return {
+        'rows': rows,
+        'next_cursor': _cursor_of(rows[-1]) if rows and has_next else None,
+        'prev_cursor': _cursor_of(rows[0]) if rows and has_prev else None,
+    }
+
+
+def iter_transactions(user_id: str, page_size: int = 500, **filters):
+    """입출고 내역을 최신순으로 한 페이지씩 지연 조회하는 제너레이터 (전체를 메모리에 올리지 않음)
+
+    filters: get_transactions_page와 같은 product_id / trans_type / start_date / end_date
+    """
+    cursor = None
+    while True:
+        page = get_transactions_page(user_id, cursor=cursor, page_size=page_size, **filters)
+        if page['rows']:
+            yield page['rows']
+        cursor = page['next_cursor']
+        if cursor is None:
+            return
+
+
+@track
+def get_transaction_totals(user_id: str, product_id: str = None, trans_type: str = None,
+                           start_date: date = None, end_date: date = None) -> dict:
+    """필터에 해당하는 전체 입출고 건수와 입고·출고 수량/금액 합계 (DB 집계)"""
+    try:
+        return get_backend().get_transaction_totals(
+            user_id, **_transaction_filters(product_id, trans_type, start_date, end_date)
+        )
+    except Exception as e:
+        log_error("입출고 합계 조회 오류", e)
+        return {'count': 0, 'in_quantity': 0, 'out_quantity': 0, 'in_value': 0, 'out_value': 0}
+
+
+@track
+def get_transaction_trend(user_id: str, bucket: str = 'day',
+                          start_date: date = None, end_date: date = None) -> list:
+    """입출고 추이 (일/주/월 단위 입고·출고 수량과 금액, DB 집계)
+
+    Args:
+        bucket: 'day' | 'week' | 'month'
+    """
+    if bucket not in ('day', 'week', 'month'):
+        raise ValueError(f"지원하지 않는 집계 단위입니다: {bucket}")
+    filters = _transaction_filters(start_date=start_date, end_date=end_date)
+    try:
+        return get_backend().get_transaction_trend(
+            user_id, bucket=bucket, date_from=filters['date_from'], date_to=filters['date_to']
+        )
+    except Exception as e:
+        log_error("입출고 추이 조회 오류", e)
         return []
 
 
+@track
 def create_transaction(user_id: str, transaction_data: dict):
-    """입출고 등록 및 재고 업데이트"""
-    try:
-        # 입출고 기록 추가
-        transaction_data['user_id'] = user_id
-        trans_response = supabase.table('transactions').insert(transaction_data).execute()
-        
-        # 재고 업데이트
-        product_id = transaction_data['product_id']
-        quantity = transaction_data['quantity']
-        trans_type = transaction_data['type']
-        
-        # 현재 재고 조회
-        product = get_product_by_id(product_id)
-        if product:
-            current_stock = product.get('current_stock', 0)
-            
-            # 입고면 +, 출고면 -
-            if trans_type == '입고':
-                new_stock = current_stock + quantity
-            else:  # 출고
-                new_stock = current_stock - quantity
-            
-            # 재고 업데이트
-            update_product(product_id, {'current_stock': new_stock})
-        
-        return trans_response.data
-    except Exception as e:
-        print(f"입출고 등록 오류: {e}")
+    """입출고 등록 및 재고 업데이트 (한 번의 원자적 호출)
+
+    Returns:
+        [등록된 행 + 'new_stock'(반영 후 재고)], 실패 시 None
+    """
+    try:
+        result = get_backend().create_transaction(user_id, transaction_data)
+        if not result:
+            return None
+        product = _cache_find(user_id, transaction_data['product_id'])
+        if product is not None:
+            _cache_replace(user_id, product['id'], {**product, 'current_stock': result[0]['new_stock']})
+        _mark_outflow_changed(user_id, [transaction_data])
+        return result
+    except Exception as e:
+        log_error("입출고 등록 오류", e)
         return None
 
 
+@track
+def create_transactions_bulk(user_id: str, rows: list, chunk_size: int = None) -> dict:
+    """입출고 일괄 등록 (chunk_size 행씩 한 번의 호출로 기록 + 재고 반영)
+
+    각 묶음은 원자적으로 처리되며, 실패하면 이후 묶음은 등록하지 않음.
+
+    Returns:
+        {'inserted': 등록된 건수, 'error': 오류 메시지 또는 None}
+    """
+    chunk_size = chunk_size or BULK_CHUNK_SIZE
+    inserted = 0
+    for i in range(0, len(rows), chunk_size):
+        try:
+            result = get_backend().create_transactions_bulk(user_id, rows[i:i + chunk_size])
+        except Exception as e:
+            log_error("입출고 일괄 등록 오류", e)
+            return {'inserted': inserted, 'error': str(e)}
+        inserted += result['inserted']
+        _cache_set_stocks(user_id, result['stocks'])
+        _mark_outflow_changed(user_id, rows[i:i + chunk_size])
+    return {'inserted': inserted, 'error': None}
+
+
+@track
 def get_low_stock_products(user_id: str):
     """재고 부족 상품 조회 (현재재고 < 최소재고)"""
     try:
@@ -159,33 +465,114 @@ def get_low_stock_products(user_id: str):
         ]
         return low_stock
     except Exception as e:
-        print(f"재고 부족 상품 조회 오류: {e}")
+        log_error("재고 부족 상품 조회 오류", e)
         return []
 
 
 # ===== 통계 함수 =====
 
+@track
 def get_inventory_summary(user_id: str):
-    """재고 요약 통계"""
+    """재고 요약 통계 (DB에서 집계, 카테고리별 상품 수/재고 가치 포함)"""
     try:
-        products = get_products(user_id)
-        
-        total_products = len(products)
-        total_stock_value = sum(
-            p.get('current_stock', 0) * p.get('unit_price', 0) 
-            for p in products
-        )
-        low_stock_count = len(get_low_stock_products(user_id))
-        
-        return {
-            'total_products': total_products,
-            'total_stock_value': total_stock_value,
-            'low_stock_count': low_stock_count
-        }
+        return get_backend().get_inventory_summary(user_id)
     except Exception as e:
-        print(f"통계 조회 오류: {e}")
+        log_error("통계 조회 오류", e)
         return {
             'total_products': 0,
             'total_stock_value': 0,
-            'low_stock_count': 0
+            'low_stock_count': 0,
+            'categories': []
         }
+
+
+@track
+def get_stock_history(user_id: str, start_date: date, end_date: date, product_id: str = None) -> dict:
+    """기간 재고 추이 (일별 스냅샷 기반, 기간 양끝 포함)
+
+    Returns:
+        {'opening_stock': 기간 시작 전 재고, 'closing_stock': 기간 마지막 날 마감 재고,
+         'days': [{'date', 'in_quantity', 'out_quantity', 'closing_stock'}, ...]}
+    """
+    try:
+        days = get_backend().get_stock_history(
+            user_id, start_date.isoformat(), end_date.isoformat(), product_id
+        ) or []
+    except Exception as e:
+        log_error("재고 추이 조회 오류", e)
+        days = []
+    if not days:
+        return {'opening_stock': 0, 'closing_stock': 0, 'days': []}
+    first = days[0]
+    return {
+        'opening_stock': first['closing_stock'] - first['in_quantity'] + first['out_quantity'],
+        'closing_stock': days[-1]['closing_stock'],
+        'days': days,
+    }
+
+
+@track
+def get_daily_outflow(user_id: str, start_date: date) -> list | None:
+    """start_date 이후 상품별 일별 출고량 (일별 스냅샷 기반, 출고가 있는 날만)
+
+    Returns:
+        [{'product_id', 'date', 'out_quantity'}, ...], 실패 시 None
+    """
+    try:
+        return get_backend().get_daily_outflow(user_id, start_date.isoformat())
+    except Exception as e:
+        log_error("출고량 조회 오류", e)
+        return None
+
+
+@track
+def rebuild_stock_snapshots(user_id: str = None) -> int:
+    """입출고 내역 전체로 일별 재고 스냅샷 재구성 (백필)
+
+    Returns:
+        생성된 스냅샷 행 수, 실패 시 -1
+    """
+    try:
+        return get_backend().rebuild_stock_snapshots(user_id)
+    except Exception as e:
+        log_error("재고 스냅샷 재구성 오류", e)
+        return -1
+
+
+# ===== 동시 조회 =====
+
+def fetch_concurrently(**calls) -> dict:
+    """서로 독립적인 조회 함수를 스레드로 동시에 실행하고 이름별 결과를 모아 반환
+
+    페이지 응답 시간이 조회 시간의 합이 아니라 가장 느린 조회 하나의 시간에 가까워짐.
+    각 스레드에 현재 Streamlit 세션 컨텍스트를 붙이므로 세션별 DB 클라이언트를 그대로 사용.
+    위의 조회 함수들은 오류 시 빈 결과를 반환하므로, 여기서 예외가 나면 그대로 다시 발생시킴.
+
+    Example:
+        data = fetch_concurrently(
+            summary=partial(get_inventory_summary, user_id),
+            recent=partial(get_transactions, user_id, limit=5),
+        )
+        data['summary'], data['recent']
+    """
+    results, errors = {}, {}
+
+    def run(name, fn):
+        try:
+            results[name] = fn()
+        except Exception as e:
+            errors[name] = e
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    threads = [threading.Thread(target=run, args=(name, fn), name=f"fetch-{name}", daemon=True)
+               for name, fn in calls.items()]
+    for thread in threads:
+        if ctx is not None:
+            add_script_run_ctx(thread, ctx)
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise next(iter(errors.values()))
+    return results
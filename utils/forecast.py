@@ -0,0 +1,181 @@
+"""
+출고 속도 예측과 재주문 제안
+- 일별 스냅샷의 상품별 출고량으로 지수평활(EWMA) 출고 속도와 변동성을 한 번에 계산 (pandas 벡터 연산)
+- 상품마다 재고 소진까지 남은 일수, 재주문점(리드타임 동안의 수요 + 안전재고), 제안 주문량 산출
+- 사용자별로 출고량을 캐시하고, 새 출고가 등록되면 바뀐 날짜부터만 다시 조회해 반영
+- 계산 기준: 최근 FORECAST_WINDOW_DAYS일(오늘 포함), 출고가 없는 날은 0으로 봄
+
+재주문점 = max(출고 속도 × 리드타임 + 안전재고, 최소재고)
+안전재고 = 서비스 수준 z × 일별 출고량 표준편차 × √리드타임
+제안 주문량 = 재고가 재주문점 이하일 때 (재주문점 + 출고 속도 × 주문 주기 - 현재재고), 아니면 0
+"""
+import math
+from datetime import date, timedelta
+from typing import TYPE_CHECKING
+
+from . import database as db
+from .cache import TTLCache
+from .config import get_setting
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# 예측에 사용하는 기간 (일)
+FORECAST_WINDOW_DAYS = int(get_setting("FORECAST_WINDOW_DAYS", 90))
+# EWMA 기간 (span, 일): 가중치 alpha = 2 / (span + 1), 최근 출고에 더 큰 비중
+FORECAST_SPAN_DAYS = float(get_setting("FORECAST_SPAN_DAYS", 14))
+# 주문 후 입고까지 걸리는 일수
+REORDER_LEAD_TIME_DAYS = float(get_setting("REORDER_LEAD_TIME_DAYS", 7))
+# 한 번 주문으로 버틸 기간 (다음 주문까지의 주기, 일)
+REORDER_REVIEW_DAYS = float(get_setting("REORDER_REVIEW_DAYS", 14))
+# 안전재고 서비스 수준 계수 (1.65 ≈ 95%)
+REORDER_SERVICE_Z = float(get_setting("REORDER_SERVICE_Z", 1.65))
+
+# 소진 예정일을 표시하는 최대 일수 (그보다 멀면 날짜 없음)
+STOCKOUT_HORIZON_DAYS = 3650
+
+# 사용자별 출고량 캐시 (user_id → {'as_of', 'outflow', 'stats'}, 저장한 dict는 바꾸지 않음)
+# 증분 갱신은 새 dict로 교체하되 만료 시각은 유지: TTL마다 전체를 다시 읽어 다른 프로세스의 등록도 반영
+_forecast_cache = TTLCache(
+    ttl=float(get_setting("FORECAST_CACHE_TTL", 3600)),
+    maxsize=int(get_setting("PRODUCT_CACHE_MAX_USERS", 256))
+)
+
+
+def window_start(as_of: date) -> date:
+    return as_of - timedelta(days=FORECAST_WINDOW_DAYS - 1)
+
+
+def _outflow_frame(rows: list) -> 'pd.DataFrame':
+    import pandas as pd
+    df = pd.DataFrame(rows, columns=['product_id', 'date', 'out_quantity'])
+    df['date'] = pd.to_datetime(df['date'].astype(str).str.slice(0, 10))
+    df['out_quantity'] = df['out_quantity'].astype(float)
+    return df
+
+
+def outflow_stats(outflow: 'pd.DataFrame', as_of: date) -> 'pd.DataFrame':
+    """상품별 출고 통계 (index: product_id)
+
+    EWMA는 기간 안의 모든 날(출고 없는 날 = 0)에 지수 가중치를 둔 가중 평균과 같으므로,
+    출고가 있는 날의 행만으로 상품별 가중합을 구해 계산 (상품 × 날짜 행렬을 만들지 않음).
+
+    Returns:
+        DataFrame[velocity(EWMA 일평균), average(단순 일평균), std(일별 표준편차), last_out(마지막 출고일)]
+    """
+    import numpy as np
+    import pandas as pd
+
+    age = (pd.Timestamp(as_of) - outflow['date']).dt.days.to_numpy()
+    in_window = (age >= 0) & (age < FORECAST_WINDOW_DAYS)
+    outflow, age = outflow[in_window], age[in_window]
+
+    decay = 1 - 2 / (FORECAST_SPAN_DAYS + 1)
+    # 기간 전체 가중치 합이 1이 되도록 정규화
+    weight = (1 - decay) * decay ** age / (1 - decay ** FORECAST_WINDOW_DAYS)
+    quantity = outflow['out_quantity'].to_numpy()
+    grouped = pd.DataFrame({
+        'product_id': outflow['product_id'].to_numpy(),
+        'weighted': quantity * weight,
+        'quantity': quantity,
+        'squared': quantity * quantity,
+        'date': outflow['date'].to_numpy(),
+    }).groupby('product_id', sort=False)
+
+    sums = grouped[['weighted', 'quantity', 'squared']].sum()
+    average = sums['quantity'] / FORECAST_WINDOW_DAYS
+    variance = (sums['squared'] / FORECAST_WINDOW_DAYS - average ** 2).clip(lower=0)
+    return pd.DataFrame({
+        'velocity': sums['weighted'],
+        'average': average,
+        'std': np.sqrt(variance),
+        'last_out': grouped['date'].max(),
+    })
+
+
+def build_forecast(products: list, stats: 'pd.DataFrame', as_of: date) -> 'pd.DataFrame':
+    """상품 목록과 출고 통계로 상품별 소진 예측/재주문 제안 계산
+
+    Returns:
+        DataFrame[id, name, sku, category, unit, current_stock, min_stock, velocity, average, std, last_out,
+                  days_of_cover(출고가 없으면 inf), stockout_date, reorder_point, reorder_quantity]
+    """
+    import numpy as np
+    import pandas as pd
+
+    df = pd.DataFrame(products, columns=['id', 'name', 'sku', 'category', 'unit', 'current_stock', 'min_stock'])
+    df = df.join(stats, on='id')
+    df[['velocity', 'average', 'std']] = df[['velocity', 'average', 'std']].fillna(0.0)
+
+    stock = df['current_stock'].fillna(0).clip(lower=0).to_numpy(dtype=float)
+    velocity = df['velocity'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df['days_of_cover'] = np.where(velocity > 0, stock / velocity, np.inf)
+    df['stockout_date'] = pd.Timestamp(as_of) + pd.to_timedelta(
+        df['days_of_cover'].where(df['days_of_cover'] <= STOCKOUT_HORIZON_DAYS), unit='D'
+    ).dt.floor('D')
+
+    safety = REORDER_SERVICE_Z * df['std'].to_numpy() * math.sqrt(REORDER_LEAD_TIME_DAYS)
+    reorder_point = np.ceil(np.maximum(velocity * REORDER_LEAD_TIME_DAYS + safety,
+                                       df['min_stock'].fillna(0).to_numpy(dtype=float)))
+    target = reorder_point + velocity * REORDER_REVIEW_DAYS
+    df['reorder_point'] = reorder_point.astype(int)
+    df['reorder_quantity'] = np.where(stock <= reorder_point, np.ceil(np.maximum(target - stock, 0)), 0).astype(int)
+    return df
+
+
+def _load(user_id: str, as_of: date) -> dict | None:
+    rows = db.get_daily_outflow(user_id, window_start(as_of))
+    if rows is None:
+        return None
+    outflow = _outflow_frame(rows)
+    return {'as_of': as_of, 'outflow': outflow, 'stats': outflow_stats(outflow, as_of)}
+
+
+def _refresh(state: dict, user_id: str, since: date) -> dict:
+    """since 이후의 출고량만 다시 조회해 새 상태 반환 (조회 실패 시 기존 상태)"""
+    import pandas as pd
+    rows = db.get_daily_outflow(user_id, since)
+    if rows is None:
+        return state
+    outflow = state['outflow']
+    outflow = pd.concat([outflow[outflow['date'] < pd.Timestamp(since)], _outflow_frame(rows)], ignore_index=True)
+    return {'as_of': state['as_of'], 'outflow': outflow, 'stats': outflow_stats(outflow, state['as_of'])}
+
+
+def _stats(user_id: str, as_of: date) -> 'pd.DataFrame':
+    """사용자의 출고 통계 (캐시 우선, 새 출고가 있으면 바뀐 날짜부터 증분 갱신)"""
+    changed = db.pop_outflow_changes(user_id)
+    state = _forecast_cache.get(user_id)
+    if state is None or state['as_of'] != as_of:
+        state = _load(user_id, as_of)
+        if state is None:
+            return outflow_stats(_outflow_frame([]), as_of)
+        _forecast_cache.set(user_id, state)
+    elif changed is not None and changed <= as_of.isoformat():
+        refreshed = _refresh(state, user_id, max(date.fromisoformat(changed), window_start(as_of)))
+        # 같은 사용자의 다른 세션이 먼저 갱신했으면 그쪽이 이 변경을 놓쳤을 수 있으므로 다음 조회 때 전체를 다시 읽음
+        if not _forecast_cache.replace(user_id, state, refreshed):
+            _forecast_cache.pop(user_id)
+        state = refreshed
+    return state['stats']
+
+
+def get_forecast(user_id: str, as_of: date = None) -> 'pd.DataFrame':
+    """모든 상품의 출고 속도, 재고 소진 예측, 재주문 제안 (as_of 기준, 기본 오늘)"""
+    as_of = as_of or date.today()
+    return build_forecast(db.get_products(user_id), _stats(user_id, as_of), as_of)
+
+
+def runs_out_within(forecast: 'pd.DataFrame', days: int) -> 'pd.DataFrame':
+    """days일 안에 재고가 소진될 것으로 예상되는 상품 (소진이 빠른 순)"""
+    return forecast[forecast['days_of_cover'] <= days].sort_values(['days_of_cover', 'velocity'],
+                                                                   ascending=[True, False])
+
+
+def invalidate_forecast(user_id: str = None):
+    """출고량 캐시 무효화 (user_id가 없으면 전체)"""
+    if user_id is None:
+        _forecast_cache.clear()
+    else:
+        _forecast_cache.pop(user_id)
@@ -1,9 +1,14 @@
 """
 헬퍼 함수 모음
+- pandas/numpy는 표를 만들 때 처음 import (로그인 화면 등 표가 없는 화면의 시작 시간 단축)
 """
 import streamlit as st
 from datetime import datetime
-import pandas as pd
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
 
 
 def format_currency(amount: float) -> str:
@@ -56,14 +61,15 @@ def validate_non_negative_number(value, field_name: str) -> bool:
     return True
 
 
-def create_dataframe(data: list) -> pd.DataFrame:
+def create_dataframe(data: list) -> 'pd.DataFrame':
     """리스트를 DataFrame으로 변환"""
+    import pandas as pd
     if not data:
         return pd.DataFrame()
     return pd.DataFrame(data)
 
 
-def export_to_csv(df: pd.DataFrame, filename: str):
+def export_to_csv(df: 'pd.DataFrame', filename: str):
     """DataFrame을 CSV로 내보내기"""
     csv = df.to_csv(index=False, encoding='utf-8-sig')
     st.download_button(
@@ -72,3 +78,92 @@ def export_to_csv(df: pd.DataFrame, filename: str):
         file_name=filename,
         mime='text/csv'
     )
+
+
+# ===== 표 만들기 (벡터 연산, Styler 미사용) =====
+
+STATUS_LOW = '⚠️ 부족'
+STATUS_OK = '✅ 정상'
+TYPE_LABELS = {'입고': '🟢 입고', '출고': '🔴 출고'}
+
+
+def currency_column(label: str):
+    """원화 금액 컬럼 설정 (값은 숫자로 두고 화면에서만 천 단위 구분 표시)"""
+    return st.column_config.NumberColumn(f"{label} (₩)", format="localized")
+
+
+# st.dataframe(column_config=...)에 그대로 넘기는 금액 컬럼 설정
+TABLE_COLUMN_CONFIG = {
+    '단가': currency_column('단가'),
+    '합계': currency_column('합계'),
+    '재고가치': currency_column('재고가치'),
+}
+
+
+def stock_status(current_stock: 'pd.Series', min_stock: 'pd.Series') -> 'np.ndarray':
+    """재고 상태 라벨 (현재재고 < 최소재고이면 부족)"""
+    import numpy as np
+    return np.where(current_stock.to_numpy() < min_stock.to_numpy(), STATUS_LOW, STATUS_OK)
+
+
+def product_table(products: list) -> 'pd.DataFrame':
+    """상품 목록 표 (상품 목록 화면/CSV 내보내기용, 헤더는 일괄 등록 양식과 동일)"""
+    import pandas as pd
+    df = pd.DataFrame(products, columns=['name', 'sku', 'category', 'unit', 'unit_price',
+                                         'current_stock', 'min_stock'])
+    table = df.rename(columns={
+        'name': '상품명', 'sku': '상품코드', 'category': '카테고리', 'unit': '단위',
+        'unit_price': '단가', 'current_stock': '현재재고', 'min_stock': '최소재고',
+    })
+    table['재고상태'] = stock_status(df['current_stock'], df['min_stock'])
+    return table
+
+
+def inventory_table(products: list) -> 'pd.DataFrame':
+    """재고 현황 표 (수량에 단위 표시, 재고가치 포함)"""
+    import pandas as pd
+    df = pd.DataFrame(products, columns=['name', 'category', 'unit', 'unit_price', 'current_stock', 'min_stock'])
+    unit = ' ' + df['unit'].astype(str)
+    return pd.DataFrame({
+        '상품명': df['name'],
+        '카테고리': df['category'],
+        '현재재고': df['current_stock'].astype(str) + unit,
+        '최소재고': df['min_stock'].astype(str) + unit,
+        '단가': df['unit_price'],
+        '재고가치': df['current_stock'] * df['unit_price'],
+        '상태': stock_status(df['current_stock'], df['min_stock']),
+    })
+
+
+def transaction_table(transactions: list) -> 'pd.DataFrame':
+    """입출고 내역 표 (유형은 색 아이콘으로 구분)"""
+    import pandas as pd
+    df = pd.DataFrame(transactions, columns=['transaction_date', 'products', 'type', 'quantity',
+                                             'unit_price', 'total_price', 'memo'])
+    product = df['products'].astype(object)
+    return pd.DataFrame({
+        '날짜': df['transaction_date'].astype(str).str.slice(0, 10),
+        '상품명': product.str.get('name').fillna('알 수 없음'),
+        '상품코드': product.str.get('sku').fillna('-'),
+        '유형': df['type'].map(TYPE_LABELS).fillna(df['type']),
+        '수량': df['quantity'],
+        '단가': df['unit_price'],
+        '합계': df['total_price'],
+        '메모': df['memo'].fillna('-').replace('', '-'),
+    })
+
+
+def forecast_table(forecast: 'pd.DataFrame') -> 'pd.DataFrame':
+    """재고 소진 예측 표 (forecast.get_forecast 결과, 수량에 단위 표시)"""
+    import pandas as pd
+    unit = ' ' + forecast['unit'].astype(str)
+    return pd.DataFrame({
+        '상품명': forecast['name'],
+        '카테고리': forecast['category'],
+        '현재재고': forecast['current_stock'].astype(str) + unit,
+        '하루 출고량': forecast['velocity'].round(1),
+        '남은 일수': forecast['days_of_cover'].round(1),
+        '소진 예상일': forecast['stockout_date'].dt.strftime('%Y-%m-%d').fillna('-'),
+        '재주문점': forecast['reorder_point'].astype(str) + unit,
+        '제안 주문량': forecast['reorder_quantity'].astype(str) + unit,
+    })
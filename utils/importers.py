@@ -0,0 +1,257 @@
+"""
+CSV/Excel 일괄 등록 유틸리티
+- 업로드 파일 파싱, 컬럼 정규화, 행 단위 검증 (pandas 벡터 연산)
+- pandas/numpy는 파일을 처리할 때 처음 import (상품관리/입출고관리 페이지의 시작 시간 단축)
+"""
+import codecs
+import io
+from datetime import date
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# 입출고 일괄 등록 컬럼 (영문 또는 화면/CSV 내보내기와 같은 한글 헤더 허용)
+TRANSACTION_HEADER_ALIASES = {
+    '상품코드': 'sku', 'SKU': 'sku',
+    '유형': 'type', '거래유형': 'type',
+    '수량': 'quantity',
+    '단가': 'unit_price',
+    '메모': 'memo',
+    '날짜': 'date', '거래날짜': 'date', 'transaction_date': 'date',
+}
+TRANSACTION_REQUIRED_COLUMNS = ('sku', 'type', 'quantity')
+TYPE_ALIASES = {
+    'in': '입고', 'IN': '입고', 'out': '출고', 'OUT': '출고',
+    '🟢 입고': '입고', '🔴 출고': '출고',  # 입출고 내역 CSV 내보내기 표기
+}
+
+# 상품 일괄 등록 컬럼 (상품 목록 CSV 내보내기 헤더도 인식)
+# 현재재고는 새로 등록하는 상품의 초기 재고로만 쓰이고, 이미 있는 상품의 재고는 바꾸지 않음
+# (재고 변경은 입출고로만 기록)
+PRODUCT_HEADER_ALIASES = {
+    '상품코드': 'sku', 'SKU': 'sku',
+    '상품명': 'name',
+    '카테고리': 'category',
+    '단위': 'unit',
+    '단가': 'unit_price',
+    '현재재고': 'current_stock', '초기재고': 'current_stock',
+    '최소재고': 'min_stock',
+}
+PRODUCT_REQUIRED_COLUMNS = ('sku', 'name', 'category', 'unit')
+PRODUCT_OPTIONAL_COLUMNS = {'unit_price': '단가', 'current_stock': '현재재고', 'min_stock': '최소재고'}
+
+
+def read_upload(uploaded_file) -> 'pd.DataFrame':
+    """업로드 파일(CSV/XLSX)을 문자열 DataFrame으로 읽기 (상품코드 앞자리 0 보존)"""
+    import pandas as pd
+    name = uploaded_file.name.lower()
+    if name.endswith(('.xlsx', '.xls')):
+        df = pd.read_excel(uploaded_file, dtype=str)
+    else:
+        raw = uploaded_file.getvalue()
+        for encoding in ('utf-8-sig', 'cp949'):
+            try:
+                df = pd.read_csv(io.BytesIO(raw), dtype=str, encoding=encoding)
+                break
+            except UnicodeDecodeError:
+                continue
+        else:
+            raise ValueError("파일 인코딩을 인식할 수 없습니다. (UTF-8 또는 CP949)")
+    return df.fillna('')
+
+
+def _detect_encoding(sample: bytes) -> str:
+    """CSV 앞부분으로 인코딩 판별 (UTF-8 실패 시 CP949)"""
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8-sig'
+    except UnicodeDecodeError:
+        return 'cp949'
+
+
+def iter_upload_chunks(uploaded_file, chunk_size: int):
+    """업로드 파일을 chunk_size 행씩 문자열 DataFrame으로 읽기 (메모리 사용량 일정)"""
+    import pandas as pd
+    name = uploaded_file.name.lower()
+    uploaded_file.seek(0)
+
+    if name.endswith(('.xlsx', '.xls')):
+        from openpyxl import load_workbook
+        workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(c).strip() if c is not None else '' for c in next(rows, ())]
+            batch = []
+            for row in rows:
+                batch.append(['' if v is None else str(v) for v in row[:len(header)]])
+                if len(batch) >= chunk_size:
+                    yield pd.DataFrame(batch, columns=header, dtype=str)
+                    batch = []
+            if batch:
+                yield pd.DataFrame(batch, columns=header, dtype=str)
+        finally:
+            workbook.close()
+        return
+
+    encoding = _detect_encoding(uploaded_file.read(64 * 1024))
+    uploaded_file.seek(0)
+    for chunk in pd.read_csv(uploaded_file, dtype=str, encoding=encoding, chunksize=chunk_size):
+        yield chunk.fillna('')
+
+
+def normalize_columns(df: 'pd.DataFrame', aliases: dict, required: tuple) -> 'pd.DataFrame':
+    """헤더 공백 제거 및 별칭 변환, 필수 컬럼 확인"""
+    df = df.rename(columns=lambda c: str(c).strip())
+    df = df.rename(columns=aliases)
+    missing = [c for c in required if c not in df.columns]
+    if missing:
+        raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+    return df
+
+
+def _error_frame(row_no: 'pd.Series', sku: 'pd.Series', mask: 'pd.Series', message: str) -> 'pd.DataFrame':
+    import pandas as pd
+    return pd.DataFrame({'행': row_no[mask], '상품코드': sku[mask], '오류': message})
+
+
+def prepare_transaction_import(df: 'pd.DataFrame', products_by_sku: dict):
+    """입출고 일괄 등록 데이터 검증
+
+    Args:
+        df: read_upload 결과
+        products_by_sku: {sku: 상품 dict}
+
+    Returns:
+        (등록할 행 리스트, 오류 DataFrame[행, 상품코드, 오류])
+    """
+    import numpy as np
+    import pandas as pd
+    df = normalize_columns(df, TRANSACTION_HEADER_ALIASES, TRANSACTION_REQUIRED_COLUMNS)
+    row_no = pd.Series(np.arange(len(df)) + 2, index=df.index)  # 1행은 헤더
+
+    sku = df['sku'].astype(str).str.strip()
+    product_id = sku.map({k: p['id'] for k, p in products_by_sku.items()})
+    trans_type = df['type'].astype(str).str.strip().replace(TYPE_ALIASES)
+    quantity = pd.to_numeric(df['quantity'], errors='coerce')
+
+    default_price = sku.map({k: p.get('unit_price', 0) for k, p in products_by_sku.items()})
+    if 'unit_price' in df.columns:
+        raw_price = df['unit_price'].astype(str).str.strip().replace('', np.nan)
+        unit_price = pd.to_numeric(raw_price, errors='coerce')
+        bad_price = raw_price.notna() & (unit_price.isna() | (unit_price < 0))
+        unit_price = unit_price.fillna(default_price)
+    else:
+        unit_price = default_price
+        bad_price = pd.Series(False, index=df.index)
+
+    if 'date' in df.columns:
+        raw_date = df['date'].astype(str).str.strip().replace('', np.nan)
+        parsed_date = pd.to_datetime(raw_date, errors='coerce', format='mixed')
+        bad_date = raw_date.notna() & parsed_date.isna()
+        trans_date = parsed_date.dt.strftime('%Y-%m-%d').fillna(date.today().isoformat())
+    else:
+        bad_date = pd.Series(False, index=df.index)
+        trans_date = pd.Series(date.today().isoformat(), index=df.index)
+
+    memo = df['memo'].astype(str).str.strip() if 'memo' in df.columns else pd.Series('', index=df.index)
+
+    checks = [
+        (sku == '', "상품코드가 비어 있습니다"),
+        ((sku != '') & product_id.isna(), "등록되지 않은 상품코드입니다"),
+        (~trans_type.isin(['입고', '출고']), "유형은 입고 또는 출고여야 합니다"),
+        (quantity.isna() | (quantity <= 0) | (quantity % 1 != 0), "수량은 1 이상의 정수여야 합니다"),
+        (bad_price, "단가는 0 이상의 숫자여야 합니다"),
+        (bad_date, "날짜 형식이 올바르지 않습니다 (예: 2025-01-31)"),
+    ]
+    errors = [_error_frame(row_no, sku, mask, message) for mask, message in checks if mask.any()]
+    invalid = np.logical_or.reduce([mask.to_numpy() for mask, _ in checks])
+
+    # 출고로 재고가 음수가 되는 상품은 해당 상품의 모든 행을 오류 처리
+    valid = pd.Series(~invalid, index=df.index)
+    delta = np.where(trans_type == '입고', quantity, -quantity)
+    net = pd.Series(delta, index=df.index)[valid].groupby(product_id[valid]).sum()
+    stock = pd.Series({p['id']: p.get('current_stock', 0) for p in products_by_sku.values()})
+    short = net.index[(stock.reindex(net.index).fillna(0) + net) < 0]
+    if len(short):
+        short_mask = valid & product_id.isin(short)
+        errors.append(_error_frame(row_no, sku, short_mask, "출고 수량이 재고보다 많습니다"))
+        valid &= ~short_mask
+
+    quantity = quantity[valid].astype(int)
+    unit_price = unit_price[valid].astype(float)
+    rows = pd.DataFrame({
+        'product_id': product_id[valid],
+        'type': trans_type[valid],
+        'quantity': quantity,
+        'unit_price': unit_price,
+        'total_price': quantity * unit_price,
+        'memo': memo[valid].astype(object).where(memo[valid] != '', None),
+        'transaction_date': trans_date[valid],
+    }).to_dict('records')
+
+    if errors:
+        error_df = pd.concat(errors).sort_values('행', kind='stable')
+    else:
+        error_df = pd.DataFrame(columns=['행', '상품코드', '오류'])
+    return rows, error_df
+
+
+def _parse_number(series: 'pd.Series') -> 'pd.Series':
+    """'₩1,000' 같은 표시용 금액도 숫자로 변환 (실패 시 NaN)"""
+    import numpy as np
+    import pandas as pd
+    cleaned = series.astype(str).str.replace(r'[₩,\s]', '', regex=True).replace('', np.nan)
+    return pd.to_numeric(cleaned, errors='coerce')
+
+
+def prepare_product_import(df: 'pd.DataFrame', categories: list, units: list, first_row: int = 2):
+    """상품 일괄 등록 데이터 검증 (한 묶음 단위)
+
+    Args:
+        df: iter_upload_chunks가 반환한 묶음
+        categories / units: 허용되는 카테고리 / 단위 목록
+        first_row: 묶음 첫 행의 파일상 행 번호 (1행은 헤더)
+
+    Returns:
+        (등록할 행 리스트, 각 행의 파일상 행 번호 리스트, 오류 DataFrame[행, 상품코드, 오류])
+    """
+    import numpy as np
+    import pandas as pd
+    df = normalize_columns(df, PRODUCT_HEADER_ALIASES, PRODUCT_REQUIRED_COLUMNS)
+    row_no = pd.Series(np.arange(len(df)) + first_row, index=df.index)
+
+    data = {col: df[col].astype(str).str.strip() for col in PRODUCT_REQUIRED_COLUMNS}
+    checks = [
+        (data['sku'] == '', "상품코드가 비어 있습니다"),
+        (data['name'] == '', "상품명이 비어 있습니다"),
+        (~data['category'].isin(categories), f"카테고리는 {', '.join(categories)} 중 하나여야 합니다"),
+        (~data['unit'].isin(units), f"단위는 {', '.join(units)} 중 하나여야 합니다"),
+    ]
+    for col, label in PRODUCT_OPTIONAL_COLUMNS.items():
+        if col in df.columns:
+            raw = df[col].astype(str).str.strip().replace('', np.nan)
+            values = _parse_number(df[col])
+            invalid = raw.notna() & (values.isna() | (values < 0))
+            if col == 'unit_price':
+                checks.append((invalid, f"{label}은(는) 0 이상의 숫자여야 합니다"))
+            else:
+                # 재고 수량은 반올림하지 않고 소수면 오류 처리
+                checks.append((invalid | (values % 1 > 0), f"{label}은(는) 0 이상의 정수여야 합니다"))
+                values = values.where(values % 1 == 0).astype('Int64')
+            # 빈 칸은 None: 새 상품은 DB 기본값(0), 이미 있는 상품은 기존 값 유지
+            data[col] = values.astype(object).where(values.notna(), None)
+
+    # 같은 묶음 안의 중복 상품코드는 마지막 행만 반영
+    checks.append((data['sku'].duplicated(keep='last') & (data['sku'] != ''),
+                   "같은 상품코드가 파일에 중복됩니다 (마지막 행이 반영됨)"))
+
+    errors = [_error_frame(row_no, data['sku'], mask, message) for mask, message in checks if mask.any()]
+    valid = ~np.logical_or.reduce([mask.to_numpy() for mask, _ in checks])
+
+    rows = pd.DataFrame({col: values[valid] for col, values in data.items()}).to_dict('records')
+    if errors:
+        error_df = pd.concat(errors).sort_values('행', kind='stable')
+    else:
+        error_df = pd.DataFrame(columns=['행', '상품코드', '오류'])
+    return rows, row_no[valid].tolist(), error_df
@@ -0,0 +1,130 @@
+"""
+Lottie 애니메이션 로더
+- 번들 파일(assets/lottie/<이름>.json) → 디스크 캐시 → 네트워크 순으로 조회
+- 네트워크 요청은 항상 백그라운드 스레드에서 실행되어 화면 렌더링을 막지 않음
+  (처음 요청한 렌더에서는 None을 반환하고, 받아온 뒤의 재실행부터 애니메이션 표시)
+- 디스크 캐시가 TTL보다 오래되면 기존 파일을 그대로 쓰면서 백그라운드에서 갱신
+- requests/streamlit_lottie는 실제로 내려받거나 그릴 때 import
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .config import get_setting
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 저장소에 포함된 애니메이션 파일 위치 (scripts/fetch_lottie_assets.py로 내려받음)
+ASSETS_DIR = os.path.join(_ROOT, "assets", "lottie")
+# 네트워크에서 받아온 파일 캐시 위치
+CACHE_DIR = get_setting("LOTTIE_CACHE_DIR", os.path.join(_ROOT, ".cache", "lottie"))
+# 디스크 캐시 유효 시간 (초, 지나면 백그라운드 갱신)
+CACHE_TTL = float(get_setting("LOTTIE_CACHE_TTL", 7 * 24 * 3600))
+# 다운로드 실패 후 다시 시도하기까지 대기 시간 (초)
+RETRY_AFTER = 300
+REQUEST_TIMEOUT = 5
+
+# 자주 사용하는 Lottie 애니메이션 URL
+LOTTIE_URLS = {
+    "inventory": "https://lottie.host/e4e9a523-3a5f-4742-a853-aff6e32a5a04/oXpmIlYFjN.json",
+    "loading":   "https://lottie.host/4db68bbd-31f6-4cd8-84eb-189de235dcc2/6aFDMJOfMt.json",
+    "empty":     "https://lottie.host/2639b394-c2db-4a5a-a42b-7098e18c5af6/BjRrJikXul.json",
+}
+
+# 캐시 파일 경로 → (파일 수정 시각, 애니메이션 dict)
+_memory: dict = {}
+# 다운로드 중인 URL, URL → 마지막 실패 시각
+_pending: set = set()
+_failed: dict = {}
+_lock = threading.Lock()
+
+
+def _cache_path(url: str) -> str:
+    return os.path.join(CACHE_DIR, hashlib.blake2b(url.encode(), digest_size=16).hexdigest() + ".json")
+
+
+def _read_json(path: str) -> tuple | None:
+    """(수정 시각, dict) 반환, 파일이 없거나 깨졌으면 None (같은 파일은 메모리에서 재사용)"""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached = _memory.get(path)
+    if cached and cached[0] == mtime:
+        return cached
+    try:
+        with open(path, encoding='utf-8') as f:
+            entry = (mtime, json.load(f))
+    except (OSError, ValueError):
+        return None
+    _memory[path] = entry
+    return entry
+
+
+def fetch_lottie(url: str) -> dict | None:
+    """URL에서 애니메이션을 받아 디스크 캐시에 저장 (호출한 스레드에서 바로 요청)"""
+    import requests
+    r = requests.get(url, timeout=REQUEST_TIMEOUT)
+    r.raise_for_status()
+    data = r.json()
+    path = _cache_path(url)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+    return data
+
+
+def _refresh(url: str):
+    try:
+        fetch_lottie(url)
+        _failed.pop(url, None)
+    except Exception:
+        _failed[url] = time.monotonic()
+    finally:
+        with _lock:
+            _pending.discard(url)
+
+
+def _refresh_in_background(url: str):
+    """URL당 하나의 백그라운드 다운로드만 실행 (최근 실패했으면 RETRY_AFTER 동안 건너뜀)"""
+    failed_at = _failed.get(url)
+    if failed_at is not None and time.monotonic() - failed_at < RETRY_AFTER:
+        return
+    with _lock:
+        if url in _pending:
+            return
+        _pending.add(url)
+    threading.Thread(target=_refresh, args=(url,), name="lottie-refresh", daemon=True).start()
+
+
+def load_lottie_url(url: str) -> dict | None:
+    """Lottie 애니메이션 URL에서 로드 (디스크 캐시 사용, 네트워크는 기다리지 않음)
+
+    Returns:
+        애니메이션 dict, 아직 받아오지 못했으면 None
+    """
+    entry = _read_json(_cache_path(url))
+    if entry is None or time.time() - entry[0] > CACHE_TTL:
+        _refresh_in_background(url)
+    return entry[1] if entry else None
+
+
+def load_lottie(name: str) -> dict | None:
+    """이름으로 애니메이션 로드 (번들 파일 우선, 없으면 LOTTIE_URLS의 URL을 캐시로 로드)"""
+    bundled = _read_json(os.path.join(ASSETS_DIR, f"{name}.json"))
+    if bundled:
+        return bundled[1]
+    url = LOTTIE_URLS.get(name)
+    return load_lottie_url(url) if url else None
+
+
+def show_lottie(name: str, height: int = 200, key: str = None):
+    """애니메이션 표시 (아직 없으면 아무것도 그리지 않음)"""
+    animation = load_lottie(name)
+    if animation:
+        from streamlit_lottie import st_lottie
+        st_lottie(animation, height=height, key=key or f"lottie_{name}")
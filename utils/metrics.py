@@ -0,0 +1,205 @@
+"""
+데이터 계층 계측
+- database.py의 조회/등록 함수마다 실행 시간, 결과 행 수, 결과 크기를 기록
+- Streamlit 재실행(rerun) 단위로 모으고, 세션 안에서 페이지별로 누적
+- 오류는 print 대신 구조화 로그(JSON 한 줄)로 기록
+- 디버그 패널: URL에 ?debug=1을 붙이거나 DEBUG_PANEL=1이면 사이드바에 표시 (?debug=0으로 끔)
+- 로그 내보내기: METRICS_LOG=1이면 재실행마다 요약을 INFO로, LOG_LEVEL=DEBUG면 호출마다 기록
+
+계측은 디버그 패널이나 지표 로그가 켜진 재실행에서만 수집하므로, 꺼져 있으면 호출당 비용은
+session_state 조회 한 번뿐임.
+"""
+import functools
+import json
+import logging
+import threading
+import time
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from .config import get_setting
+
+logger = logging.getLogger("inventory")
+
+# 세션별 최근 재실행 기록 보관 개수 (내보내기용)
+HISTORY_LIMIT = 50
+
+_RUN_KEY = '_metrics_run'
+_PAGES_KEY = '_metrics_pages'
+_HISTORY_KEY = '_metrics_history'
+_DEBUG_KEY = '_metrics_debug'
+
+# 스레드별 현재 계측 중인 호출 (중첩 호출은 바깥 호출에만 합산)
+_local = threading.local()
+
+
+class JsonFormatter(logging.Formatter):
+    """로그 한 건을 JSON 한 줄로 출력 (extra={'fields': {...}} 값을 함께 기록)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            **getattr(record, 'fields', {}),
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _configure_logger():
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter())
+    logger.addHandler(handler)
+    logger.setLevel(str(get_setting("LOG_LEVEL", "INFO")).upper())
+    logger.propagate = False
+
+
+_configure_logger()
+
+
+def _flag(key: str) -> bool:
+    return str(get_setting(key, "0")).lower() in ("1", "true", "yes")
+
+
+def log_error(message: str, error: Exception):
+    """데이터 계층 오류 기록 (계측 중인 호출이면 오류로 표시)"""
+    if getattr(_local, 'call', None) is not None:
+        _local.call['error'] = str(error)
+    logger.error(f"{message}: {error}", extra={'fields': {'error_type': type(error).__name__}})
+
+
+# ===== 재실행 단위 수집 =====
+
+def debug_enabled() -> bool:
+    """디버그 패널 표시 여부 (?debug=1은 세션에 기억, ?debug=0으로 해제)"""
+    if _flag("DEBUG_PANEL"):
+        return True
+    param = st.query_params.get("debug")
+    if param is not None:
+        st.session_state[_DEBUG_KEY] = param == "1"
+    return st.session_state.get(_DEBUG_KEY, False)
+
+
+def start_run(page: str):
+    """페이지 맨 위에서 호출: 이번 재실행의 계측 시작 (꺼져 있으면 아무것도 수집하지 않음)"""
+    collecting = debug_enabled() or _flag("METRICS_LOG") or logger.isEnabledFor(logging.DEBUG)
+    st.session_state[_RUN_KEY] = {
+        'page': page,
+        'started_at': time.time(),
+        'started': time.perf_counter(),
+        'calls': [],
+    } if collecting else None
+
+
+def _current_run() -> dict | None:
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    return st.session_state.get(_RUN_KEY)
+
+
+def _row_count(result) -> int | None:
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        for key in ('rows', 'days'):
+            if isinstance(result.get(key), list):
+                return len(result[key])
+    return None
+
+
+def _payload_size(result) -> int:
+    """결과를 JSON으로 보냈을 때의 크기 (바이트, 네트워크/화면 전송량의 근사치)"""
+    try:
+        return len(json.dumps(result, ensure_ascii=False, default=str).encode())
+    except (TypeError, ValueError):
+        return 0
+
+
+def track(fn):
+    """데이터 계층 함수 계측 데코레이터 (실행 시간, 행 수, 결과 크기, 오류)"""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        run = _current_run()
+        if run is None or getattr(_local, 'call', None) is not None:
+            return fn(*args, **kwargs)
+
+        call = _local.call = {'name': fn.__name__, 'error': None}
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            call['ms'] = round((time.perf_counter() - started) * 1000, 2)
+            _local.call = None
+        call['rows'] = _row_count(result)
+        call['bytes'] = _payload_size(result)
+        call['thread'] = threading.current_thread().name
+        run['calls'].append(call)
+        logger.debug("query", extra={'fields': {'page': run['page'], **call}})
+        return result
+    return wrapper
+
+
+def _summarize(run: dict) -> dict:
+    calls = run['calls']
+    return {
+        'page': run['page'],
+        'started_at': run['started_at'],
+        'wall_ms': round((time.perf_counter() - run['started']) * 1000, 2),
+        'calls': len(calls),
+        'query_ms': round(sum(c['ms'] for c in calls), 2),
+        'rows': sum(c['rows'] or 0 for c in calls),
+        'bytes': sum(c['bytes'] for c in calls),
+        'errors': sum(1 for c in calls if c['error']),
+    }
+
+
+def finish_run():
+    """페이지 맨 끝에서 호출: 이번 재실행 요약을 페이지별로 누적/기록하고 디버그 패널 표시"""
+    run = st.session_state.pop(_RUN_KEY, None)
+    if run is None:
+        return
+    summary = _summarize(run)
+
+    pages = st.session_state.setdefault(_PAGES_KEY, {})
+    total = pages.setdefault(run['page'], {'runs': 0, 'calls': 0, 'query_ms': 0.0, 'wall_ms': 0.0, 'bytes': 0})
+    total['runs'] += 1
+    for key in ('calls', 'query_ms', 'wall_ms', 'bytes'):
+        total[key] += summary[key]
+
+    history = st.session_state.setdefault(_HISTORY_KEY, [])
+    history.append({**summary, 'detail': run['calls']})
+    del history[:-HISTORY_LIMIT]
+
+    if _flag("METRICS_LOG"):
+        logger.info("rerun", extra={'fields': summary})
+    if debug_enabled():
+        _debug_panel(summary, run['calls'], pages, history)
+
+
+def _debug_panel(summary: dict, calls: list, pages: dict, history: list):
+    with st.sidebar.expander("🛠  성능 (디버그)", expanded=True):
+        st.markdown(f"**이번 실행** · 조회 {summary['calls']}회 · 조회 시간 합계 {summary['query_ms']:,.0f} ms · "
+                    f"페이지 {summary['wall_ms']:,.0f} ms · {summary['bytes'] / 1024:,.0f} KB")
+        if summary['errors']:
+            st.error(f"오류 {summary['errors']}건")
+        if calls:
+            st.dataframe(
+                [{'함수': c['name'], 'ms': c['ms'], '행': c['rows'], 'KB': round(c['bytes'] / 1024, 1),
+                  '오류': c['error'] or ''} for c in sorted(calls, key=lambda c: -c['ms'])],
+                hide_index=True, use_container_width=True,
+            )
+        st.markdown("**페이지별 누적 (이 세션)**")
+        st.dataframe(
+            [{'페이지': page, '실행': t['runs'], '평균 조회': round(t['calls'] / t['runs'], 1),
+              '평균 조회 ms': round(t['query_ms'] / t['runs']), '평균 페이지 ms': round(t['wall_ms'] / t['runs'])}
+             for page, t in pages.items()],
+            hide_index=True, use_container_width=True,
+        )
+        st.download_button("📥 지표 JSON", json.dumps(history, ensure_ascii=False, default=str),
+                           file_name="metrics.json", mime="application/json", key="metrics_export")
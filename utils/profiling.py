@@ -0,0 +1,211 @@
+"""
+페이지 렌더링 프로파일링 (관리자 전용)
+- 관리자(ADMIN_EMAILS)가 URL에 ?profile=1을 붙이면 현재 페이지 스크립트를 cProfile과
+  스택 샘플러로 감싸 다시 실행하고, 결과(.prof 파일, 상위 함수, 플레임 그래프)를 페이지 아래에 표시
+- ?profile=1은 세션에 기억되어 다른 페이지로 이동해도 유지 (?profile=0으로 끔)
+- 꺼져 있으면 페이지마다 query_params/session_state 조회뿐이며 프로파일러는 import도 하지 않음
+- cProfile/샘플러는 페이지 스크립트 스레드만 측정 (fetch_concurrently 작업 스레드의 조회 시간은
+  그 결과를 기다리는 시간으로 나타남)
+"""
+import threading
+
+import streamlit as st
+
+from .config import get_setting
+
+PROFILE_PARAM = "profile"
+_PROFILE_KEY = '_profile_enabled'
+# 스택 샘플링 간격 (초)
+SAMPLE_INTERVAL = 0.005
+# 상위 함수 표에 보여줄 개수
+TOP_FUNCTIONS = 30
+# 플레임 그래프에서 생략할 작은 노드 (전체 샘플 대비 비율)
+FLAME_MIN_SHARE = 0.005
+
+# 프로파일 실행 중인 스크립트 스레드 (다시 실행한 페이지 안에서 또 프로파일하지 않도록)
+_active = threading.local()
+
+
+def admin_emails() -> set:
+    """관리자 이메일 목록 (소문자)"""
+    return {email.strip().lower() for email in str(get_setting("ADMIN_EMAILS", "")).split(",") if email.strip()}
+
+
+def is_admin() -> bool:
+    """현재 로그인한 사용자가 관리자인지 (ADMIN_EMAILS, 쉼표로 구분)"""
+    email = st.session_state.get('user_email') or ''
+    return email.lower() in admin_emails()
+
+
+def profiling_enabled() -> bool:
+    """프로파일 모드 여부 (?profile=1은 세션에 기억, ?profile=0으로 해제 / 관리자만)"""
+    param = st.query_params.get(PROFILE_PARAM)
+    if param is not None:
+        st.session_state[_PROFILE_KEY] = param == "1"
+    return st.session_state.get(_PROFILE_KEY, False) and is_admin()
+
+
+def profile_page(path: str):
+    """페이지 맨 위(set_page_config 다음)에서 호출: 프로파일 요청이면 페이지를 측정하며 실행 후 중단
+
+    Args:
+        path: 페이지 스크립트 경로 (보통 __file__)
+    """
+    if getattr(_active, 'running', False) or not profiling_enabled():
+        return
+
+    import cProfile
+    import runpy
+    import time
+    from streamlit.runtime.scriptrunner import StopException
+
+    sampler = StackSampler(path)
+    profiler = cProfile.Profile()
+    _active.running = True
+    started = time.perf_counter()
+    sampler.start()
+    profiler.enable()
+    try:
+        runpy.run_path(path, run_name="__main__")
+    except StopException:
+        pass  # 페이지 안의 st.stop()도 결과는 보여줌
+    finally:
+        profiler.disable()
+        sampler.stop()
+        _active.running = False
+    elapsed = time.perf_counter() - started
+
+    _show_results(profiler, sampler, elapsed, path)
+    st.stop()
+
+
+class StackSampler:
+    """현재 스레드의 호출 스택을 일정 간격으로 기록하는 샘플링 프로파일러 (플레임 그래프용)"""
+
+    def __init__(self, path: str, interval: float = SAMPLE_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.stacks: dict = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _label(self, code) -> str:
+        import os
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _sample(self):
+        import sys
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        stack.reverse()
+        # 페이지 스크립트 위쪽(Streamlit 실행기, runpy) 프레임은 생략
+        for i, code in enumerate(stack):
+            if code.co_filename == self.path:
+                stack = stack[i:]
+                break
+        else:
+            return
+        key = tuple(self._label(code) for code in stack)
+        self.stacks[key] = self.stacks.get(key, 0) + 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    @property
+    def total(self) -> int:
+        return sum(self.stacks.values())
+
+    def folded(self) -> str:
+        """flamegraph.pl / speedscope 형식 (한 줄에 '프레임;프레임;... 샘플수')"""
+        return "\n".join(f"{';'.join(stack)} {count}" for stack, count in
+                         sorted(self.stacks.items(), key=lambda item: -item[1]))
+
+    def tree(self, min_share: float = FLAME_MIN_SHARE) -> list:
+        """플레임 그래프 노드 목록 [{'id', 'parent', 'label', 'samples'}] (작은 노드 생략)"""
+        nodes = {}
+        for stack, count in self.stacks.items():
+            path = ""
+            for label in stack:
+                parent, path = path, f"{path}/{label}"
+                node = nodes.setdefault(path, {'id': path, 'parent': parent, 'label': label, 'samples': 0})
+                node['samples'] += count
+        threshold = self.total * min_share
+        return [node for node in nodes.values() if node['samples'] >= threshold]
+
+
+def _top_functions(profiler) -> list:
+    import os
+    import pstats
+    stats = pstats.Stats(profiler)
+    rows = [{
+        '함수': f"{name} ({os.path.basename(filename)}:{line})",
+        '호출': calls,
+        '자체 ms': round(own * 1000, 1),
+        '누적 ms': round(cumulative * 1000, 1),
+    } for (filename, line, name), (_, calls, own, cumulative, _) in stats.stats.items()]
+    return sorted(rows, key=lambda row: -row['누적 ms'])[:TOP_FUNCTIONS]
+
+
+def _prof_bytes(profiler) -> bytes:
+    import os
+    import tempfile
+    fd, tmp = tempfile.mkstemp(suffix=".prof")
+    os.close(fd)
+    try:
+        profiler.dump_stats(tmp)
+        with open(tmp, 'rb') as f:
+            return f.read()
+    finally:
+        os.remove(tmp)
+
+
+def _show_results(profiler, sampler: StackSampler, elapsed: float, path: str):
+    import os
+    import plotly.express as px
+
+    page = os.path.splitext(os.path.basename(path))[0]
+    st.divider()
+    st.markdown(f"#### 🔬 프로파일 결과 · {page}")
+    col_time, col_samples = st.columns(2)
+    col_time.metric("페이지 실행 시간", f"{elapsed * 1000:,.0f} ms")
+    col_samples.metric("스택 샘플", f"{sampler.total:,}개 ({SAMPLE_INTERVAL * 1000:g} ms 간격)")
+
+    tab_flame, tab_top = st.tabs(["🔥 플레임 그래프", "📋 상위 함수 (누적 시간)"])
+    with tab_flame:
+        nodes = sampler.tree()
+        if nodes:
+            fig = px.icicle(
+                ids=[n['id'] for n in nodes], parents=[n['parent'] for n in nodes],
+                names=[n['label'] for n in nodes], values=[n['samples'] for n in nodes],
+                branchvalues='total',
+            )
+            fig.update_traces(tiling=dict(orientation='v'), root_color="#f8f9fa")
+            fig.update_layout(margin=dict(t=10, b=10, l=10, r=10), height=520)
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.caption("샘플이 없습니다 (페이지 실행이 샘플링 간격보다 짧음).")
+    with tab_top:
+        st.dataframe(_top_functions(profiler), hide_index=True, use_container_width=True)
+
+    col_prof, col_folded = st.columns(2)
+    with col_prof:
+        st.download_button("📥 cProfile (.prof)", _prof_bytes(profiler), file_name=f"{page}.prof",
+                           mime="application/octet-stream", key="profile_prof")
+    with col_folded:
+        st.download_button("📥 플레임 그래프 (folded)", sampler.folded(), file_name=f"{page}.folded.txt",
+                           mime="text/plain", key="profile_folded")
+    st.caption("`.prof`는 snakeviz/pstats로, folded 파일은 speedscope.app 또는 flamegraph.pl로 열 수 있습니다. "
+               "URL에 ?profile=0을 붙이면 프로파일을 끕니다.")
@@ -2,9 +2,6 @@
 커스텀 CSS 스타일 및 UI 유틸리티
 """
 import streamlit as st
-from streamlit_lottie import st_lottie
-import json
-import requests
 
 
 def apply_global_styles():
@@ -236,22 +233,3 @@ def sidebar_brand():
         ">Inventory Control System</div>
     </div>
     """, unsafe_allow_html=True)
-
-
-def load_lottie_url(url: str):
-    """Lottie 애니메이션 URL에서 로드"""
-    try:
-        r = requests.get(url, timeout=5)
-        if r.status_code == 200:
-            return r.json()
-    except Exception:
-        pass
-    return None
-
-
-# 자주 사용하는 Lottie 애니메이션 URL
-LOTTIE_URLS = {
-    "inventory": "https://lottie.host/e4e9a523-3a5f-4742-a853-aff6e32a5a04/oXpmIlYFjN.json",
-    "loading":   "https://lottie.host/4db68bbd-31f6-4cd8-84eb-189de235dcc2/6aFDMJOfMt.json",
-    "empty":     "https://lottie.host/2639b394-c2db-4a5a-a42b-7098e18c5af6/BjRrJikXul.json",
-}